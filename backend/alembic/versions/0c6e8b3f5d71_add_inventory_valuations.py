@@ -0,0 +1,58 @@
+"""add inventory valuations
+
+Revision ID: 0c6e8b3f5d71
+Revises: f3a7c9e21b54
+Create Date: 2026-10-17 16:40:22.871305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0c6e8b3f5d71'
+down_revision = 'f3a7c9e21b54'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'inventory_valuations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('as_of', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('status', sa.Enum('RUNNING', 'COMPLETED', 'FAILED', name='valuationstatus'), nullable=False),
+        sa.Column('ledger_rows', sa.BigInteger(), nullable=True),
+        sa.Column('product_count', sa.Integer(), nullable=True),
+        sa.Column('total_quantity', sa.BigInteger(), nullable=True),
+        sa.Column('fifo_value', sa.Float(), nullable=True),
+        sa.Column('average_value', sa.Float(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_inventory_valuations_id', 'inventory_valuations', ['id'], unique=False)
+    op.create_index('ix_inventory_valuations_as_of', 'inventory_valuations', ['as_of'], unique=False)
+    op.create_table(
+        'inventory_valuation_lines',
+        sa.Column('valuation_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('fifo_value', sa.Float(), nullable=False),
+        sa.Column('average_unit_cost', sa.Float(), nullable=False),
+        sa.Column('average_value', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+        sa.ForeignKeyConstraint(['valuation_id'], ['inventory_valuations.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('valuation_id', 'product_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('inventory_valuation_lines')
+    op.drop_index('ix_inventory_valuations_as_of', table_name='inventory_valuations')
+    op.drop_index('ix_inventory_valuations_id', table_name='inventory_valuations')
+    op.drop_table('inventory_valuations')
+    sa.Enum(name='valuationstatus').drop(op.get_bind(), checkfirst=True)
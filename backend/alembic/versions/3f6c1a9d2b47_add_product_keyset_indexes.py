@@ -0,0 +1,26 @@
+"""add product keyset indexes
+
+Revision ID: 3f6c1a9d2b47
+Revises: 814b8609dab0
+Create Date: 2026-10-17 09:12:41.208315
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f6c1a9d2b47'
+down_revision = '814b8609dab0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_products_name_id', 'products', ['name', 'id'], unique=False)
+    op.create_index('ix_products_created_at_id', 'products', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_created_at_id', table_name='products')
+    op.drop_index('ix_products_name_id', table_name='products')
@@ -0,0 +1,37 @@
+"""make purchase order expected_delivery timezone-aware
+
+Revision ID: 4d9b2e7c1f05
+Revises: e2c8a41f6b93
+Create Date: 2026-10-17 19:06:41.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4d9b2e7c1f05'
+down_revision = 'e2c8a41f6b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing values were written as UTC
+    op.alter_column(
+        'purchase_orders',
+        'expected_delivery',
+        type_=sa.DateTime(timezone=True),
+        existing_type=sa.DateTime(),
+        postgresql_using="expected_delivery AT TIME ZONE 'UTC'",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'purchase_orders',
+        'expected_delivery',
+        type_=sa.DateTime(),
+        existing_type=sa.DateTime(timezone=True),
+        postgresql_using="expected_delivery AT TIME ZONE 'UTC'",
+    )
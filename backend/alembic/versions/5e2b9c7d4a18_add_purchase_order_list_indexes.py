@@ -0,0 +1,48 @@
+"""add purchase order list indexes
+
+Revision ID: 5e2b9c7d4a18
+Revises: c47a9e0d15f8
+Create Date: 2026-10-17 13:42:18.204517
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e2b9c7d4a18'
+down_revision = 'c47a9e0d15f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_purchase_orders_created_at_id', 'purchase_orders', ['created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_purchase_orders_status_created_at_id',
+        'purchase_orders',
+        ['status', 'created_at', 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_purchase_orders_supplier_status_created_at_id',
+        'purchase_orders',
+        ['supplier_id', 'status', 'created_at', 'id'],
+        unique=False,
+    )
+    op.create_index('ix_purchase_orders_order_date_id', 'purchase_orders', ['order_date', 'id'], unique=False)
+    op.create_index(
+        'ix_purchase_orders_open_expected_delivery',
+        'purchase_orders',
+        ['expected_delivery'],
+        unique=False,
+        postgresql_where=sa.text("status NOT IN ('RECEIVED', 'CANCELLED')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_purchase_orders_open_expected_delivery', table_name='purchase_orders')
+    op.drop_index('ix_purchase_orders_order_date_id', table_name='purchase_orders')
+    op.drop_index('ix_purchase_orders_supplier_status_created_at_id', table_name='purchase_orders')
+    op.drop_index('ix_purchase_orders_status_created_at_id', table_name='purchase_orders')
+    op.drop_index('ix_purchase_orders_created_at_id', table_name='purchase_orders')
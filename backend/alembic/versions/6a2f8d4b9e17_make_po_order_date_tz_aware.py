@@ -0,0 +1,39 @@
+"""make purchase order order_date timezone-aware
+
+Revision ID: 6a2f8d4b9e17
+Revises: 4d9b2e7c1f05
+Create Date: 2026-10-17 21:14:09.527361
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6a2f8d4b9e17'
+down_revision = '4d9b2e7c1f05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing values were written as UTC
+    op.alter_column(
+        'purchase_orders',
+        'order_date',
+        type_=sa.DateTime(timezone=True),
+        existing_type=sa.DateTime(),
+        existing_nullable=False,
+        postgresql_using="order_date AT TIME ZONE 'UTC'",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'purchase_orders',
+        'order_date',
+        type_=sa.DateTime(),
+        existing_type=sa.DateTime(timezone=True),
+        existing_nullable=False,
+        postgresql_using="order_date AT TIME ZONE 'UTC'",
+    )
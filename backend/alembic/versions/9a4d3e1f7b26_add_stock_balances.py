@@ -0,0 +1,44 @@
+"""add stock balances
+
+Revision ID: 9a4d3e1f7b26
+Revises: 5e2b9c7d4a18
+Create Date: 2026-10-17 14:25:51.612093
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4d3e1f7b26'
+down_revision = '5e2b9c7d4a18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stock_balances',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('warehouse', sa.String(length=100), nullable=False),
+        sa.Column('shelf', sa.String(length=100), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+        sa.PrimaryKeyConstraint('product_id', 'warehouse', 'shelf'),
+    )
+    op.create_index('ix_stock_balances_location', 'stock_balances', ['warehouse', 'shelf', 'product_id'], unique=False)
+    
+    # Backfill from the existing ledger (IN/OUT store positive quantities, the rest are signed)
+    op.execute(
+        "INSERT INTO stock_balances (product_id, warehouse, shelf, quantity) "
+        "SELECT product_id, coalesce(warehouse_location, ''), coalesce(shelf_location, ''), "
+        "sum(CASE transaction_type WHEN 'IN' THEN abs(quantity) WHEN 'OUT' THEN -abs(quantity) ELSE quantity END) "
+        "FROM inventory_items "
+        "GROUP BY product_id, coalesce(warehouse_location, ''), coalesce(shelf_location, '')"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stock_balances_location', table_name='stock_balances')
+    op.drop_table('stock_balances')
@@ -0,0 +1,49 @@
+"""add product stock status
+
+Revision ID: c47a9e0d15f8
+Revises: b81e4d2f6a93
+Create Date: 2026-10-17 11:20:05.731904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47a9e0d15f8'
+down_revision = 'b81e4d2f6a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'products',
+        sa.Column(
+            'stock_status',
+            sa.String(length=20),
+            sa.Computed(
+                "CASE"
+                " WHEN coalesce(current_stock, 0) <= 0 THEN 'out_of_stock'"
+                " WHEN coalesce(current_stock, 0) <= coalesce(reorder_point, 0) THEN 'low_stock'"
+                " WHEN coalesce(current_stock, 0) <= coalesce(reorder_point, 0) * 2 THEN 'normal'"
+                " ELSE 'high'"
+                " END",
+                persisted=True,
+            ),
+        ),
+    )
+    op.create_index('ix_products_stock_status_id', 'products', ['stock_status', 'id'], unique=False)
+    op.create_index(
+        'ix_products_active_stock_status',
+        'products',
+        ['stock_status'],
+        unique=False,
+        postgresql_where=sa.text('is_active'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_active_stock_status', table_name='products')
+    op.drop_index('ix_products_stock_status_id', table_name='products')
+    op.drop_column('products', 'stock_status')
@@ -0,0 +1,98 @@
+"""partition inventory items by month
+
+Revision ID: d81f5a2c6e39
+Revises: 9a4d3e1f7b26
+Create Date: 2026-10-17 15:08:37.455120
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd81f5a2c6e39'
+down_revision = '9a4d3e1f7b26'
+branch_labels = None
+depends_on = None
+
+# Partitions created beyond the current month; later ones come from
+# app.db.partitions.ensure_ledger_partitions at runtime
+MONTHS_AHEAD = 3
+
+
+def _add_months(value, months):
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        # Declarative partitioning is PostgreSQL-only; other databases keep the plain table
+        op.create_index('ix_inventory_items_product_id_created_at', 'inventory_items', ['product_id', 'created_at'], unique=False)
+        op.create_index('ix_inventory_items_created_at', 'inventory_items', ['created_at'], unique=False)
+        return
+    
+    op.execute("UPDATE inventory_items SET created_at = now() WHERE created_at IS NULL")
+    op.execute("ALTER TABLE inventory_items RENAME TO inventory_items_legacy")
+    op.execute("ALTER INDEX IF EXISTS inventory_items_pkey RENAME TO inventory_items_legacy_pkey")
+    op.execute("ALTER INDEX IF EXISTS ix_inventory_items_id RENAME TO ix_inventory_items_legacy_id")
+    
+    # The partition key has to be part of the primary key
+    op.execute(
+        "CREATE TABLE inventory_items (LIKE inventory_items_legacy INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute("ALTER TABLE inventory_items ALTER COLUMN created_at SET NOT NULL")
+    op.execute("ALTER TABLE inventory_items ADD CONSTRAINT inventory_items_pkey PRIMARY KEY (id, created_at)")
+    op.execute("ALTER TABLE inventory_items ADD FOREIGN KEY (product_id) REFERENCES products (id)")
+    op.execute("ALTER TABLE inventory_items ADD FOREIGN KEY (created_by) REFERENCES users (id)")
+    op.execute("ALTER SEQUENCE inventory_items_id_seq OWNED BY inventory_items.id")
+    
+    # Indexes on the parent are created on every partition, present and future
+    op.create_index('ix_inventory_items_product_id_created_at', 'inventory_items', ['product_id', 'created_at'], unique=False)
+    op.create_index('ix_inventory_items_created_at', 'inventory_items', ['created_at'], unique=False)
+    
+    first_month = bind.execute(sa.text(
+        "SELECT date_trunc('month', min(created_at))::date FROM inventory_items_legacy"
+    )).scalar()
+    current_month = bind.execute(sa.text("SELECT date_trunc('month', now())::date")).scalar()
+    month = min(first_month or current_month, current_month)
+    last_month = _add_months(current_month, MONTHS_AHEAD)
+    while month <= last_month:
+        next_month = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE inventory_items_p{month:%Y%m} PARTITION OF inventory_items "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+    # Catches rows beyond the pre-created months if maintenance ever falls behind
+    op.execute("CREATE TABLE inventory_items_default PARTITION OF inventory_items DEFAULT")
+    
+    op.execute("INSERT INTO inventory_items SELECT * FROM inventory_items_legacy")
+    op.execute("DROP TABLE inventory_items_legacy")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        op.drop_index('ix_inventory_items_created_at', table_name='inventory_items')
+        op.drop_index('ix_inventory_items_product_id_created_at', table_name='inventory_items')
+        return
+    
+    op.execute("ALTER TABLE inventory_items RENAME TO inventory_items_partitioned")
+    op.execute("ALTER INDEX inventory_items_pkey RENAME TO inventory_items_partitioned_pkey")
+    op.execute("ALTER INDEX ix_inventory_items_product_id_created_at RENAME TO ix_inventory_items_partitioned_product_id_created_at")
+    op.execute("ALTER INDEX ix_inventory_items_created_at RENAME TO ix_inventory_items_partitioned_created_at")
+    op.execute("CREATE TABLE inventory_items (LIKE inventory_items_partitioned INCLUDING DEFAULTS)")
+    op.execute("ALTER TABLE inventory_items ALTER COLUMN created_at DROP NOT NULL")
+    op.execute("ALTER TABLE inventory_items ADD CONSTRAINT inventory_items_pkey PRIMARY KEY (id)")
+    op.execute("ALTER TABLE inventory_items ADD FOREIGN KEY (product_id) REFERENCES products (id)")
+    op.execute("ALTER TABLE inventory_items ADD FOREIGN KEY (created_by) REFERENCES users (id)")
+    op.execute("ALTER SEQUENCE inventory_items_id_seq OWNED BY inventory_items.id")
+    op.create_index('ix_inventory_items_id', 'inventory_items', ['id'], unique=False)
+    op.execute("INSERT INTO inventory_items SELECT * FROM inventory_items_partitioned")
+    # Drops every partition with it
+    op.execute("DROP TABLE inventory_items_partitioned")
@@ -0,0 +1,66 @@
+"""add demand forecasts
+
+Revision ID: e2c8a41f6b93
+Revises: 7b1e4f9a3c82
+Create Date: 2026-10-17 18:05:12.417639
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2c8a41f6b93'
+down_revision = '7b1e4f9a3c82'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'forecast_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('data_through', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('full_refit', sa.Boolean(), nullable=False),
+        sa.Column('apply_reorder_points', sa.Boolean(), nullable=False),
+        sa.Column('status', sa.Enum('RUNNING', 'COMPLETED', 'FAILED', name='forecastrunstatus'), nullable=False),
+        sa.Column('series_rows', sa.BigInteger(), nullable=True),
+        sa.Column('product_count', sa.Integer(), nullable=True),
+        sa.Column('shard_count', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_forecast_runs_id', 'forecast_runs', ['id'], unique=False)
+    op.create_index('ix_forecast_runs_data_through', 'forecast_runs', ['data_through'], unique=False)
+    op.create_table(
+        'demand_forecasts',
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('run_id', sa.Integer(), nullable=True),
+        sa.Column('method', sa.String(length=20), nullable=False),
+        sa.Column('smoothing', sa.Float(), nullable=False),
+        sa.Column('daily_demand', sa.Float(), nullable=False),
+        sa.Column('daily_std', sa.Float(), nullable=False),
+        sa.Column('history_days', sa.Integer(), nullable=False),
+        sa.Column('demand_days', sa.Integer(), nullable=False),
+        sa.Column('total_demand', sa.Float(), nullable=False),
+        sa.Column('suggested_reorder_point', sa.Integer(), nullable=False),
+        sa.Column('data_through', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('fitted_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+        sa.ForeignKeyConstraint(['run_id'], ['forecast_runs.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('product_id'),
+    )
+    op.create_index('ix_demand_forecasts_run_id', 'demand_forecasts', ['run_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_demand_forecasts_run_id', table_name='demand_forecasts')
+    op.drop_table('demand_forecasts')
+    op.drop_index('ix_forecast_runs_data_through', table_name='forecast_runs')
+    op.drop_index('ix_forecast_runs_id', table_name='forecast_runs')
+    op.drop_table('forecast_runs')
+    sa.Enum(name='forecastrunstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,46 @@
+"""add stock snapshots
+
+Revision ID: f3a7c9e21b54
+Revises: d81f5a2c6e39
+Create Date: 2026-10-17 15:52:09.318446
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a7c9e21b54'
+down_revision = 'd81f5a2c6e39'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stock_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('taken_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_stock_snapshots_id', 'stock_snapshots', ['id'], unique=False)
+    op.create_index('ix_stock_snapshots_taken_at', 'stock_snapshots', ['taken_at'], unique=True)
+    op.create_table(
+        'stock_snapshot_lines',
+        sa.Column('snapshot_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('warehouse', sa.String(length=100), nullable=False),
+        sa.Column('shelf', sa.String(length=100), nullable=False),
+        sa.Column('quantity', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+        sa.ForeignKeyConstraint(['snapshot_id'], ['stock_snapshots.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('snapshot_id', 'product_id', 'warehouse', 'shelf'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('stock_snapshot_lines')
+    op.drop_index('ix_stock_snapshots_taken_at', table_name='stock_snapshots')
+    op.drop_index('ix_stock_snapshots_id', table_name='stock_snapshots')
+    op.drop_table('stock_snapshots')
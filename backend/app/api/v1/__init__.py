@@ -3,6 +3,10 @@ from .users import router as users_router
 from .suppliers import router as suppliers_router
 from .products import router as products_router
 from .purchase_orders import router as purchase_orders_router
+from .inventory import router as inventory_router
+from .orders import router as orders_router
+from .dashboard import router as dashboard_router
+from .forecasts import router as forecasts_router
 
 __all__ = [
     "auth_router",
@@ -10,4 +14,8 @@ __all__ = [
     "suppliers_router",
     "products_router",
     "purchase_orders_router",
+    "inventory_router",
+    "orders_router",
+    "dashboard_router",
+    "forecasts_router",
 ] 
\ No newline at end of file
@@ -0,0 +1,55 @@
+from typing import Any, Optional
+from datetime import date, datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.deps import get_current_active_user
+from app.db.database import get_async_db
+from app.models.user import User
+from app.schemas.dashboard import DashboardOverview, InventoryAnalytics
+from app.services.dashboard import build_inventory_analytics, build_overview, get_dashboard_counts
+from app.services.dashboard_counts import dashboard_counts
+
+router = APIRouter()
+
+
+@router.get("/overview", response_model=DashboardOverview)
+async def read_dashboard_overview(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Headline KPIs, served from the in-memory dashboard counters
+    """
+    counts = await get_dashboard_counts(db)
+    return build_overview(counts, dashboard_counts.computed_at)
+
+
+@router.get("/inventory-analytics", response_model=InventoryAnalytics)
+async def read_inventory_analytics(
+    start_date: Optional[date] = Query(None, alias="startDate", description="First day of stock movement"),
+    end_date: Optional[date] = Query(None, alias="endDate", description="Last day of stock movement"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Stock levels by category, category mix, warehouse utilization and daily
+    stock movement (last 30 days by default), served from the in-memory counters
+    """
+    today = datetime.utcnow().date()
+    end_date = end_date or today
+    start_date = start_date or end_date - timedelta(days=29)
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="startDate must not be after endDate"
+        )
+    if start_date < today - timedelta(days=settings.DASHBOARD_MOVEMENT_DAYS - 1):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Stock movement is kept for the last {settings.DASHBOARD_MOVEMENT_DAYS} days"
+        )
+    
+    counts = await get_dashboard_counts(db)
+    return build_inventory_analytics(counts, dashboard_counts.computed_at, start_date, end_date)
@@ -0,0 +1,110 @@
+from typing import Any, List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.core.deps import get_current_active_user, get_current_superuser
+from app.db.database import get_async_db
+from app.db.projection import schema_columns
+from app.db.query_counter import query_budget
+from app.models.forecast import DemandForecast, ForecastRun
+from app.models.product import Product
+from app.models.user import User
+from app.schemas.forecast import (
+    DemandForecast as DemandForecastSchema,
+    DemandForecastDetail,
+    ForecastMethod,
+    ForecastRun as ForecastRunSchema
+)
+from app.services.forecasting import create_forecast_run, forecast_cutoff, run_demand_forecast
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[DemandForecastSchema], dependencies=[Depends(query_budget(2))])
+async def read_demand_forecasts(
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    method: Optional[ForecastMethod] = Query(None, description="Filter by model"),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Retrieve the latest demand forecast of every product that has one
+    """
+    query = select(*schema_columns(DemandForecast, DemandForecastSchema)).order_by(DemandForecast.product_id)
+    if method is not None:
+        query = query.where(DemandForecast.method == method.value)
+    
+    result = await db.execute(query.offset(skip).limit(limit))
+    return [row._asdict() for row in result]
+
+
+@router.post("/runs", response_model=ForecastRunSchema, status_code=status.HTTP_202_ACCEPTED)
+async def start_forecast_run(
+    background_tasks: BackgroundTasks,
+    full: bool = Query(False, description="Refit every product, not only those with new demand"),
+    apply_reorder_points: bool = Query(False, description="Set refitted products' reorder points to the suggestion"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_superuser),
+) -> Any:
+    """
+    Start a demand forecast run on history up to the start of today; poll GET /runs/{id} for the result
+    """
+    run_id = await create_forecast_run(
+        await db.connection(), forecast_cutoff(), full, apply_reorder_points, current_user.id
+    )
+    await db.commit()
+    background_tasks.add_task(run_demand_forecast, run_id)
+    
+    return await db.get(ForecastRun, run_id)
+
+
+@router.get("/runs/{run_id}", response_model=ForecastRunSchema)
+async def read_forecast_run(
+    run_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get a forecast run with its totals
+    """
+    run = await db.get(ForecastRun, run_id)
+    if not run:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Forecast run not found"
+        )
+    return run
+
+
+@router.get("/{product_id}", response_model=DemandForecastDetail, dependencies=[Depends(query_budget(2))])
+async def read_demand_forecast(
+    product_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    horizon_days: int = Query(30, ge=1, le=365, description="Days to sum the forecast over"),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get a product's demand forecast with its total over the horizon
+    """
+    result = await db.execute(
+        select(*schema_columns(DemandForecast, DemandForecastSchema), Product.reorder_point)
+        .join(Product, Product.id == DemandForecast.product_id)
+        .where(DemandForecast.product_id == product_id)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No forecast for this product"
+        )
+    
+    forecast = row._asdict()
+    current_reorder_point = forecast.pop("reorder_point")
+    return DemandForecastDetail(
+        **forecast,
+        horizon_days=horizon_days,
+        horizon_demand=round(forecast["daily_demand"] * horizon_days, 2),
+        current_reorder_point=current_reorder_point,
+    )
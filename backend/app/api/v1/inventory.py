@@ -0,0 +1,243 @@
+from typing import Any, List, Optional
+from datetime import date, datetime, timedelta, timezone
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.core.deps import get_current_active_user, get_current_superuser
+from app.db.database import get_async_db
+from app.db.projection import schema_columns
+from app.models.inventory import StockBalance
+from app.models.product import Product
+from app.models.user import User
+from app.models.valuation import InventoryValuation, InventoryValuationLine
+from app.schemas.inventory import (
+    ProductStockBalances,
+    StockAsOf,
+    StockBalance as StockBalanceSchema,
+    TurnoverAgingReport
+)
+from app.schemas.valuation import (
+    InventoryValuation as InventoryValuationSchema,
+    InventoryValuationLine as InventoryValuationLineSchema
+)
+from app.services.inventory_analytics import turnover_aging_reports
+from app.services.snapshots import latest_snapshot_before, location_quantities_query
+from app.services.valuation import create_valuation, run_inventory_valuation
+
+router = APIRouter()
+
+
+@router.get("/balances", response_model=List[StockBalanceSchema])
+async def read_stock_balances(
+    db: AsyncSession = Depends(get_async_db),
+    warehouse: Optional[str] = Query(None, description="Warehouse to list (empty string for unassigned stock)"),
+    shelf: Optional[str] = Query(None, description="Shelf within the warehouse"),
+    include_zero: bool = Query(False, description="Include locations whose balance is zero"),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Retrieve stock per location
+    """
+    query = select(*schema_columns(StockBalance, StockBalanceSchema))
+    if warehouse is not None:
+        query = query.where(StockBalance.warehouse == warehouse)
+    if shelf is not None:
+        query = query.where(StockBalance.shelf == shelf)
+    if not include_zero:
+        query = query.where(StockBalance.quantity != 0)
+    
+    # Matches ix_stock_balances_location
+    result = await db.execute(
+        query
+        .order_by(StockBalance.warehouse, StockBalance.shelf, StockBalance.product_id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return [row._asdict() for row in result]
+
+
+@router.get("/products/{product_id}/balances", response_model=ProductStockBalances)
+async def read_product_stock_balances(
+    product_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    include_zero: bool = Query(False, description="Include locations whose balance is zero"),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get a product's stock broken down by location
+    """
+    result = await db.execute(select(Product.id, Product.current_stock).where(Product.id == product_id))
+    product = result.one_or_none()
+    if product is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+    
+    query = (
+        select(*schema_columns(StockBalance, StockBalanceSchema))
+        .where(StockBalance.product_id == product_id)
+        .order_by(StockBalance.warehouse, StockBalance.shelf)
+    )
+    if not include_zero:
+        query = query.where(StockBalance.quantity != 0)
+    result = await db.execute(query)
+    locations = [row._asdict() for row in result]
+    
+    return ProductStockBalances(
+        product_id=product_id,
+        current_stock=product.current_stock or 0,
+        total=sum(location["quantity"] for location in locations),
+        locations=locations
+    )
+
+
+@router.get("/as-of", response_model=StockAsOf)
+async def read_stock_as_of(
+    ts: datetime = Query(..., description="Point in time (ISO 8601; naive values are UTC)"),
+    product_id: Optional[int] = Query(None, description="Only this product"),
+    warehouse: Optional[str] = Query(None, description="Only this warehouse"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get stock per product and location at a point in time
+    
+    Rolls the nearest earlier snapshot forward with the ledger rows since then.
+    """
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    
+    conn = await db.connection()
+    snapshot = await latest_snapshot_before(conn, ts)
+    query = location_quantities_query(
+        snapshot.id if snapshot else None,
+        snapshot.taken_at if snapshot else None,
+        ts,
+        product_id=product_id,
+        warehouse=warehouse,
+    )
+    result = await db.execute(query.order_by("product_id", "warehouse", "shelf"))
+    
+    return StockAsOf(
+        as_of=ts,
+        snapshot_id=snapshot.id if snapshot else None,
+        snapshot_taken_at=snapshot.taken_at if snapshot else None,
+        balances=[row._asdict() for row in result]
+    )
+
+
+@router.post("/valuations", response_model=InventoryValuationSchema, status_code=status.HTTP_202_ACCEPTED)
+async def start_inventory_valuation(
+    background_tasks: BackgroundTasks,
+    as_of: Optional[datetime] = Query(None, description="Value the ledger up to this time (default now)"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_superuser),
+) -> Any:
+    """
+    Start a FIFO and moving-average valuation run; poll GET /valuations/{id} for the result
+    """
+    if as_of is None:
+        as_of = datetime.now(timezone.utc)
+    elif as_of.tzinfo is None:
+        as_of = as_of.replace(tzinfo=timezone.utc)
+    
+    valuation_id = await create_valuation(await db.connection(), as_of, current_user.id)
+    await db.commit()
+    background_tasks.add_task(run_inventory_valuation, valuation_id, as_of)
+    
+    return await db.get(InventoryValuation, valuation_id)
+
+
+@router.get("/valuations/{valuation_id}", response_model=InventoryValuationSchema)
+async def read_inventory_valuation(
+    valuation_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get a valuation run with its totals
+    """
+    valuation = await db.get(InventoryValuation, valuation_id)
+    if not valuation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Valuation not found"
+        )
+    return valuation
+
+
+@router.get("/valuations/{valuation_id}/lines", response_model=List[InventoryValuationLineSchema])
+async def read_inventory_valuation_lines(
+    valuation_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get the per-product values of a valuation run
+    """
+    result = await db.execute(
+        select(*schema_columns(InventoryValuationLine, InventoryValuationLineSchema))
+        .where(InventoryValuationLine.valuation_id == valuation_id)
+        .order_by(InventoryValuationLine.product_id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return [row._asdict() for row in result]
+
+
+# Product sort keys for the turnover/aging report; None sorts last
+TURNOVER_SORT_KEYS = {
+    "turnover": "turnover",
+    "days_on_hand": "days_on_hand",
+    "age": "average_age_days",
+    "value": "closing_value",
+}
+
+
+@router.get("/turnover-aging", response_model=TurnoverAgingReport)
+async def read_turnover_aging(
+    start_date: Optional[date] = Query(None, description="First day of the period (default 90 days before end_date)"),
+    end_date: Optional[date] = Query(None, description="Last day of the period (default today)"),
+    category: Optional[str] = Query(None, description="Only list products in this category"),
+    sort: str = Query("turnover", pattern="^(turnover|days_on_hand|age|value)$"),
+    descending: bool = Query(False, description="Sort products high to low"),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Inventory turnover, days on hand and aging per category and product
+    
+    Computed from the ledger in vectorized chunks and cached per date range;
+    filtering, sorting and paging of products work on the cached report.
+    """
+    end_date = end_date or datetime.now(timezone.utc).date()
+    start_date = start_date or end_date - timedelta(days=89)
+    if start_date > end_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_date must not be after end_date"
+        )
+    
+    report = await turnover_aging_reports.get(await db.connection(), start_date, end_date)
+    
+    products = report["products"]
+    if category is not None:
+        products = [product for product in products if product["category"] == (category or None)]
+    key = TURNOVER_SORT_KEYS[sort]
+    present = [product for product in products if product[key] is not None]
+    missing = [product for product in products if product[key] is None]
+    present.sort(key=lambda product: product[key], reverse=descending)
+    products = present + missing
+    
+    return TurnoverAgingReport(
+        **{**report, "products": products[skip:skip + limit]},
+        product_total=len(products)
+    )
@@ -0,0 +1,264 @@
+import uuid
+from typing import Any, Optional
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+
+from app.core.deps import get_current_active_user
+from app.core.pagination import decode_cursor, encode_cursor, keyset_filter
+from app.db.database import get_async_db
+from app.db.projection import schema_columns
+from app.db.query_counter import query_budget
+from app.models.order import Order, OrderItem, OrderStatus, PaymentStatus
+from app.models.product import Product
+from app.models.user import User
+from app.schemas.order import (
+    Order as OrderSchema,
+    OrderCreate,
+    OrderListResponse,
+    OrderStatus as OrderStatusFilter,
+    OrderSummary,
+    PickingWave,
+    PickingWaveCreate
+)
+from app.services.dashboard_counts import order_deltas, stage_dashboard_deltas
+from app.services.picking import build_picking_wave, render_pick_lists
+from app.services.stock import increment_stock
+
+router = APIRouter()
+
+
+@router.get("/", response_model=OrderListResponse, dependencies=[Depends(query_budget(2))])
+async def read_orders(
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page"),
+    order_status: Optional[OrderStatusFilter] = Query(None, alias="status", description="Filter by status"),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Retrieve orders, newest first
+    """
+    query = (
+        select(*schema_columns(Order, OrderSummary))
+        .order_by(Order.created_at.desc(), Order.id.desc())
+    )
+    if order_status is not None:
+        query = query.where(Order.status == OrderStatus(order_status.value))
+    if cursor:
+        value, last_id = decode_cursor(cursor, "created_at")
+        query = query.where(keyset_filter(Order.created_at, Order.id, value, last_id, descending=True))
+    
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.all()
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    
+    next_cursor = None
+    if has_next:
+        next_cursor = encode_cursor("created_at", rows[-1].created_at, rows[-1].id)
+    
+    return OrderListResponse(
+        items=[row._asdict() for row in rows],
+        limit=limit,
+        next_cursor=next_cursor,
+        has_next=has_next
+    )
+
+
+@router.post("/picking-waves", response_model=PickingWave, dependencies=[Depends(query_budget(8))])
+async def create_picking_wave(
+    wave_in: PickingWaveCreate,
+    output: str = Query("json", pattern="^(json|text)$", description="json, or text for printable lists"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Build pick lists for a wave of confirmed orders
+    
+    Without ``release`` this is a preview and nothing is written. With it, the
+    picks are posted to the inventory ledger and the orders move to processing.
+    """
+    wave = await build_picking_wave(db, wave_in, current_user.id)
+    if wave_in.release:
+        await db.commit()
+    
+    if output == "text":
+        return PlainTextResponse(render_pick_lists(wave))
+    return wave
+
+
+@router.get("/{order_id}", response_model=OrderSchema, dependencies=[Depends(query_budget(3))])
+async def read_order(
+    order_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get a specific order by id
+    """
+    result = await db.execute(
+        select(Order)
+        .options(selectinload(Order.items))
+        .where(Order.id == order_id)
+    )
+    order = result.scalar_one_or_none()
+    
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
+        )
+    
+    return order
+
+
+@router.post("/", response_model=OrderSchema, dependencies=[Depends(query_budget(8))])
+async def create_order(
+    order_in: OrderCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Create an order and reserve its stock
+    
+    Reservation decrements Product.current_stock (available to promise) for
+    every line in the same transaction as the order; the physical ledger
+    movement is posted when the order is picked. Any shortage rejects the whole
+    order with 409.
+    """
+    if not order_in.items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="An order needs at least one item"
+        )
+    if not current_user.is_superuser and any(item.unit_price is not None for item in order_in.items):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The user doesn't have enough privileges to set item prices"
+        )
+    
+    quantities = {}
+    for item in order_in.items:
+        quantities[item.product_id] = quantities.get(item.product_id, 0) + item.quantity
+    
+    # Prices and existence checks take no locks
+    result = await db.execute(
+        select(Product.id, Product.selling_price, Product.current_stock, Product.is_active)
+        .where(Product.id.in_(list(quantities)))
+    )
+    products = {row.id: row for row in result.all()}
+    missing = sorted(set(quantities) - set(products))
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Products not found: {missing}"
+        )
+    inactive = sorted(product_id for product_id, row in products.items() if not row.is_active)
+    if inactive:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Products are not active: {inactive}"
+        )
+    # Fail fast on shortages visible without locking; the conditional decrement below is authoritative
+    short = sorted(
+        product_id for product_id, quantity in quantities.items()
+        if (products[product_id].current_stock or 0) < quantity
+    )
+    if short:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Insufficient stock for products: {short}"
+        )
+    
+    item_rows = []
+    for item in order_in.items:
+        unit_price = item.unit_price if item.unit_price is not None else products[item.product_id].selling_price
+        item_rows.append({
+            "product_id": item.product_id,
+            "quantity": item.quantity,
+            "unit_price": unit_price,
+            "total_price": item.quantity * unit_price,
+        })
+    subtotal = sum(row["total_price"] for row in item_rows)
+    if order_in.discount_amount > subtotal + order_in.tax_amount + order_in.shipping_amount:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Discount cannot exceed the order total"
+        )
+    
+    header = dict(
+        order_number=order_in.order_number or f"SO-{datetime.utcnow():%Y%m%d}-{uuid.uuid4().hex[:10].upper()}",
+        customer_name=order_in.customer_name,
+        customer_email=order_in.customer_email,
+        customer_phone=order_in.customer_phone,
+        customer_address=order_in.customer_address,
+        status=OrderStatus.CONFIRMED,
+        payment_status=PaymentStatus.PENDING,
+        subtotal=subtotal,
+        tax_amount=order_in.tax_amount,
+        shipping_amount=order_in.shipping_amount,
+        discount_amount=order_in.discount_amount,
+        total_amount=subtotal + order_in.tax_amount + order_in.shipping_amount - order_in.discount_amount,
+        shipping_method=order_in.shipping_method,
+        estimated_delivery=order_in.estimated_delivery,
+        notes=order_in.notes,
+        user_id=current_user.id
+    )
+    
+    try:
+        result = await db.execute(
+            insert(Order)
+            .values(**header)
+            .returning(Order.id, Order.created_at)
+        )
+        order_id, created_at = result.one()
+        
+        for row in item_rows:
+            row["order_id"] = order_id
+        result = await db.execute(
+            insert(OrderItem).returning(
+                OrderItem.id,
+                OrderItem.created_at,
+                sort_by_parameter_order=True
+            ),
+            item_rows
+        )
+        items = [
+            {**row, "id": item_id, "created_at": item_created_at}
+            for row, (item_id, item_created_at) in zip(item_rows, result.all())
+        ]
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Order number already exists"
+        )
+    
+    # Reserve last so row locks on popular products are held only until the commit.
+    # Conditional decrements in product-id lock order: no lost updates, no deadlocks.
+    stock_levels = await increment_stock(
+        db, {product_id: -quantity for product_id, quantity in quantities.items()}, allow_negative=False
+    )
+    short = sorted(set(quantities) - set(stock_levels))
+    if short:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Insufficient stock for products: {short}"
+        )
+    
+    stage_dashboard_deltas(db, order_deltas(header["status"], header["total_amount"], created_at))
+    await db.commit()
+    
+    # Build the response from what was written instead of re-selecting
+    return OrderSchema(
+        **{**header, "status": header["status"].value, "payment_status": header["payment_status"].value},
+        id=order_id,
+        created_at=created_at,
+        items=items
+    )
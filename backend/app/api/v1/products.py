@@ -1,18 +1,88 @@
-from typing import Any, List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import csv
+import io
+import json
+import os
+import tempfile
+import uuid
+from typing import Any, List, Optional, Union
+from datetime import datetime
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Header, HTTPException, status, Query, Response, UploadFile
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, func, and_
+from sqlalchemy import delete, exists, select, func, and_, text, update
 from pydantic import BaseModel
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.deps import get_current_active_user
-from app.db.database import get_async_db
-from app.models.product import Product
+from app.core.pagination import decode_cursor, encode_cursor, keyset_filter
+from app.db.database import AsyncSessionLocal, get_async_db
+from app.db.projection import schema_columns
+from app.db.query_counter import query_budget
+from app.db.search import product_search_filter, product_search_rank
+from app.models.inventory import InventoryItem
+from app.models.order import OrderItem
+from app.models.product import Product, StockStatus
+from app.models.purchase_order import PurchaseOrderItem
 from app.models.user import User
-from app.schemas.product import Product as ProductSchema, ProductCreate, ProductUpdate, ProductSummary
+from app.schemas.product import (
+    Product as ProductSchema,
+    ProductCreate,
+    ProductUpdate,
+    ProductSummary,
+    ProductBulkRequest,
+    ProductBulkResult,
+    ProductImportJob,
+    StockAdjustment,
+    StockAdjustmentBatch,
+    StockAdjustmentResult,
+    StockStatusSummary
+)
+from app.services.category_cache import product_categories
+from app.services.dashboard_counts import (
+    dashboard_counts,
+    product_deltas,
+    stage_dashboard_deltas,
+    stock_change_deltas
+)
+from app.services.product_import import IMPORT_FORMATS, import_jobs, run_product_import
+from app.services.product_upsert import upsert_products
+from app.services.stock import adjustment_ledger_row, increment_stock, post_ledger_entries
 
 router = APIRouter()
 
 
+# Cached list totals keyed by filter set, used when total_mode=cached
+product_count_cache = TTLCache(maxsize=256, ttl=settings.PRODUCT_COUNT_CACHE_TTL_SECONDS)
+
+# Columns written by the export endpoint, in output order
+PRODUCT_EXPORT_COLUMNS = [column for column in Product.__table__.columns]
+
+# Rows fetched per round-trip from the server-side cursor during export
+EXPORT_FETCH_SIZE = 1000
+
+# stock_level and status filter values mapped onto the precomputed stock_status bucket
+STOCK_LEVEL_BUCKETS = {
+    "low": [StockStatus.OUT_OF_STOCK.value, StockStatus.LOW_STOCK.value],
+    "normal": [StockStatus.NORMAL.value],
+    "high": [StockStatus.HIGH.value],
+}
+STOCK_STATUS_FILTER_BUCKETS = {
+    "out-of-stock": [StockStatus.OUT_OF_STOCK.value],
+    "low-stock": [StockStatus.LOW_STOCK.value],
+    "in-stock": [StockStatus.NORMAL.value, StockStatus.HIGH.value],
+}
+
+# Columns the product list can be ordered and keyset-paged by
+PRODUCT_SORT_COLUMNS = {
+    "id": Product.id,
+    "name": Product.name,
+    "sku": Product.sku,
+    "created_at": Product.created_at,
+}
+
+
 class PaginatedProductsResponse(BaseModel):
     items: List[ProductSchema]
     total: int
@@ -23,7 +93,109 @@ class PaginatedProductsResponse(BaseModel):
     has_prev: bool
 
 
-@router.get("/", response_model=PaginatedProductsResponse)
+class CursorProductsResponse(BaseModel):
+    items: List[ProductSchema]
+    total: Optional[int] = None
+    limit: int
+    next_cursor: Optional[str] = None
+    has_next: bool
+
+
+def build_product_filters(
+    search: Optional[str] = None,
+    category: Optional[str] = None,
+    stock_level: Optional[str] = None,
+    status: Optional[str] = None,
+    dialect_name: str = "postgresql",
+) -> list:
+    """
+    Build the WHERE clauses shared by the product list endpoints
+    """
+    filters = []
+    
+    if search:
+        search_filter = product_search_filter(search, dialect_name)
+        filters.append(search_filter)
+    
+    if category:
+        category_filter = Product.category == category
+        filters.append(category_filter)
+    
+    if stock_level:
+        buckets = STOCK_LEVEL_BUCKETS.get(stock_level)
+        if buckets:
+            filters.append(Product.stock_status.in_(buckets))
+    
+    if status:
+        buckets = STOCK_STATUS_FILTER_BUCKETS.get(status)
+        if buckets:
+            filters.append(Product.stock_status.in_(buckets))
+    
+    return filters
+
+
+async def _estimate_product_count(db: AsyncSession, filters: list) -> int:
+    """
+    Read the PostgreSQL planner's row estimate instead of running COUNT(*)
+    """
+    query = select(Product.id)
+    if filters:
+        query = query.where(and_(*filters))
+    compiled = query.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_products(
+    db: AsyncSession,
+    filters: list,
+    total_mode: str,
+    cache_key: tuple,
+) -> Optional[int]:
+    """
+    Compute the list total according to total_mode: exact, estimated, cached or none
+    """
+    if total_mode == "none":
+        return None
+    
+    if total_mode == "estimated" and db.get_bind().dialect.name == "postgresql":
+        return await _estimate_product_count(db, filters)
+    
+    # Planner estimates are PostgreSQL-only, other backends fall back to the cache
+    if total_mode in ("cached", "estimated"):
+        total = product_count_cache.get(cache_key)
+        if total is not None:
+            return total
+    
+    count_query = select(func.count(Product.id))
+    if filters:
+        count_query = count_query.where(and_(*filters))
+    total_result = await db.execute(count_query)
+    total = total_result.scalar()
+    product_count_cache.set(cache_key, total)
+    return total
+
+
+def _rows_to_items(rows) -> List[dict]:
+    items = []
+    for row in rows:
+        item = row._asdict()
+        del item["sort_value"]
+        items.append(item)
+    return items
+
+
+def _product_list_response(response_model, field_names: Optional[set], payload: dict) -> Any:
+    # Sparse fieldsets don't fit the full item schema, so they bypass response validation
+    if field_names is not None:
+        return JSONResponse(content=jsonable_encoder(payload))
+    return response_model(**payload)
+
+
+@router.get("/", response_model=Union[PaginatedProductsResponse, CursorProductsResponse])
 async def read_products(
     db: AsyncSession = Depends(get_async_db),
     page: int = Query(1, ge=1, description="Page number"),
@@ -32,91 +204,186 @@ async def read_products(
     category: Optional[str] = Query(None, description="Filter by category"),
     stock_level: Optional[str] = Query(None, description="Filter by stock level: low, normal, high"),
     status: Optional[str] = Query(None, description="Filter by status: in-stock, low-stock, out-of-stock"),
+    sort_by: Optional[str] = Query(
+        None,
+        pattern="^(id|name|sku|created_at|relevance)$",
+        description="Sort key (default relevance when searching, otherwise id)"
+    ),
+    order: str = Query("asc", pattern="^(asc|desc)$", description="Sort direction"),
+    pagination: str = Query("offset", pattern="^(offset|cursor)$", description="Pagination mode: offset or cursor"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page, implies cursor pagination"),
+    total_mode: Optional[str] = Query(
+        None,
+        pattern="^(exact|estimated|cached|none)$",
+        description="Total to return: exact, estimated, cached or none (default exact for offset, none for cursor)"
+    ),
+    fields: Optional[str] = Query(None, description="Comma-separated product fields to return (id is always included)"),
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
     Retrieve products with optional search and filtering
     """
-    skip = (page - 1) * limit
+    # The "status" query parameter shadows fastapi.status in this handler
+    field_names = None
+    if fields:
+        field_names = {"id"} | {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = field_names - set(ProductSchema.model_fields)
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown product fields: {', '.join(sorted(unknown))}"
+            )
     
-    # Build base query
-    query = select(Product)
-    count_query = select(func.count(Product.id))
+    dialect_name = db.get_bind().dialect.name
+    filters = build_product_filters(search, category, stock_level, status, dialect_name)
+    cache_key = (search, category, stock_level, status)
     
-    # Apply filters
-    filters = []
+    if sort_by is None:
+        sort_by = "relevance" if search else "id"
     
-    if search:
-        search_filter = or_(
-            Product.name.ilike(f"%{search}%"),
-            Product.sku.ilike(f"%{search}%"),
-            Product.description.ilike(f"%{search}%")
-        )
-        filters.append(search_filter)
-    
-    if category:
-        category_filter = Product.category == category
-        filters.append(category_filter)
-    
-    if stock_level:
-        if stock_level == "low":
-            stock_filter = Product.current_stock <= Product.reorder_point
-        elif stock_level == "normal":
-            stock_filter = and_(
-                Product.current_stock > Product.reorder_point,
-                Product.current_stock <= Product.reorder_point * 2
+    if sort_by == "relevance":
+        if not search:
+            raise HTTPException(
+                status_code=400,
+                detail="sort_by=relevance requires a search term"
             )
-        elif stock_level == "high":
-            stock_filter = Product.current_stock > Product.reorder_point * 2
-        else:
-            stock_filter = None
-        
-        if stock_filter:
-            filters.append(stock_filter)
+        # Best matches first, exact SKU hits on top
+        sort_column = product_search_rank(search, dialect_name)
+        descending = True
+    else:
+        sort_column = PRODUCT_SORT_COLUMNS[sort_by]
+        descending = order == "desc"
     
-    if status:
-        if status == "out-of-stock":
-            status_filter = Product.current_stock == 0
-        elif status == "low-stock":
-            status_filter = and_(
-                Product.current_stock > 0,
-                Product.current_stock <= Product.reorder_point
-            )
-        elif status == "in-stock":
-            status_filter = Product.current_stock > Product.reorder_point
-        else:
-            status_filter = None
-        
-        if status_filter:
-            filters.append(status_filter)
+    if descending:
+        ordering = (sort_column.desc(), Product.id.desc())
+    else:
+        ordering = (sort_column.asc(), Product.id.asc())
     
-    # Apply filters to both queries
+    # Select plain columns (only the requested ones with fields=) plus the sort value for the cursor
+    columns = schema_columns(Product, ProductSchema, field_names)
+    query = select(*columns, sort_column.label("sort_value")).order_by(*ordering)
     if filters:
         query = query.where(and_(*filters))
-        count_query = count_query.where(and_(*filters))
+    
+    if pagination == "cursor" or cursor is not None:
+        # Seek past the last row of the previous page instead of skipping rows
+        if cursor:
+            value, last_id = decode_cursor(cursor, sort_by)
+            query = query.where(keyset_filter(sort_column, Product.id, value, last_id, descending))
+        
+        result = await db.execute(query.limit(limit + 1))
+        rows = result.all()
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        
+        next_cursor = None
+        if has_next:
+            last = rows[-1]
+            next_cursor = encode_cursor(sort_by, last.sort_value, last.id)
+        
+        total = await count_products(db, filters, total_mode or "none", cache_key)
+        
+        return _product_list_response(CursorProductsResponse, field_names, dict(
+            items=_rows_to_items(rows),
+            total=total,
+            limit=limit,
+            next_cursor=next_cursor,
+            has_next=has_next
+        ))
+    
+    if total_mode == "none":
+        raise HTTPException(
+            status_code=400,
+            detail="total_mode=none requires cursor pagination"
+        )
+    
+    skip = (page - 1) * limit
     
     # Get total count
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
+    total = await count_products(db, filters, total_mode or "exact", cache_key)
     
     # Get paginated results
     query = query.offset(skip).limit(limit)
     result = await db.execute(query)
-    products = result.scalars().all()
+    rows = result.all()
     
     # Calculate pagination info
     total_pages = (total + limit - 1) // limit
     has_next = page < total_pages
     has_prev = page > 1
     
-    return PaginatedProductsResponse(
-        items=products,
+    return _product_list_response(PaginatedProductsResponse, field_names, dict(
+        items=_rows_to_items(rows),
         total=total,
         page=page,
         limit=limit,
         total_pages=total_pages,
         has_next=has_next,
         has_prev=has_prev
+    ))
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+async def _stream_product_export(filters: list, export_format: str):
+    """
+    Yield the export body chunk by chunk from a server-side cursor.
+
+    Uses its own session so the cursor stays open for as long as the client
+    is reading, independent of the request's dependency lifecycle.
+    """
+    names = [column.name for column in PRODUCT_EXPORT_COLUMNS]
+    query = select(*PRODUCT_EXPORT_COLUMNS).order_by(Product.id)
+    if filters:
+        query = query.where(and_(*filters))
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == "csv":
+        writer.writerow(names)
+    
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(query.execution_options(yield_per=EXPORT_FETCH_SIZE))
+        async for partition in result.partitions():
+            for row in partition:
+                if export_format == "csv":
+                    writer.writerow(row)
+                else:
+                    buffer.write(json.dumps(dict(zip(names, row)), default=_json_default))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/export")
+async def export_products(
+    db: AsyncSession = Depends(get_async_db),
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$", description="csv or ndjson"),
+    search: Optional[str] = Query(None, description="Search term for name, SKU, or description"),
+    category: Optional[str] = Query(None, description="Filter by category"),
+    stock_level: Optional[str] = Query(None, description="Filter by stock level: low, normal, high"),
+    status: Optional[str] = Query(None, description="Filter by status: in-stock, low-stock, out-of-stock"),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Stream the product catalog with stock levels as CSV or NDJSON
+    """
+    filters = build_product_filters(search, category, stock_level, status, db.get_bind().dialect.name)
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    filename = f"products.{export_format}"
+    
+    return StreamingResponse(
+        _stream_product_export(filters, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
 
@@ -142,13 +409,96 @@ async def create_product(
     product = Product(**product_data)
     
     db.add(product)
+    stage_dashboard_deltas(db, product_deltas(
+        product.category, product.current_stock, product.reorder_point, product.cost_price, product.is_active
+    ))
     await db.commit()
+    product_categories.apply(None, product.category)
     await db.refresh(product)
     
     return product
 
 
-@router.get("/{product_id}", response_model=ProductSchema)
+@router.post("/bulk", response_model=ProductBulkResult)
+async def bulk_upsert_products(
+    bulk_in: ProductBulkRequest,
+    on_conflict: str = Query(
+        "update",
+        pattern="^(update|skip|error)$",
+        description="What to do with rows whose SKU already exists: update, skip or error"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Create or update many products by SKU with batched INSERT ... ON CONFLICT
+    """
+    if len(bulk_in.items) > settings.PRODUCT_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.PRODUCT_BULK_MAX_ITEMS} products can be sent per request"
+        )
+    
+    result_out = await upsert_products(db, bulk_in.items, on_conflict)
+    await db.commit()
+    product_categories.invalidate()
+    dashboard_counts.invalidate()
+    
+    return result_out
+
+
+@router.post("/import", response_model=ProductImportJob, status_code=status.HTTP_202_ACCEPTED)
+async def import_products(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    on_conflict: str = Query(
+        "update",
+        pattern="^(update|skip|error)$",
+        description="What to do with rows whose SKU already exists: update, skip or error"
+    ),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Start a streaming CSV/XLSX product import; poll GET /import/{job_id} for progress
+    """
+    extension = os.path.splitext(file.filename or "")[1].lower()
+    file_format = IMPORT_FORMATS.get(extension)
+    if not file_format:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only .csv and .xlsx files can be imported"
+        )
+    
+    # Spool the upload to disk in chunks so the job can outlive the request
+    with tempfile.NamedTemporaryFile(suffix=extension, delete=False) as spool:
+        while chunk := await file.read(1024 * 1024):
+            spool.write(chunk)
+    
+    job = ProductImportJob(id=uuid.uuid4().hex, filename=file.filename)
+    import_jobs.set(job.id, job)
+    background_tasks.add_task(run_product_import, job, spool.name, file_format, on_conflict)
+    
+    return job
+
+
+@router.get("/import/{job_id}", response_model=ProductImportJob)
+async def read_import_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Get progress of a product import
+    """
+    job = import_jobs.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    return job
+
+
+@router.get("/{product_id}", response_model=ProductSchema, dependencies=[Depends(query_budget(2))])
 async def read_product(
     product_id: int,
     db: AsyncSession = Depends(get_async_db),
@@ -178,6 +528,8 @@ async def update_product(
 ) -> Any:
     """
     Update product
+    
+    current_stock is rejected; stock changes go through POST /{product_id}/adjust.
     """
     result = await db.execute(select(Product).where(Product.id == product_id))
     product = result.scalar_one_or_none()
@@ -197,18 +549,127 @@ async def update_product(
                 detail="A product with this SKU already exists"
             )
     
+    previous_category = product.category
+    previous_counts = product_deltas(
+        product.category, product.current_stock, product.reorder_point, product.cost_price, product.is_active, -1
+    )
+    
     # Update product fields
     update_data = product_in.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(product, field, value)
     
+    stage_dashboard_deltas(db, previous_counts)
+    stage_dashboard_deltas(db, product_deltas(
+        product.category, product.current_stock, product.reorder_point, product.cost_price, product.is_active
+    ))
     await db.commit()
+    product_categories.apply(previous_category, product.category)
     await db.refresh(product)
     
     return product
 
 
-@router.delete("/{product_id}")
+@router.post("/adjust/batch", response_model=List[StockAdjustmentResult])
+async def adjust_products_stock(
+    batch_in: StockAdjustmentBatch,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Apply signed stock deltas to many products, all or nothing
+    """
+    if not batch_in.adjustments:
+        return []
+    if len(batch_in.adjustments) > settings.PRODUCT_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.PRODUCT_BULK_MAX_ITEMS} adjustments per request"
+        )
+    
+    deltas = {}
+    for adjustment in batch_in.adjustments:
+        deltas[adjustment.product_id] = deltas.get(adjustment.product_id, 0) + adjustment.delta
+    
+    # One conditional UPDATE for every product; any product left out failed its check
+    stock_levels = await increment_stock(db, deltas, allow_negative=False)
+    rejected = sorted(set(deltas) - set(stock_levels))
+    if rejected:
+        await db.rollback()
+        result = await db.execute(select(Product.id).where(Product.id.in_(rejected)))
+        existing = set(result.scalars().all())
+        missing = [product_id for product_id in rejected if product_id not in existing]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Products not found: {missing}"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Insufficient stock for products: {rejected}"
+        )
+    
+    await post_ledger_entries(db, [
+        adjustment_ledger_row(adjustment.product_id, adjustment.delta, adjustment, current_user.id)
+        for adjustment in batch_in.adjustments
+    ])
+    await db.commit()
+    
+    return [
+        StockAdjustmentResult(product_id=product_id, current_stock=stock_levels[product_id])
+        for product_id in sorted(stock_levels)
+    ]
+
+
+@router.post("/{product_id}/adjust", response_model=ProductSchema, dependencies=[Depends(query_budget(4))])
+async def adjust_product_stock(
+    product_id: int,
+    adjustment_in: StockAdjustment,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Apply a signed stock delta atomically
+    
+    A single conditional UPDATE ... RETURNING, so concurrent adjustments never
+    lose each other's changes and stock never goes below zero.
+    """
+    new_stock = func.coalesce(Product.current_stock, 0) + adjustment_in.delta
+    result = await db.execute(
+        update(Product)
+        .where(Product.id == product_id, new_stock >= 0)
+        .values(current_stock=new_stock)
+        .returning(*schema_columns(Product, ProductSchema))
+        .execution_options(synchronize_session=False)
+    )
+    product = result.one_or_none()
+    
+    if product is None:
+        await db.rollback()
+        result = await db.execute(select(Product.id).where(Product.id == product_id))
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product not found"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Insufficient stock for this adjustment"
+        )
+    
+    await post_ledger_entries(db, [
+        adjustment_ledger_row(product_id, adjustment_in.delta, adjustment_in, current_user.id)
+    ])
+    stage_dashboard_deltas(db, stock_change_deltas(
+        product.category, product.current_stock, adjustment_in.delta,
+        product.reorder_point, product.cost_price, product.is_active
+    ))
+    await db.commit()
+    
+    return product._asdict()
+
+
+@router.delete("/{product_id}", dependencies=[Depends(query_budget(4))])
 async def delete_product(
     product_id: int,
     db: AsyncSession = Depends(get_async_db),
@@ -217,42 +678,65 @@ async def delete_product(
     """
     Delete product
     """
-    result = await db.execute(select(Product).where(Product.id == product_id))
-    product = result.scalar_one_or_none()
+    # Existence and dependent checks in one round-trip, without loading any collection
+    result = await db.execute(
+        select(
+            select(Product.category).where(Product.id == product_id).scalar_subquery(),
+            exists().where(Product.id == product_id),
+            exists().where(InventoryItem.product_id == product_id),
+            exists().where(OrderItem.product_id == product_id),
+            exists().where(PurchaseOrderItem.product_id == product_id),
+        )
+    )
+    category, product_exists, has_inventory, has_orders, has_purchase_orders = result.one()
     
-    if not product:
+    if not product_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
     
     # Check if product has associated inventory or orders
-    if product.inventory_items or product.order_items:
+    if has_inventory or has_orders or has_purchase_orders:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete product with associated inventory or orders"
         )
     
-    await db.delete(product)
+    await db.execute(delete(Product).where(Product.id == product_id))
     await db.commit()
+    product_categories.apply(category, None)
+    dashboard_counts.invalidate()
     
     return {"message": "Product deleted successfully"}
 
 
 @router.get("/categories/list")
 async def get_categories(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
-    Get list of all product categories
+    Get list of all product categories with product counts
+    
+    Served from an in-process cache; send If-None-Match with the returned ETag to revalidate.
     """
-    result = await db.execute(select(Product.category).distinct().where(Product.category.isnot(None)))
-    categories = result.scalars().all()
-    return {"categories": [cat for cat in categories if cat]}
+    counts = await product_categories.get(db)
+    etag = product_categories.etag
+    if if_none_match == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    response.headers["ETag"] = etag
+    return {
+        "categories": sorted(counts),
+        "counts": counts,
+        "version": etag
+    }
 
 
-@router.get("/low-stock/list")
+@router.get("/low-stock/list", response_model=List[ProductSchema])
 async def get_low_stock_products(
     db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
@@ -260,18 +744,17 @@ async def get_low_stock_products(
     """
     Get list of products with low stock
     """
-    query = select(Product).where(
+    query = select(*schema_columns(Product, ProductSchema)).where(
         and_(
-            Product.current_stock <= Product.reorder_point,
+            Product.stock_status.in_(STOCK_LEVEL_BUCKETS["low"]),
             Product.is_active == True
         )
     )
     result = await db.execute(query)
-    products = result.scalars().all()
-    return products
+    return [row._asdict() for row in result]
 
 
-@router.get("/out-of-stock/list")
+@router.get("/out-of-stock/list", response_model=List[ProductSchema])
 async def get_out_of_stock_products(
     db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_active_user),
@@ -279,12 +762,28 @@ async def get_out_of_stock_products(
     """
     Get list of products that are out of stock
     """
-    query = select(Product).where(
+    query = select(*schema_columns(Product, ProductSchema)).where(
         and_(
-            Product.current_stock == 0,
+            Product.stock_status == StockStatus.OUT_OF_STOCK.value,
             Product.is_active == True
         )
     )
     result = await db.execute(query)
-    products = result.scalars().all()
-    return products 
\ No newline at end of file
+    return [row._asdict() for row in result] 
+
+
+@router.get("/stock-status/summary", response_model=StockStatusSummary)
+async def get_stock_status_summary(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_active_user),
+) -> Any:
+    """
+    Count active products per stock status bucket
+    """
+    result = await db.execute(
+        select(Product.stock_status, func.count())
+        .where(Product.is_active == True)
+        .group_by(Product.stock_status)
+    )
+    counts = {bucket: count for bucket, count in result.all() if bucket}
+    return StockStatusSummary(**counts, total=sum(counts.values()))
\ No newline at end of file
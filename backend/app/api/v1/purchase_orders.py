@@ -1,44 +1,152 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from datetime import datetime
+from sqlalchemy import and_, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from datetime import datetime, timezone
 
 from app.core.deps import get_current_active_user, get_current_superuser
+from app.core.pagination import decode_cursor, encode_cursor, keyset_filter
 from app.db.database import get_async_db
+from app.db.projection import schema_columns
+from app.db.query_counter import query_budget
 from app.models.purchase_order import PurchaseOrder, PurchaseOrderItem, PurchaseOrderStatus
 from app.models.user import User
 from app.schemas.purchase_order import (
     PurchaseOrder as PurchaseOrderSchema,
     PurchaseOrderCreate,
     PurchaseOrderUpdate,
-    PurchaseOrderSummary
+    PurchaseOrderSummary,
+    PurchaseOrderListResponse,
+    PurchaseOrderStatus as PurchaseOrderStatusFilter,
+    PurchaseOrderReceipt,
+    PurchaseOrderReceiptCreate,
+    ReplenishmentResult
 )
+from app.services.dashboard_counts import purchase_order_deltas, stage_dashboard_deltas
+from app.services.receiving import post_purchase_order_receipt
+from app.services.replenishment import run_replenishment
 
 router = APIRouter()
 
+# Statuses that no longer wait for a delivery
+CLOSED_STATUSES = (PurchaseOrderStatus.RECEIVED, PurchaseOrderStatus.CANCELLED)
 
-@router.get("/", response_model=List[PurchaseOrderSummary])
+
+async def get_purchase_order_with_items(db: AsyncSession, po_id: int) -> PurchaseOrder:
+    """
+    Load a purchase order with its items in two statements (selectinload),
+    so response serialization never triggers an async lazy load
+    """
+    result = await db.execute(
+        select(PurchaseOrder)
+        .options(selectinload(PurchaseOrder.items))
+        .where(PurchaseOrder.id == po_id)
+    )
+    purchase_order = result.scalar_one_or_none()
+    
+    if not purchase_order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Purchase order not found"
+        )
+    
+    return purchase_order
+
+
+@router.get("/", response_model=PurchaseOrderListResponse, dependencies=[Depends(query_budget(3))])
 async def read_purchase_orders(
     db: AsyncSession = Depends(get_async_db),
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page"),
+    supplier_id: Optional[int] = Query(None, description="Filter by supplier"),
+    po_status: Optional[PurchaseOrderStatusFilter] = Query(None, alias="status", description="Filter by status"),
+    order_date_from: Optional[datetime] = Query(None, description="Orders placed on or after this time"),
+    order_date_to: Optional[datetime] = Query(None, description="Orders placed before this time"),
+    overdue: bool = Query(False, description="Only open orders whose expected delivery has passed"),
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
-    Retrieve purchase orders
+    Retrieve purchase orders, newest first, with per-status counts
     """
-    result = await db.execute(
-        select(PurchaseOrder)
-        .offset(skip)
-        .limit(limit)
-        .order_by(PurchaseOrder.created_at.desc())
+    filters = []
+    if supplier_id is not None:
+        filters.append(PurchaseOrder.supplier_id == supplier_id)
+    if order_date_from is not None:
+        filters.append(PurchaseOrder.order_date >= order_date_from)
+    if order_date_to is not None:
+        filters.append(PurchaseOrder.order_date < order_date_to)
+    if overdue:
+        filters.append(PurchaseOrder.expected_delivery < datetime.now(timezone.utc))
+        filters.append(PurchaseOrder.status.notin_(CLOSED_STATUSES))
+    
+    # Counts cover every status so the UI can show tab badges without extra requests
+    count_query = select(PurchaseOrder.status, func.count(PurchaseOrder.id)).group_by(PurchaseOrder.status)
+    if filters:
+        count_query = count_query.where(and_(*filters))
+    result = await db.execute(count_query)
+    status_counts = {
+        PurchaseOrderStatusFilter(po_status_value.value): count
+        for po_status_value, count in result.all()
+        if po_status_value is not None
+    }
+    
+    if po_status is not None:
+        filters.append(PurchaseOrder.status == PurchaseOrderStatus(po_status.value))
+        total = status_counts.get(po_status, 0)
+    else:
+        total = sum(status_counts.values())
+    
+    # Only the columns PurchaseOrderSummary needs, skipping notes/terms blobs and ORM hydration
+    query = (
+        select(*schema_columns(PurchaseOrder, PurchaseOrderSummary))
+        .order_by(PurchaseOrder.created_at.desc(), PurchaseOrder.id.desc())
     )
-    purchase_orders = result.scalars().all()
-    return purchase_orders
+    if filters:
+        query = query.where(and_(*filters))
+    if cursor:
+        # Seek past the last row of the previous page instead of skipping rows
+        value, last_id = decode_cursor(cursor, "created_at")
+        query = query.where(keyset_filter(PurchaseOrder.created_at, PurchaseOrder.id, value, last_id, descending=True))
+    
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.all()
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    
+    next_cursor = None
+    if has_next:
+        next_cursor = encode_cursor("created_at", rows[-1].created_at, rows[-1].id)
+    
+    return PurchaseOrderListResponse(
+        items=[row._asdict() for row in rows],
+        status_counts=status_counts,
+        total=total,
+        limit=limit,
+        next_cursor=next_cursor,
+        has_next=has_next
+    )
+
+
+@router.post("/replenishment", response_model=ReplenishmentResult)
+async def replenish_stock(
+    dry_run: bool = Query(True, description="Only return the proposal, write nothing"),
+    include_items: bool = Query(True, description="Include the per-product lines in the response"),
+    current_user: User = Depends(get_current_superuser),
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """
+    Draft one purchase order per supplier for every product that needs restocking
+    """
+    result = await run_replenishment(db, current_user.id, dry_run=dry_run, include_items=include_items)
+    if not dry_run:
+        await db.commit()
+    
+    return result
 
 
-@router.get("/{po_id}", response_model=PurchaseOrderSchema)
+@router.get("/{po_id}", response_model=PurchaseOrderSchema, dependencies=[Depends(query_budget(3))])
 async def read_purchase_order(
     po_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -47,14 +155,7 @@ async def read_purchase_order(
     """
     Get a specific purchase order by id
     """
-    result = await db.execute(select(PurchaseOrder).where(PurchaseOrder.id == po_id))
-    purchase_order = result.scalar_one_or_none()
-    
-    if not purchase_order:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Purchase order not found"
-        )
+    purchase_order = await get_purchase_order_with_items(db, po_id)
     
     return purchase_order
 
@@ -67,19 +168,39 @@ async def create_purchase_order(
 ) -> Any:
     """
     Create new purchase order
+    
+    Header and items are written in one transaction, items with a single
+    multi-row INSERT, and totals are computed from the items.
     """
-    # Create purchase order
-    purchase_order = PurchaseOrder(
+    item_rows = [
+        {
+            "product_id": item.product_id,
+            "quantity": item.quantity,
+            "unit_cost": item.unit_cost,
+            "total_cost": item.quantity * item.unit_cost,
+            "received_quantity": item.received_quantity,
+        }
+        for item in purchase_order_in.items
+    ]
+    subtotal = sum(row["total_cost"] for row in item_rows)
+    total_amount = (
+        subtotal
+        + purchase_order_in.tax_amount
+        + purchase_order_in.shipping_amount
+        - purchase_order_in.discount_amount
+    )
+    
+    header = dict(
         po_number=purchase_order_in.po_number,
         supplier_id=purchase_order_in.supplier_id,
-        status=purchase_order_in.status,
+        status=PurchaseOrderStatus(purchase_order_in.status.value),
         order_date=purchase_order_in.order_date,
         expected_delivery=purchase_order_in.expected_delivery,
-        subtotal=purchase_order_in.subtotal,
+        subtotal=subtotal,
         tax_amount=purchase_order_in.tax_amount,
         shipping_amount=purchase_order_in.shipping_amount,
         discount_amount=purchase_order_in.discount_amount,
-        total_amount=purchase_order_in.total_amount,
+        total_amount=total_amount,
         shipping_address=purchase_order_in.shipping_address,
         shipping_method=purchase_order_in.shipping_method,
         notes=purchase_order_in.notes,
@@ -87,26 +208,43 @@ async def create_purchase_order(
         created_by=current_user.id
     )
     
-    db.add(purchase_order)
-    await db.commit()
-    await db.refresh(purchase_order)
-    
-    # Create purchase order items
-    for item in purchase_order_in.items:
-        po_item = PurchaseOrderItem(
-            purchase_order_id=purchase_order.id,
-            product_id=item.product_id,
-            quantity=item.quantity,
-            unit_cost=item.unit_cost,
-            total_cost=item.total_cost,
-            received_quantity=item.received_quantity
+    try:
+        result = await db.execute(
+            insert(PurchaseOrder)
+            .values(**header)
+            .returning(PurchaseOrder.id, PurchaseOrder.created_at)
+        )
+        po_id, created_at = result.one()
+        
+        for row in item_rows:
+            row["purchase_order_id"] = po_id
+        
+        items = []
+        if item_rows:
+            result = await db.execute(
+                insert(PurchaseOrderItem).returning(
+                    PurchaseOrderItem.id,
+                    PurchaseOrderItem.created_at,
+                    sort_by_parameter_order=True
+                ),
+                item_rows
+            )
+            items = [
+                {**row, "id": item_id, "created_at": item_created_at}
+                for row, (item_id, item_created_at) in zip(item_rows, result.all())
+            ]
+        
+        stage_dashboard_deltas(db, purchase_order_deltas(header["status"], header["total_amount"]))
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Purchase order number already exists or references an unknown supplier or product"
         )
-        db.add(po_item)
-    
-    await db.commit()
-    await db.refresh(purchase_order)
     
-    return purchase_order
+    # Build the response from what was written instead of re-selecting
+    return PurchaseOrderSchema(**header, id=po_id, created_at=created_at, items=items)
 
 
 @router.put("/{po_id}", response_model=PurchaseOrderSchema)
@@ -119,19 +257,14 @@ async def update_purchase_order(
     """
     Update a purchase order
     """
-    result = await db.execute(select(PurchaseOrder).where(PurchaseOrder.id == po_id))
-    purchase_order = result.scalar_one_or_none()
-    
-    if not purchase_order:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Purchase order not found"
-        )
+    purchase_order = await get_purchase_order_with_items(db, po_id)
+    stage_dashboard_deltas(db, purchase_order_deltas(purchase_order.status, purchase_order.total_amount, -1))
     
     # Update fields
     for field, value in purchase_order_in.dict(exclude_unset=True).items():
         setattr(purchase_order, field, value)
     
+    stage_dashboard_deltas(db, purchase_order_deltas(purchase_order.status, purchase_order.total_amount))
     await db.commit()
     await db.refresh(purchase_order)
     
@@ -147,16 +280,10 @@ async def delete_purchase_order(
     """
     Delete a purchase order (admin only)
     """
-    result = await db.execute(select(PurchaseOrder).where(PurchaseOrder.id == po_id))
-    purchase_order = result.scalar_one_or_none()
-    
-    if not purchase_order:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Purchase order not found"
-        )
+    purchase_order = await get_purchase_order_with_items(db, po_id)
     
     await db.delete(purchase_order)
+    stage_dashboard_deltas(db, purchase_order_deltas(purchase_order.status, purchase_order.total_amount, -1))
     await db.commit()
     
     return {"message": "Purchase order deleted successfully"}
@@ -171,14 +298,7 @@ async def approve_purchase_order(
     """
     Approve a purchase order (admin only)
     """
-    result = await db.execute(select(PurchaseOrder).where(PurchaseOrder.id == po_id))
-    purchase_order = result.scalar_one_or_none()
-    
-    if not purchase_order:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Purchase order not found"
-        )
+    purchase_order = await get_purchase_order_with_items(db, po_id)
     
     if purchase_order.status != PurchaseOrderStatus.SUBMITTED:
         raise HTTPException(
@@ -190,13 +310,15 @@ async def approve_purchase_order(
     purchase_order.approved_by = current_user.id
     purchase_order.approved_at = datetime.utcnow()
     
+    stage_dashboard_deltas(db, purchase_order_deltas(PurchaseOrderStatus.SUBMITTED, purchase_order.total_amount, -1))
+    stage_dashboard_deltas(db, purchase_order_deltas(PurchaseOrderStatus.APPROVED, purchase_order.total_amount))
     await db.commit()
     await db.refresh(purchase_order)
     
     return purchase_order
 
 
-@router.patch("/{po_id}/receive", response_model=PurchaseOrderSchema)
+@router.patch("/{po_id}/receive", response_model=PurchaseOrderSchema, dependencies=[Depends(query_budget(6))])
 async def receive_purchase_order(
     po_id: int,
     current_user: User = Depends(get_current_active_user),
@@ -205,14 +327,7 @@ async def receive_purchase_order(
     """
     Mark purchase order as received
     """
-    result = await db.execute(select(PurchaseOrder).where(PurchaseOrder.id == po_id))
-    purchase_order = result.scalar_one_or_none()
-    
-    if not purchase_order:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Purchase order not found"
-        )
+    purchase_order = await get_purchase_order_with_items(db, po_id)
     
     if purchase_order.status not in [PurchaseOrderStatus.APPROVED, PurchaseOrderStatus.ORDERED]:
         raise HTTPException(
@@ -226,12 +341,34 @@ async def receive_purchase_order(
         for item in purchase_order.items
     )
     
+    stage_dashboard_deltas(db, purchase_order_deltas(purchase_order.status, purchase_order.total_amount, -1))
     if all_received:
         purchase_order.status = PurchaseOrderStatus.RECEIVED
     else:
         purchase_order.status = PurchaseOrderStatus.PARTIALLY_RECEIVED
+    stage_dashboard_deltas(db, purchase_order_deltas(purchase_order.status, purchase_order.total_amount))
     
     await db.commit()
     await db.refresh(purchase_order)
     
-    return purchase_order 
\ No newline at end of file
+    return purchase_order 
+
+
+@router.post("/{po_id}/receipts", response_model=PurchaseOrderReceipt)
+async def create_purchase_order_receipt(
+    po_id: int,
+    receipt_in: PurchaseOrderReceiptCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """
+    Receive goods against a purchase order (partial deliveries allowed)
+    
+    Records IN movements in the inventory ledger, increments product stock and
+    updates the PO status in one transaction.
+    """
+    stock_levels = await post_purchase_order_receipt(db, po_id, receipt_in, current_user.id)
+    await db.commit()
+    
+    purchase_order = await get_purchase_order_with_items(db, po_id)
+    return PurchaseOrderReceipt(purchase_order=purchase_order, stock_levels=stock_levels)
@@ -1,13 +1,18 @@
 from typing import Any, List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
+from sqlalchemy import delete, exists, select, or_
 
 from app.core.deps import get_current_active_user
 from app.db.database import get_async_db
+from app.db.projection import schema_columns
+from app.db.query_counter import query_budget
+from app.models.product import Product
+from app.models.purchase_order import PurchaseOrder
 from app.models.supplier import Supplier
 from app.models.user import User
 from app.schemas.supplier import Supplier as SupplierSchema, SupplierCreate, SupplierUpdate, SupplierSummary
+from app.services.dashboard_counts import dashboard_counts, stage_dashboard_deltas
 
 router = APIRouter()
 
@@ -23,7 +28,8 @@ async def read_suppliers(
     """
     Retrieve suppliers with optional search
     """
-    query = select(Supplier)
+    # Only the columns SupplierSummary needs, skipping address/notes blobs and ORM hydration
+    query = select(*schema_columns(Supplier, SupplierSummary))
     
     if search:
         query = query.where(
@@ -35,8 +41,7 @@ async def read_suppliers(
         )
     
     result = await db.execute(query.offset(skip).limit(limit))
-    suppliers = result.scalars().all()
-    return suppliers
+    return [row._asdict() for row in result]
 
 
 @router.post("/", response_model=SupplierSchema)
@@ -58,6 +63,8 @@ async def create_supplier(
     
     supplier = Supplier(**supplier_in.dict())
     db.add(supplier)
+    if supplier.is_active is not False:
+        stage_dashboard_deltas(db, {("active_suppliers",): 1})
     await db.commit()
     await db.refresh(supplier)
     return supplier
@@ -112,16 +119,19 @@ async def update_supplier(
                 detail="A supplier with this name already exists"
             )
     
+    was_active = supplier.is_active is not False
+    
     # Update supplier fields
     for field, value in supplier_in.dict(exclude_unset=True).items():
         setattr(supplier, field, value)
     
+    stage_dashboard_deltas(db, {("active_suppliers",): int(supplier.is_active is not False) - int(was_active)})
     await db.commit()
     await db.refresh(supplier)
     return supplier
 
 
-@router.delete("/{supplier_id}")
+@router.delete("/{supplier_id}", dependencies=[Depends(query_budget(4))])
 async def delete_supplier(
     supplier_id: int,
     db: AsyncSession = Depends(get_async_db),
@@ -130,23 +140,31 @@ async def delete_supplier(
     """
     Delete supplier
     """
-    result = await db.execute(select(Supplier).where(Supplier.id == supplier_id))
-    supplier = result.scalar_one_or_none()
+    # Existence and dependent checks in one round-trip, without loading any collection
+    result = await db.execute(
+        select(
+            exists().where(Supplier.id == supplier_id),
+            exists().where(Product.supplier_id == supplier_id),
+            exists().where(PurchaseOrder.supplier_id == supplier_id),
+        )
+    )
+    supplier_exists, has_products, has_purchase_orders = result.one()
     
-    if not supplier:
+    if not supplier_exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Supplier not found"
         )
     
-    # Check if supplier has associated products
-    if supplier.products:
+    # Check if supplier has associated products or purchase orders
+    if has_products or has_purchase_orders:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot delete supplier with associated products"
+            detail="Cannot delete supplier with associated products or purchase orders"
         )
     
-    await db.delete(supplier)
+    await db.execute(delete(Supplier).where(Supplier.id == supplier_id))
     await db.commit()
+    dashboard_counts.invalidate()
     
     return {"message": "Supplier deleted successfully"} 
\ No newline at end of file
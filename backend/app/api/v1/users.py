@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.core.deps import get_current_active_user, get_current_superuser
+from app.core.deps import get_current_active_user, get_current_superuser, invalidate_cached_user, user_cache
 from app.db.database import get_async_db
 from app.models.user import User
 from app.schemas.user import User as UserSchema, UserUpdate
@@ -30,15 +30,28 @@ async def update_user_me(
     """
     Update current user
     """
+    previous_email = current_user.email
+    
     # Update user fields
     for field, value in user_in.dict(exclude_unset=True).items():
         setattr(current_user, field, value)
     
     await db.commit()
+    invalidate_cached_user(previous_email, current_user.email)
     await db.refresh(current_user)
     return current_user
 
 
+@router.get("/cache/stats")
+async def read_user_cache_stats(
+    current_user: User = Depends(get_current_superuser),
+) -> Any:
+    """
+    Get authenticated-user cache size and hit/miss counters (admin only)
+    """
+    return user_cache.stats()
+
+
 @router.get("/", response_model=List[UserSchema])
 async def read_users(
     db: AsyncSession = Depends(get_async_db),
@@ -101,10 +114,13 @@ async def update_user(
             detail="User not found"
         )
     
+    previous_email = user.email
+    
     # Update user fields
     for field, value in user_in.dict(exclude_unset=True).items():
         setattr(user, field, value)
     
     await db.commit()
+    invalidate_cached_user(previous_email, user.email)
     await db.refresh(user)
     return user 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import validator
 import os
@@ -21,6 +21,10 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Password hashing pool (bcrypt runs off the event loop)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    
     # AWS
     AWS_ACCESS_KEY_ID: Optional[str] = None
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
@@ -39,7 +43,83 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: Optional[str] = None
     
-    @validator("ALLOWED_ORIGINS", pre=True)
+    # Fail requests that exceed their query budget (tests/CI); otherwise only log
+    QUERY_BUDGET_STRICT: bool = False
+    
+    # Pagination
+    PRODUCT_COUNT_CACHE_TTL_SECONDS: int = 60
+    
+    # Product category list cache (full reload interval)
+    CATEGORY_CACHE_TTL_SECONDS: int = 300
+    
+    # Bulk product writes
+    PRODUCT_BULK_BATCH_SIZE: int = 1000
+    PRODUCT_BULK_MAX_ITEMS: int = 10000
+    PRODUCT_IMPORT_MAX_ERRORS: int = 1000
+    
+    # Inventory ledger partitions (monthly, PostgreSQL)
+    LEDGER_PARTITION_MONTHS_AHEAD: int = 3
+    LEDGER_PARTITION_CHECK_INTERVAL_SECONDS: int = 6 * 60 * 60
+    LEDGER_RETENTION_MONTHS: int = 24
+    
+    # Stock snapshots for point-in-time queries; the settle delay keeps
+    # snapshots behind transactions that were still open at the cut-off
+    STOCK_SNAPSHOT_INTERVAL_SECONDS: int = 24 * 60 * 60
+    STOCK_SNAPSHOT_SETTLE_SECONDS: int = 300
+    STOCK_SNAPSHOT_RETENTION_DAYS: int = 400
+    
+    # Inventory valuation (ledger rows per streamed chunk)
+    VALUATION_CHUNK_ROWS: int = 1_000_000
+    
+    # Inventory turnover/aging reports (ledger rows per streamed chunk, aging
+    # bucket upper bounds in days, cached per date range; closed periods longer)
+    INVENTORY_ANALYTICS_CHUNK_ROWS: int = 1_000_000
+    INVENTORY_AGING_BUCKET_DAYS: List[int] = [30, 60, 90, 180]
+    INVENTORY_ANALYTICS_CACHE_MAXSIZE: int = 32
+    INVENTORY_ANALYTICS_CACHE_TTL_SECONDS: int = 300
+    INVENTORY_ANALYTICS_CLOSED_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+    
+    # Demand forecasting on daily history: SES with the smoothing constant picked
+    # per product from FORECAST_SES_ALPHAS, Croston once the average gap between
+    # demand days reaches FORECAST_CROSTON_MIN_INTERVAL. Products are fitted in
+    # shards of FORECAST_SHARD_PRODUCTS over FORECAST_WORKERS processes. The
+    # scheduled job refits products with new demand once per day and everything
+    # every FORECAST_FULL_REFIT_DAYS; it only sets reorder points when told to
+    FORECAST_HISTORY_DAYS: int = 365
+    FORECAST_SES_ALPHAS: List[float] = [0.05, 0.1, 0.2, 0.3, 0.5]
+    FORECAST_CROSTON_ALPHA: float = 0.1
+    FORECAST_CROSTON_MIN_INTERVAL: float = 1.32
+    FORECAST_WORKERS: int = 4
+    FORECAST_SHARD_PRODUCTS: int = 2000
+    FORECAST_CHECK_INTERVAL_SECONDS: int = 60 * 60
+    FORECAST_FULL_REFIT_DAYS: int = 7
+    FORECAST_SETTLE_SECONDS: int = 300
+    FORECAST_LEAD_TIME_DAYS: int = 14
+    FORECAST_SERVICE_LEVEL_Z: float = 1.65
+    FORECAST_APPLY_REORDER_POINTS: bool = False
+    
+    # Picking waves; zones are the first segment of a shelf code (e.g. "B" in "B-04-2")
+    PICKING_WAVE_MAX_ORDERS: int = 5000
+    PICKING_ZONE_ORDER: List[str] = []
+    PICKING_SERPENTINE: bool = True
+    
+    # Replenishment (rows per multi-row INSERT when writing draft purchase orders)
+    REPLENISHMENT_BATCH_SIZE: int = 5000
+    
+    # Dashboard counters: recomputed every DASHBOARD_REFRESH_SECONDS and kept
+    # current in between from this worker's writes; a request recomputes inline
+    # only when they are older than DASHBOARD_MAX_STALENESS_SECONDS.
+    # DASHBOARD_MOVEMENT_DAYS of daily movement are kept (turnover uses 365)
+    DASHBOARD_REFRESH_SECONDS: int = 60
+    DASHBOARD_MAX_STALENESS_SECONDS: int = 300
+    DASHBOARD_MOVEMENT_DAYS: int = 365
+    WAREHOUSE_CAPACITIES: Dict[str, int] = {}
+    
+    # Authenticated user cache (0 disables caching)
+    USER_CACHE_TTL_SECONDS: int = 30
+    USER_CACHE_MAXSIZE: int = 1024
+    
+    @validator("ALLOWED_ORIGINS", "PICKING_ZONE_ORDER", pre=True)
     def assemble_cors_origins(cls, v):
         if isinstance(v, str) and not v.startswith("["):
             return [i.strip() for i in v.split(",")]
@@ -1,16 +1,48 @@
 from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import inspect
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app.db.database import get_async_db, get_db
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.security import verify_token
 from app.models.user import User
 from app.schemas.user import TokenData
 
 security = HTTPBearer()
 
+# Column values of authenticated users keyed by token subject (email)
+user_cache = TTLCache(maxsize=settings.USER_CACHE_MAXSIZE, ttl=settings.USER_CACHE_TTL_SECONDS)
+
+
+def invalidate_cached_user(*emails: Optional[str]) -> None:
+    """Drop cached users so the next request reloads them from the database"""
+    for email in emails:
+        if email:
+            user_cache.pop(email)
+
+
+def _cache_user(email: str, user: User) -> None:
+    if settings.USER_CACHE_TTL_SECONDS <= 0:
+        return
+    user_cache.set(email, {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
+
+
+def _user_from_cache(db: AsyncSession, email: str) -> Optional[User]:
+    if settings.USER_CACHE_TTL_SECONDS <= 0:
+        return None
+    values = user_cache.get(email)
+    if values is None:
+        return None
+    # Attach a fresh instance to this session without a SELECT so handlers can still modify it
+    user = User(**values)
+    make_transient_to_detached(user)
+    db.add(user)
+    return user
+
 
 async def get_current_user(
     db: AsyncSession = Depends(get_async_db),
@@ -27,13 +59,17 @@ async def get_current_user(
     if email is None:
         raise credentials_exception
     
-    # Get user from database
-    from sqlalchemy import select
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
-    
+    # Get user from cache, falling back to the database
+    user = _user_from_cache(db, email)
     if user is None:
-        raise credentials_exception
+        from sqlalchemy import select
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalar_one_or_none()
+        
+        if user is None:
+            raise credentials_exception
+        _cache_user(email, user)
+    
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -0,0 +1,42 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+
+def encode_cursor(sort_key: str, value: Any, last_id: int) -> str:
+    """Encode the position after ``(value, last_id)`` as an opaque cursor"""
+    if isinstance(value, datetime):
+        value = {"t": value.isoformat()}
+    payload = json.dumps({"k": sort_key, "v": value, "i": last_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_key: str) -> Tuple[Any, int]:
+    """Decode a cursor produced by ``encode_cursor`` for the given sort key"""
+    invalid_cursor = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value = payload["v"]
+        last_id = int(payload["i"])
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["t"])
+    except (ValueError, KeyError, TypeError):
+        raise invalid_cursor
+    if payload.get("k") != sort_key:
+        raise invalid_cursor
+    return value, last_id
+
+
+def keyset_filter(sort_column, id_column, value: Any, last_id: int, descending: bool = False):
+    """Row-value predicate that seeks past ``(value, last_id)`` in index order"""
+    if descending:
+        return tuple_(sort_column, id_column) < tuple_(value, last_id)
+    return tuple_(sort_column, id_column) > tuple_(value, last_id)
@@ -0,0 +1,36 @@
+import asyncio
+from typing import Awaitable, Callable, List
+
+import structlog
+
+logger = structlog.get_logger()
+
+_tasks: List[asyncio.Task] = []
+
+
+def start_periodic(name: str, interval: float, job: Callable[[], Awaitable[None]]) -> None:
+    """
+    Run ``job`` now and then every ``interval`` seconds until shutdown.
+
+    Failures are logged and retried on the next tick. Every worker process runs
+    its own loop, so jobs must be safe to run concurrently (advisory locks,
+    idempotent writes).
+    """
+    async def runner():
+        while True:
+            try:
+                await job()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Periodic job failed", job=name)
+            await asyncio.sleep(interval)
+
+    _tasks.append(asyncio.create_task(runner(), name=name))
+
+
+async def stop_periodic() -> None:
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
@@ -0,0 +1,25 @@
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+def dialect_insert(dialect_name: str):
+    """
+    Return the dialect's ``insert`` construct, which supports ON CONFLICT upserts
+    """
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    raise ValueError(f"Upserts are not supported on {dialect_name}")
+
+
+def epoch_seconds(column, dialect_name: str):
+    """
+    Return ``column`` (a timestamp) as float seconds since the Unix epoch, so
+    bulk reads can go straight into numeric arrays
+    """
+    if dialect_name == "postgresql":
+        return func.extract("epoch", column)
+    if dialect_name == "sqlite":
+        return (func.julianday(column) - 2440587.5) * 86400.0
+    raise ValueError(f"Epoch conversion is not supported on {dialect_name}")
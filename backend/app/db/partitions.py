@@ -0,0 +1,146 @@
+import csv
+import gzip
+import os
+import re
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+
+import structlog
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+
+logger = structlog.get_logger()
+
+# inventory_items is range-partitioned by month on created_at (PostgreSQL only,
+# see migration d81f5a2c6e39); other dialects keep a plain table
+LEDGER_TABLE = "inventory_items"
+LEDGER_PARTITION_PATTERN = re.compile(r"^inventory_items_p(\d{4})(\d{2})$")
+
+# Serializes partition maintenance across workers
+_MAINTENANCE_LOCK_SQL = text("SELECT pg_advisory_xact_lock(hashtext('inventory_items_partitions'))")
+
+# Opening balances written when a partition is archived
+CARRY_FORWARD_REFERENCE = "archive_carry_forward"
+
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    month_index = value.year * 12 + value.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{LEDGER_TABLE}_p{month:%Y%m}"
+
+
+async def ledger_is_partitioned(conn: AsyncConnection) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    result = await conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"
+    ), {"table": LEDGER_TABLE})
+    return result.scalar() is not None
+
+
+async def list_ledger_partitions(conn: AsyncConnection) -> List[Tuple[str, date]]:
+    """Monthly partitions currently attached to the ledger, oldest first"""
+    result = await conn.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = to_regclass(:table)"
+    ), {"table": LEDGER_TABLE})
+    partitions = []
+    for (name,) in result:
+        match = LEDGER_PARTITION_PATTERN.match(name)
+        if match:
+            partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+async def ensure_ledger_partitions(conn: AsyncConnection, months_ahead: Optional[int] = None) -> List[str]:
+    """
+    Create the monthly ledger partitions from the current month up to
+    ``months_ahead`` months out. Indexes are inherited from the partitioned
+    parent. Returns the names of partitions created; a no-op unless the ledger
+    is partitioned.
+    """
+    if not await ledger_is_partitioned(conn):
+        return []
+    await conn.execute(_MAINTENANCE_LOCK_SQL)
+    if months_ahead is None:
+        months_ahead = settings.LEDGER_PARTITION_MONTHS_AHEAD
+    existing = {name for name, _ in await list_ledger_partitions(conn)}
+
+    created = []
+    current = month_start(datetime.now(timezone.utc).date())
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        # Fails if the default partition already holds rows for this month;
+        # that needs a manual move, so report it and carry on
+        try:
+            async with conn.begin_nested():
+                await conn.execute(text(
+                    f"CREATE TABLE {name} PARTITION OF {LEDGER_TABLE} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                ))
+        except DBAPIError as exc:
+            logger.error("Could not create ledger partition", partition=name, error=str(exc.orig))
+            continue
+        created.append(name)
+    if created:
+        logger.info("Created ledger partitions", partitions=created)
+    return created
+
+
+async def archive_ledger_partition(conn: AsyncConnection, name: str, month: date, out_dir: str) -> Tuple[str, int]:
+    """
+    Detach one monthly partition, export it to ``<out_dir>/<name>.csv.gz`` and
+    drop it, all in the caller's transaction, so a failed export leaves the
+    partition attached.
+
+    Stock balances and snapshots are sums over the ledger, so the partition's
+    net quantity per (product, warehouse, shelf) is first carried forward as an
+    ADJUSTMENT row at the start of the following month.
+    """
+    await conn.execute(_MAINTENANCE_LOCK_SQL)
+    next_month = add_months(month, 1)
+    await conn.execute(text(
+        f"INSERT INTO {LEDGER_TABLE} "
+        "(product_id, quantity, transaction_type, warehouse_location, shelf_location, "
+        "reference_number, reference_type, notes, created_at) "
+        "SELECT product_id, "
+        "sum(CASE transaction_type WHEN 'IN' THEN abs(quantity) WHEN 'OUT' THEN -abs(quantity) ELSE quantity END), "
+        "'ADJUSTMENT'::transactiontype, warehouse_location, shelf_location, :name, :reference_type, "
+        f"'Opening balance carried forward from archived partition ' || :name, :created_at "
+        f"FROM {name} "
+        "GROUP BY product_id, warehouse_location, shelf_location "
+        "HAVING sum(CASE transaction_type WHEN 'IN' THEN abs(quantity) WHEN 'OUT' THEN -abs(quantity) ELSE quantity END) <> 0"
+    ), {
+        "name": name,
+        "reference_type": CARRY_FORWARD_REFERENCE,
+        "created_at": datetime(next_month.year, next_month.month, 1, tzinfo=timezone.utc),
+    })
+    await conn.execute(text(f"ALTER TABLE {LEDGER_TABLE} DETACH PARTITION {name}"))
+
+    path = os.path.join(out_dir, f"{name}.csv.gz")
+    rows = 0
+    result = await conn.stream(text(f"SELECT * FROM {name} ORDER BY created_at, id"))
+    with gzip.open(path, "wt", newline="") as export_file:
+        writer = csv.writer(export_file)
+        writer.writerow(result.keys())
+        async for partition in result.partitions(5000):
+            writer.writerows(partition)
+            rows += len(partition)
+
+    await conn.execute(text(f"DROP TABLE {name}"))
+    logger.info("Archived ledger partition", partition=name, rows=rows, path=path)
+    return path, rows
@@ -0,0 +1,16 @@
+from typing import Iterable, List, Optional
+
+
+def schema_columns(model, schema, fields: Optional[Iterable[str]] = None) -> List:
+    """
+    Model columns backing the fields of a response schema, optionally limited to ``fields``.
+
+    Selecting these instead of the whole entity returns plain row tuples, which
+    skips ORM hydration and the identity map on list endpoints.
+    """
+    wanted = None if fields is None else set(fields)
+    return [
+        getattr(model, name)
+        for name in schema.model_fields
+        if wanted is None or name in wanted
+    ]
@@ -0,0 +1,102 @@
+from contextvars import ContextVar
+from typing import Tuple
+
+import structlog
+from sqlalchemy import event
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.db.database import async_engine
+
+logger = structlog.get_logger()
+
+# Counters active in the current request/task; every statement increments all of them
+_active_counters: ContextVar[Tuple["QueryCounter", ...]] = ContextVar("active_query_counters", default=())
+
+
+class QueryCounter:
+    """
+    Count SQL statements executed in the current context.
+
+        with QueryCounter() as counter:
+            await client.get("/api/v1/purchase-orders/1")
+        assert counter.count <= 3
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._token = None
+
+    def __enter__(self) -> "QueryCounter":
+        self._token = _active_counters.set(_active_counters.get() + (self,))
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _active_counters.reset(self._token)
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    for counter in _active_counters.get():
+        counter.count += 1
+
+
+def query_budget(max_queries: int):
+    """
+    Route dependency that sets the request's statement budget, checked by
+    QueryBudgetMiddleware before the response goes out.
+
+    The count includes the authenticated-user lookup on a cache miss.
+    """
+    def dependency(request: Request) -> None:
+        request.state.query_budget = max_queries
+
+    return dependency
+
+
+class QueryBudgetMiddleware:
+    """
+    Count the statements each HTTP request runs and check them against the
+    budget its route set (see query_budget) when the response starts.
+
+    Exceeding the budget is logged; with QUERY_BUDGET_STRICT (tests/CI, to
+    catch N+1 regressions) the response is replaced by a 500. Statements run
+    while a streaming body is sent, or in background tasks, aren't checked.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Shared with request.state further down, so the route's budget is visible here
+        state = scope.setdefault("state", {})
+        rejected = False
+
+        async def send_checked(message: Message) -> None:
+            nonlocal rejected
+            if rejected:
+                return
+            if message["type"] == "http.response.start":
+                budget = state.get("query_budget")
+                if budget is not None and counter.count > budget:
+                    logger.warning(
+                        "Query budget exceeded", path=scope["path"], queries=counter.count, budget=budget
+                    )
+                    if settings.QUERY_BUDGET_STRICT:
+                        rejected = True
+                        response = JSONResponse(
+                            status_code=500,
+                            content={"detail": f"Query budget exceeded: {counter.count} queries run, budget is {budget}"},
+                        )
+                        await response(scope, receive, send)
+                        return
+            await send(message)
+
+        with QueryCounter() as counter:
+            await self.app(scope, receive, send_checked)
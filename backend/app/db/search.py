@@ -0,0 +1,59 @@
+from sqlalchemy import Float, case, cast, func, literal_column, or_
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from app.models.product import Product
+
+# Generated column maintained by PostgreSQL (see PRODUCT_SEARCH_DDL)
+search_vector = literal_column("products.search_vector", type_=TSVECTOR)
+
+# Score added to rows whose SKU equals the search term
+EXACT_SKU_BOOST = 10.0
+
+
+def _ts_query(term: str):
+    return func.websearch_to_tsquery(literal_column("'english'::regconfig"), term)
+
+
+def product_search_filter(term: str, dialect_name: str):
+    """
+    WHERE clause matching products by name, SKU or description.
+
+    On PostgreSQL the full-text match is served by the GIN index on
+    search_vector and the substring matches by the pg_trgm indexes; other
+    backends fall back to plain ILIKE.
+    """
+    pattern = f"%{term}%"
+    if dialect_name == "postgresql":
+        return or_(
+            search_vector.op("@@")(_ts_query(term)),
+            Product.name.ilike(pattern),
+            Product.sku.ilike(pattern),
+        )
+    return or_(
+        Product.name.ilike(pattern),
+        Product.sku.ilike(pattern),
+        Product.description.ilike(pattern),
+    )
+
+
+def product_search_rank(term: str, dialect_name: str):
+    """
+    Relevance score for ordering search results, higher is better.
+
+    Exact SKU hits are boosted above any text match.
+    """
+    exact_sku = case((func.lower(Product.sku) == term.lower(), EXACT_SKU_BOOST), else_=0.0)
+    if dialect_name == "postgresql":
+        rank = (
+            exact_sku
+            + func.ts_rank_cd(search_vector, _ts_query(term))
+            + func.similarity(Product.name, term)
+        )
+    else:
+        pattern = f"%{term}%"
+        rank = (
+            exact_sku
+            + case((Product.sku.ilike(pattern), 2.0), else_=0.0)
+            + case((Product.name.ilike(pattern), 1.0), else_=0.0)
+        )
+    return cast(rank, Float)
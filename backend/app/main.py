@@ -1,10 +1,19 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 import structlog
 
 from app.core.config import settings
-from app.api.v1 import auth_router, users_router, suppliers_router, products_router, purchase_orders_router
+from app.core.periodic import start_periodic, stop_periodic
+from app.core.security import PasswordHashingBusy, password_executor
+from app.api.v1 import auth_router, users_router, suppliers_router, products_router, purchase_orders_router, inventory_router, orders_router, dashboard_router, forecasts_router
+from app.db.database import async_engine
+from app.db.partitions import ensure_ledger_partitions
+from app.db.query_counter import QueryBudgetMiddleware
+from app.services.dashboard import refresh_dashboard_counts
+from app.services.forecasting import run_scheduled_forecast
+from app.services.snapshots import take_stock_snapshot
 
 # Configure structured logging
 structlog.configure(
@@ -52,12 +61,29 @@ if not settings.DEBUG:
         allowed_hosts=["*"]  # Configure this properly for production
     )
 
+# Check per-route query budgets (app.db.query_counter.query_budget)
+app.add_middleware(QueryBudgetMiddleware)
+
 # Include API routers
 app.include_router(auth_router, prefix="/api/v1/auth", tags=["authentication"])
 app.include_router(users_router, prefix="/api/v1/users", tags=["users"])
 app.include_router(suppliers_router, prefix="/api/v1/suppliers", tags=["suppliers"])
 app.include_router(products_router, prefix="/api/v1/products", tags=["products"])
 app.include_router(purchase_orders_router, prefix="/api/v1/purchase-orders", tags=["purchase-orders"])
+app.include_router(inventory_router, prefix="/api/v1/inventory", tags=["inventory"])
+app.include_router(orders_router, prefix="/api/v1/orders", tags=["orders"])
+app.include_router(dashboard_router, prefix="/api/v1/dashboard", tags=["dashboard"])
+app.include_router(forecasts_router, prefix="/api/v1/forecasts", tags=["forecasts"])
+
+
+@app.exception_handler(PasswordHashingBusy)
+async def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    """Shed auth load when the password hashing queue is full"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication service is busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
 
 
 @app.get("/")
@@ -76,13 +102,36 @@ async def health_check():
     return {"status": "healthy"}
 
 
+async def maintain_ledger_partitions():
+    async with async_engine.begin() as conn:
+        await ensure_ledger_partitions(conn)
+
+
+async def write_stock_snapshot():
+    async with async_engine.begin() as conn:
+        await take_stock_snapshot(conn)
+
+
+async def refresh_dashboard():
+    async with async_engine.connect() as conn:
+        await refresh_dashboard_counts(conn)
+
+
 @app.on_event("startup")
 async def startup_event():
     """Application startup event"""
     logger.info("Starting Smart Supply Chain API", version=settings.APP_VERSION)
+    start_periodic("ledger-partitions", settings.LEDGER_PARTITION_CHECK_INTERVAL_SECONDS, maintain_ledger_partitions)
+    # Checked more often than the interval; take_stock_snapshot skips while the last one is recent
+    start_periodic("stock-snapshots", settings.STOCK_SNAPSHOT_INTERVAL_SECONDS / 4, write_stock_snapshot)
+    start_periodic("dashboard-counters", settings.DASHBOARD_REFRESH_SECONDS, refresh_dashboard)
+    # Runs at most once per day; run_scheduled_forecast skips once the day's run exists
+    start_periodic("demand-forecasts", settings.FORECAST_CHECK_INTERVAL_SECONDS, run_scheduled_forecast)
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown event"""
-    logger.info("Shutting down Smart Supply Chain API") 
\ No newline at end of file
+    logger.info("Shutting down Smart Supply Chain API")
+    await stop_periodic()
+    password_executor.shutdown(wait=False) 
\ No newline at end of file
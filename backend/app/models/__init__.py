@@ -1,15 +1,21 @@
 from .user import User
 from .supplier import Supplier
-from .product import Product
-from .inventory import InventoryItem, TransactionType
+from .product import Product, StockStatus
+from .inventory import InventoryItem, StockBalance, StockSnapshot, StockSnapshotLine, TransactionType
 from .order import Order, OrderItem, OrderStatus, PaymentStatus
 from .purchase_order import PurchaseOrder, PurchaseOrderItem, PurchaseOrderStatus
+from .valuation import InventoryValuation, InventoryValuationLine, ValuationStatus
+from .forecast import DemandForecast, ForecastRun, ForecastRunStatus
 
 __all__ = [
     "User",
     "Supplier", 
     "Product",
+    "StockStatus",
     "InventoryItem",
+    "StockBalance",
+    "StockSnapshot",
+    "StockSnapshotLine",
     "TransactionType",
     "Order",
     "OrderItem", 
@@ -18,4 +24,10 @@ __all__ = [
     "PurchaseOrder",
     "PurchaseOrderItem",
     "PurchaseOrderStatus",
+    "InventoryValuation",
+    "InventoryValuationLine",
+    "ValuationStatus",
+    "DemandForecast",
+    "ForecastRun",
+    "ForecastRunStatus",
 ] 
\ No newline at end of file
@@ -0,0 +1,67 @@
+from sqlalchemy import Column, Integer, BigInteger, DateTime, Text, Float, String, Boolean, ForeignKey, Enum
+from sqlalchemy.sql import func
+import enum
+from app.db.database import Base
+
+
+class ForecastRunStatus(enum.Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ForecastRun(Base):
+    """
+    One batch fit of demand forecasts on daily history before ``data_through``.
+
+    Incremental runs refit only products with demand recorded since the
+    previous completed run's ``data_through``; full runs refit every product.
+    """
+    __tablename__ = "forecast_runs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    data_through = Column(DateTime(timezone=True), nullable=False, index=True)
+    full_refit = Column(Boolean, default=False, nullable=False)
+    apply_reorder_points = Column(Boolean, default=False, nullable=False)
+    status = Column(Enum(ForecastRunStatus), default=ForecastRunStatus.RUNNING, nullable=False)
+    
+    # Totals
+    series_rows = Column(BigInteger, default=0)
+    product_count = Column(Integer, default=0)
+    shard_count = Column(Integer, default=0)
+    
+    error = Column(Text)
+    
+    # User who started the run (None for the scheduled job)
+    created_by = Column(Integer, ForeignKey("users.id"))
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True))
+
+
+class DemandForecast(Base):
+    """Latest demand forecast per product, overwritten by each run that refits it"""
+    __tablename__ = "demand_forecasts"
+    
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    run_id = Column(Integer, ForeignKey("forecast_runs.id", ondelete="SET NULL"), index=True)
+    
+    # "ses" (simple exponential smoothing) or "croston" (intermittent demand)
+    method = Column(String(20), nullable=False)
+    smoothing = Column(Float, nullable=False)
+    
+    # Units per day, flat over the horizon; residual spread for safety stock
+    daily_demand = Column(Float, nullable=False)
+    daily_std = Column(Float, nullable=False)
+    
+    # History the fit saw
+    history_days = Column(Integer, nullable=False)
+    demand_days = Column(Integer, nullable=False)
+    total_demand = Column(Float, nullable=False)
+    
+    # Lead-time demand plus safety stock (see FORECAST_LEAD_TIME_DAYS)
+    suggested_reorder_point = Column(Integer, nullable=False)
+    
+    data_through = Column(DateTime(timezone=True), nullable=False)
+    fitted_at = Column(DateTime(timezone=True), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -13,7 +13,14 @@ class TransactionType(enum.Enum):
 
 
 class InventoryItem(Base):
+    # On PostgreSQL the table is range-partitioned by month on created_at with
+    # PRIMARY KEY (id, created_at) (migration d81f5a2c6e39, app.db.partitions);
+    # the ORM only needs id for identity
     __tablename__ = "inventory_items"
+    __table_args__ = (
+        Index("ix_inventory_items_product_id_created_at", "product_id", "created_at"),
+        Index("ix_inventory_items_created_at", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
@@ -44,8 +51,58 @@ class InventoryItem(Base):
     created_by = Column(Integer, ForeignKey("users.id"))
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships
     product = relationship("Product", back_populates="inventory_items")
-    created_by_user = relationship("User", back_populates="inventory_items") 
\ No newline at end of file
+    created_by_user = relationship("User", back_populates="inventory_items")
+
+
+class StockBalance(Base):
+    """
+    On-hand quantity per product and location, maintained from the ledger.
+
+    Updated in the same transaction as every InventoryItem insert
+    (see app.services.stock.post_ledger_entries). An empty warehouse/shelf
+    means the ledger row had no location, so the key never contains NULLs.
+    """
+    __tablename__ = "stock_balances"
+    __table_args__ = (
+        Index("ix_stock_balances_location", "warehouse", "shelf", "product_id"),
+    )
+    
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    warehouse = Column(String(100), primary_key=True, default="")
+    shelf = Column(String(100), primary_key=True, default="")
+    quantity = Column(Integer, nullable=False, default=0)
+    
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class StockSnapshot(Base):
+    """
+    Stock per product and location as of ``taken_at``, built from the previous
+    snapshot plus the ledger rows in between (see app.services.snapshots).
+    """
+    __tablename__ = "stock_snapshots"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    taken_at = Column(DateTime(timezone=True), nullable=False, unique=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    lines = relationship("StockSnapshotLine", back_populates="snapshot", cascade="all, delete-orphan")
+
+
+class StockSnapshotLine(Base):
+    __tablename__ = "stock_snapshot_lines"
+    
+    snapshot_id = Column(Integer, ForeignKey("stock_snapshots.id", ondelete="CASCADE"), primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    warehouse = Column(String(100), primary_key=True, default="")
+    shelf = Column(String(100), primary_key=True, default="")
+    quantity = Column(Integer, nullable=False)
+    
+    # Relationships
+    snapshot = relationship("StockSnapshot", back_populates="lines")
@@ -1,11 +1,55 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, Index, DDL, Computed, event, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+import enum
 from app.db.database import Base
 
 
+class StockStatus(str, enum.Enum):
+    OUT_OF_STOCK = "out_of_stock"
+    LOW_STOCK = "low_stock"
+    NORMAL = "normal"
+    HIGH = "high"
+
+
+# Bucket boundaries match the stock_level/status filters: low <= reorder point < normal <= 2x reorder point < high
+STOCK_STATUS_EXPRESSION = (
+    "CASE"
+    " WHEN coalesce(current_stock, 0) <= 0 THEN 'out_of_stock'"
+    " WHEN coalesce(current_stock, 0) <= coalesce(reorder_point, 0) THEN 'low_stock'"
+    " WHEN coalesce(current_stock, 0) <= coalesce(reorder_point, 0) * 2 THEN 'normal'"
+    " ELSE 'high'"
+    " END"
+)
+
+
+def stock_bucket(current_stock, reorder_point) -> StockStatus:
+    """Python twin of STOCK_STATUS_EXPRESSION, for bucket changes known before the row is re-read"""
+    stock = current_stock or 0
+    reorder_point = reorder_point or 0
+    if stock <= 0:
+        return StockStatus.OUT_OF_STOCK
+    if stock <= reorder_point:
+        return StockStatus.LOW_STOCK
+    if stock <= reorder_point * 2:
+        return StockStatus.NORMAL
+    return StockStatus.HIGH
+
+
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # Keyset pagination seeks on (sort key, id)
+        Index("ix_products_name_id", "name", "id"),
+        Index("ix_products_created_at_id", "created_at", "id"),
+        # Stock filters and alert lists read the precomputed bucket instead of comparing columns
+        Index("ix_products_stock_status_id", "stock_status", "id"),
+        Index(
+            "ix_products_active_stock_status",
+            "stock_status",
+            postgresql_where=text("is_active"),
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False, index=True)
@@ -24,6 +68,7 @@ class Product(Base):
     min_stock_level = Column(Integer, default=0)
     max_stock_level = Column(Integer)
     reorder_point = Column(Integer, default=0)
+    stock_status = Column(String(20), Computed(STOCK_STATUS_EXPRESSION, persisted=True))
     
     # Units
     unit_of_measure = Column(String(20), default="pcs")
@@ -44,4 +89,25 @@ class Product(Base):
     # Relationships
     supplier = relationship("Supplier", back_populates="products")
     inventory_items = relationship("InventoryItem", back_populates="product")
-    order_items = relationship("OrderItem", back_populates="product") 
\ No newline at end of file
+    order_items = relationship("OrderItem", back_populates="product") 
+
+
+# PostgreSQL full-text search: a generated, weighted tsvector plus GIN indexes.
+# Kept out of the mapped columns so other backends (SQLite) can still create the table.
+PRODUCT_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(sku, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(name, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_products_search_vector ON products USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS ix_products_name_trgm ON products USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_products_sku_trgm ON products USING gin (sku gin_trgm_ops)",
+]
+
+for statement in PRODUCT_SEARCH_DDL:
+    event.listen(Product.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, ForeignKey, Enum, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -17,6 +17,19 @@ class PurchaseOrderStatus(enum.Enum):
 
 class PurchaseOrder(Base):
     __tablename__ = "purchase_orders"
+    __table_args__ = (
+        # The list is keyset-paged on (created_at, id), optionally narrowed by supplier and/or status
+        Index("ix_purchase_orders_created_at_id", "created_at", "id"),
+        Index("ix_purchase_orders_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_purchase_orders_supplier_status_created_at_id", "supplier_id", "status", "created_at", "id"),
+        Index("ix_purchase_orders_order_date_id", "order_date", "id"),
+        # Overdue filter only ever looks at open orders (enum labels are stored by name)
+        Index(
+            "ix_purchase_orders_open_expected_delivery",
+            "expected_delivery",
+            postgresql_where=text("status NOT IN ('RECEIVED', 'CANCELLED')"),
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     po_number = Column(String(100), unique=True, index=True, nullable=False)
@@ -24,8 +37,8 @@ class PurchaseOrder(Base):
     
     # Order details
     status = Column(Enum(PurchaseOrderStatus), default=PurchaseOrderStatus.DRAFT)
-    order_date = Column(DateTime, nullable=False)
-    expected_delivery = Column(DateTime)
+    order_date = Column(DateTime(timezone=True), nullable=False)
+    expected_delivery = Column(DateTime(timezone=True))
     
     # Financial
     subtotal = Column(Float, default=0.0)
@@ -0,0 +1,53 @@
+from sqlalchemy import Column, Integer, BigInteger, DateTime, Text, Float, ForeignKey, Enum
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+import enum
+from app.db.database import Base
+
+
+class ValuationStatus(enum.Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class InventoryValuation(Base):
+    """One valuation run over the ledger up to ``as_of`` (FIFO and moving average)"""
+    __tablename__ = "inventory_valuations"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    as_of = Column(DateTime(timezone=True), nullable=False, index=True)
+    status = Column(Enum(ValuationStatus), default=ValuationStatus.RUNNING, nullable=False)
+    
+    # Totals
+    ledger_rows = Column(BigInteger, default=0)
+    product_count = Column(Integer, default=0)
+    total_quantity = Column(BigInteger, default=0)
+    fifo_value = Column(Float, default=0.0)
+    average_value = Column(Float, default=0.0)
+    
+    error = Column(Text)
+    
+    # User who started the run
+    created_by = Column(Integer, ForeignKey("users.id"))
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True))
+    
+    # Relationships
+    lines = relationship("InventoryValuationLine", back_populates="valuation", cascade="all, delete-orphan")
+
+
+class InventoryValuationLine(Base):
+    __tablename__ = "inventory_valuation_lines"
+    
+    valuation_id = Column(Integer, ForeignKey("inventory_valuations.id", ondelete="CASCADE"), primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    quantity = Column(Integer, nullable=False)
+    fifo_value = Column(Float, nullable=False)
+    average_unit_cost = Column(Float, nullable=False)
+    average_value = Column(Float, nullable=False)
+    
+    # Relationships
+    valuation = relationship("InventoryValuation", back_populates="lines")
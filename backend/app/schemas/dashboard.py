@@ -0,0 +1,53 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from datetime import datetime
+
+
+class DashboardOverview(BaseModel):
+    total_inventory_value: float
+    low_stock_items: int
+    pending_orders: int
+    active_suppliers: int
+    monthly_revenue: float
+    inventory_turnover: float
+    order_fulfillment_rate: float
+    average_order_value: float
+    open_purchase_orders: int
+    open_purchase_order_value: float
+    # When the counters were last recomputed from the tables
+    computed_at: Optional[datetime] = None
+
+
+class StockLevelCount(BaseModel):
+    category: str
+    in_stock: int
+    low_stock: int
+    out_of_stock: int
+
+
+class CategoryShare(BaseModel):
+    name: str
+    value: int
+    percentage: float
+
+
+class WarehouseUtilization(BaseModel):
+    name: str
+    utilized: int
+    capacity: int
+    utilization_rate: float
+
+
+class StockMovementDay(BaseModel):
+    date: str
+    inbound: int
+    outbound: int
+    net: int
+
+
+class InventoryAnalytics(BaseModel):
+    stock_levels: List[StockLevelCount]
+    category_distribution: List[CategoryShare]
+    warehouse_utilization: List[WarehouseUtilization]
+    stock_movement: List[StockMovementDay]
+    computed_at: Optional[datetime] = None
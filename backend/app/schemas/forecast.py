@@ -0,0 +1,58 @@
+from typing import Optional
+from pydantic import BaseModel
+from datetime import datetime
+from enum import Enum
+
+
+class ForecastRunStatus(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ForecastMethod(str, Enum):
+    SES = "ses"
+    CROSTON = "croston"
+
+
+class ForecastRun(BaseModel):
+    id: int
+    data_through: datetime
+    full_refit: bool
+    apply_reorder_points: bool
+    status: ForecastRunStatus
+    series_rows: int = 0
+    product_count: int = 0
+    shard_count: int = 0
+    error: Optional[str] = None
+    created_by: Optional[int] = None
+    created_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class DemandForecast(BaseModel):
+    product_id: int
+    run_id: Optional[int] = None
+    method: ForecastMethod
+    smoothing: float
+    daily_demand: float
+    daily_std: float
+    history_days: int
+    demand_days: int
+    total_demand: float
+    suggested_reorder_point: int
+    data_through: datetime
+    fitted_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class DemandForecastDetail(DemandForecast):
+    # Flat forecast summed over the requested horizon
+    horizon_days: int
+    horizon_demand: float
+    current_reorder_point: Optional[int] = None
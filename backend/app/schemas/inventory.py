@@ -0,0 +1,79 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+from datetime import date, datetime
+
+
+class StockBalance(BaseModel):
+    product_id: int
+    # Empty string when the ledger rows carried no location
+    warehouse: str
+    shelf: str
+    quantity: int
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ProductStockBalances(BaseModel):
+    product_id: int
+    # Product.current_stock, for comparison with the per-location total
+    current_stock: int
+    total: int
+    locations: List[StockBalance]
+
+
+class LocationQuantity(BaseModel):
+    product_id: int
+    warehouse: str
+    shelf: str
+    quantity: int
+
+
+class StockAsOf(BaseModel):
+    as_of: datetime
+    # Snapshot the answer was rolled forward from (None: replayed from the start of the ledger)
+    snapshot_id: Optional[int] = None
+    snapshot_taken_at: Optional[datetime] = None
+    balances: List[LocationQuantity]
+
+
+class TurnoverAgingProduct(BaseModel):
+    product_id: int
+    sku: str
+    name: str
+    category: Optional[str] = None
+    opening_quantity: int
+    closing_quantity: int
+    issued_quantity: int
+    average_quantity: float
+    closing_value: float
+    # Issued units over time-weighted average stock; None without stock
+    turnover: Optional[float] = None
+    # Closing stock over the period's daily issue rate; None without issues
+    days_on_hand: Optional[float] = None
+    average_age_days: float
+    aging: Dict[str, int]
+
+
+class TurnoverAgingCategory(BaseModel):
+    category: Optional[str] = None
+    product_count: int
+    issued_value: float
+    average_value: float
+    closing_value: float
+    turnover: Optional[float] = None
+    days_on_hand: Optional[float] = None
+    average_age_days: float
+    aging: Dict[str, int]
+
+
+class TurnoverAgingReport(BaseModel):
+    start_date: date
+    end_date: date
+    computed_at: datetime
+    ledger_rows: int
+    aging_buckets: List[str]
+    categories: List[TurnoverAgingCategory]
+    products: List[TurnoverAgingProduct]
+    product_total: int
@@ -0,0 +1,189 @@
+from typing import List, Optional
+from pydantic import BaseModel, EmailStr, validator
+from datetime import datetime
+from enum import Enum
+
+
+class OrderStatus(str, Enum):
+    PENDING = "pending"
+    CONFIRMED = "confirmed"
+    PROCESSING = "processing"
+    SHIPPED = "shipped"
+    DELIVERED = "delivered"
+    CANCELLED = "cancelled"
+
+
+class PaymentStatus(str, Enum):
+    PENDING = "pending"
+    PAID = "paid"
+    PARTIAL = "partial"
+    REFUNDED = "refunded"
+
+
+class OrderItemBase(BaseModel):
+    product_id: int
+    quantity: int
+    unit_price: float
+
+
+class OrderItemCreate(OrderItemBase):
+    # Defaults to the product's selling price; only superusers may override it
+    unit_price: Optional[float] = None
+
+    @validator("quantity")
+    def validate_quantity(cls, v):
+        if v <= 0:
+            raise ValueError("Quantity must be positive")
+        return v
+
+    @validator("unit_price")
+    def validate_unit_price(cls, v):
+        if v is not None and v < 0:
+            raise ValueError("Price cannot be negative")
+        return v
+
+
+class OrderItem(OrderItemBase):
+    id: int
+    order_id: int
+    total_price: float
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class OrderBase(BaseModel):
+    customer_name: str
+    customer_email: Optional[EmailStr] = None
+    customer_phone: Optional[str] = None
+    customer_address: Optional[str] = None
+    tax_amount: float = 0.0
+    shipping_amount: float = 0.0
+    discount_amount: float = 0.0
+    shipping_method: Optional[str] = None
+    estimated_delivery: Optional[datetime] = None
+    notes: Optional[str] = None
+
+
+class OrderCreate(OrderBase):
+    # Generated when omitted
+    order_number: Optional[str] = None
+    items: List[OrderItemCreate]
+
+    @validator("tax_amount", "shipping_amount", "discount_amount")
+    def validate_amounts(cls, v):
+        if v < 0:
+            raise ValueError("Amount cannot be negative")
+        return v
+
+
+class OrderSummary(BaseModel):
+    id: int
+    order_number: str
+    customer_name: str
+    status: OrderStatus
+    payment_status: PaymentStatus
+    total_amount: float
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class Order(OrderBase):
+    id: int
+    order_number: str
+    status: OrderStatus
+    payment_status: PaymentStatus
+    subtotal: float
+    total_amount: float
+    tracking_number: Optional[str] = None
+    actual_delivery: Optional[datetime] = None
+    user_id: Optional[int] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    items: List[OrderItem] = []
+
+    class Config:
+        from_attributes = True
+
+
+class OrderListResponse(BaseModel):
+    items: List[OrderSummary]
+    limit: int
+    next_cursor: Optional[str] = None
+    has_next: bool
+
+
+class PickingWaveCreate(BaseModel):
+    # Explicit orders to pick; otherwise the oldest confirmed orders
+    order_ids: Optional[List[int]] = None
+    max_orders: int = 1000
+    # Zone (first shelf-code segment) visiting order; unlisted zones follow in natural order
+    zone_order: Optional[List[str]] = None
+    serpentine: Optional[bool] = None
+    max_stops_per_list: Optional[int] = None
+    # Post the picks to the ledger and move the orders to processing
+    release: bool = False
+
+    @validator("max_orders")
+    def validate_max_orders(cls, v):
+        if v <= 0:
+            raise ValueError("max_orders must be positive")
+        return v
+
+    @validator("max_stops_per_list")
+    def validate_max_stops(cls, v):
+        if v is not None and v <= 0:
+            raise ValueError("max_stops_per_list must be positive")
+        return v
+
+
+class PickOrderQuantity(BaseModel):
+    order_id: int
+    order_number: str
+    quantity: int
+
+
+class PickStop(BaseModel):
+    sequence: int
+    warehouse: str
+    shelf: str
+    product_id: int
+    sku: str
+    name: str
+    quantity: int
+    orders: List[PickOrderQuantity] = []
+
+
+class PickList(BaseModel):
+    warehouse: str
+    page: int
+    stops: List[PickStop]
+
+
+class UnallocatedPick(BaseModel):
+    product_id: int
+    sku: str
+    quantity: int
+
+
+class HeldOrder(BaseModel):
+    order_id: int
+    order_number: str
+    missing: List[UnallocatedPick]
+
+
+class PickingWave(BaseModel):
+    wave_number: str
+    generated_at: datetime
+    released: bool
+    order_count: int
+    line_count: int
+    stop_count: int
+    lists: List[PickList]
+    # Quantity per product the held orders are missing
+    unallocated: List[UnallocatedPick] = []
+    # Orders left confirmed because located stock doesn't cover all their lines
+    held_orders: List[HeldOrder] = []
@@ -1,6 +1,7 @@
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, validator
 from datetime import datetime
+from enum import Enum
 
 
 class ProductBase(BaseModel):
@@ -46,6 +47,7 @@ class ProductUpdate(BaseModel):
     cost_price: Optional[float] = None
     selling_price: Optional[float] = None
     wholesale_price: Optional[float] = None
+    # Stock only changes through POST /products/{id}/adjust, which is atomic and ledgered
     current_stock: Optional[int] = None
     min_stock_level: Optional[int] = None
     max_stock_level: Optional[int] = None
@@ -57,10 +59,15 @@ class ProductUpdate(BaseModel):
     is_active: Optional[bool] = None
     supplier_id: Optional[int] = None
 
+    @validator("current_stock")
+    def reject_current_stock(cls, v):
+        raise ValueError("current_stock can't be updated here; use POST /products/{id}/adjust")
+
 
 class ProductInDB(ProductBase):
     id: int
     is_active: bool
+    stock_status: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
     
@@ -86,4 +93,81 @@ class ProductSummary(BaseModel):
 
 
 class ProductWithSupplier(Product):
-    supplier_name: Optional[str] = None 
\ No newline at end of file
+    supplier_name: Optional[str] = None 
+
+
+class ProductBulkRequest(BaseModel):
+    # Rows are validated one by one so a bad row doesn't reject the batch
+    items: List[Dict[str, Any]]
+
+
+class ProductBulkRowError(BaseModel):
+    index: int
+    sku: Optional[str] = None
+    detail: str
+
+
+class ProductBulkResult(BaseModel):
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    errors: List[ProductBulkRowError] = []
+
+
+class ImportJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ProductImportJob(BaseModel):
+    id: str
+    filename: Optional[str] = None
+    status: ImportJobStatus = ImportJobStatus.PENDING
+    rows_processed: int = 0
+    imported: int = 0
+    created: int = 0
+    updated: int = 0
+    skipped: int = 0
+    error_count: int = 0
+    # Only the first PRODUCT_IMPORT_MAX_ERRORS messages are kept
+    errors: List[str] = []
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class StockStatusSummary(BaseModel):
+    out_of_stock: int = 0
+    low_stock: int = 0
+    normal: int = 0
+    high: int = 0
+    total: int = 0
+
+
+class StockAdjustment(BaseModel):
+    # Signed change to current_stock; rejected if stock would go below zero
+    delta: int
+    reason: Optional[str] = None
+    warehouse_location: Optional[str] = None
+    shelf_location: Optional[str] = None
+    reference_number: Optional[str] = None
+
+    @validator("delta")
+    def validate_delta(cls, v):
+        if v == 0:
+            raise ValueError("Delta must not be zero")
+        return v
+
+
+class StockAdjustmentLine(StockAdjustment):
+    product_id: int
+
+
+class StockAdjustmentBatch(BaseModel):
+    adjustments: List[StockAdjustmentLine]
+
+
+class StockAdjustmentResult(BaseModel):
+    product_id: int
+    current_stock: int
@@ -1,5 +1,5 @@
-from typing import Optional, List
-from pydantic import BaseModel
+from typing import Dict, Optional, List
+from pydantic import BaseModel, validator
 from datetime import datetime
 from enum import Enum
 
@@ -23,7 +23,8 @@ class PurchaseOrderItemBase(BaseModel):
 
 
 class PurchaseOrderItemCreate(PurchaseOrderItemBase):
-    pass
+    # Computed server-side as quantity * unit_cost
+    total_cost: Optional[float] = None
 
 
 class PurchaseOrderItemUpdate(BaseModel):
@@ -114,4 +115,65 @@ class PurchaseOrderSummary(BaseModel):
     created_at: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+
+class PurchaseOrderListResponse(BaseModel):
+    items: List[PurchaseOrderSummary]
+    # Matching orders per status, ignoring the status filter itself
+    status_counts: Dict[PurchaseOrderStatus, int]
+    total: int
+    limit: int
+    next_cursor: Optional[str] = None
+    has_next: bool
+
+
+class PurchaseOrderReceiptLine(BaseModel):
+    item_id: int
+    quantity: int
+    batch_number: Optional[str] = None
+    expiry_date: Optional[datetime] = None
+    warehouse_location: Optional[str] = None
+    shelf_location: Optional[str] = None
+    condition: str = "good"
+
+    @validator("quantity")
+    def validate_quantity(cls, v):
+        if v <= 0:
+            raise ValueError("Received quantity must be positive")
+        return v
+
+
+class PurchaseOrderReceiptCreate(BaseModel):
+    lines: List[PurchaseOrderReceiptLine]
+    notes: Optional[str] = None
+    allow_over_receipt: bool = False
+
+
+class PurchaseOrderReceipt(BaseModel):
+    purchase_order: PurchaseOrder
+    # New Product.current_stock per received product id
+    stock_levels: Dict[int, int]
+
+
+class ReplenishmentLine(BaseModel):
+    product_id: int
+    quantity: int
+    unit_cost: float
+    total_cost: float
+
+
+class ReplenishmentSupplierProposal(BaseModel):
+    supplier_id: int
+    purchase_order_id: Optional[int] = None
+    po_number: Optional[str] = None
+    line_count: int
+    subtotal: float
+    items: List[ReplenishmentLine] = []
+
+
+class ReplenishmentResult(BaseModel):
+    dry_run: bool
+    products_scanned: int
+    products_to_order: int
+    purchase_orders: List[ReplenishmentSupplierProposal]
@@ -0,0 +1,39 @@
+from typing import Optional
+from pydantic import BaseModel
+from datetime import datetime
+from enum import Enum
+
+
+class ValuationStatus(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class InventoryValuation(BaseModel):
+    id: int
+    as_of: datetime
+    status: ValuationStatus
+    ledger_rows: int = 0
+    product_count: int = 0
+    total_quantity: int = 0
+    fifo_value: float = 0.0
+    average_value: float = 0.0
+    error: Optional[str] = None
+    created_by: Optional[int] = None
+    created_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class InventoryValuationLine(BaseModel):
+    product_id: int
+    quantity: int
+    fifo_value: float
+    average_unit_cost: float
+    average_value: float
+
+    class Config:
+        from_attributes = True
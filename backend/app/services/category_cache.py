@@ -0,0 +1,70 @@
+import asyncio
+import hashlib
+import json
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.product import Product
+
+
+class CategoryCache:
+    """
+    In-process category -> product count map.
+
+    Loaded with one GROUP BY and then kept current by applying the category
+    change of each product write. A periodic reload bounds drift from writes
+    made by other workers or bulk paths that only invalidate.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.counts: Dict[str, int] = {}
+        self.etag: Optional[str] = None
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def _refresh_etag(self) -> None:
+        # Content hash, so every worker holding the same counts serves the same ETag
+        payload = json.dumps(sorted(self.counts.items()), separators=(",", ":"))
+        self.etag = f'W/"{hashlib.sha1(payload.encode()).hexdigest()[:16]}"'
+
+    def _is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    async def get(self, db: AsyncSession) -> Dict[str, int]:
+        if not self._is_fresh():
+            async with self._lock:
+                if not self._is_fresh():
+                    result = await db.execute(
+                        select(Product.category, func.count(Product.id))
+                        .where(Product.category.isnot(None), Product.category != "")
+                        .group_by(Product.category)
+                    )
+                    self.counts = {category: count for category, count in result.all()}
+                    self._refresh_etag()
+                    self._loaded_at = time.monotonic()
+        return self.counts
+
+    def apply(self, old_category: Optional[str], new_category: Optional[str]) -> None:
+        """Move one product from ``old_category`` to ``new_category`` (either may be None)"""
+        if self._loaded_at is None or old_category == new_category:
+            return
+        if old_category:
+            remaining = self.counts.get(old_category, 0) - 1
+            if remaining > 0:
+                self.counts[old_category] = remaining
+            else:
+                self.counts.pop(old_category, None)
+        if new_category:
+            self.counts[new_category] = self.counts.get(new_category, 0) + 1
+        self._refresh_etag()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+
+product_categories = CategoryCache(ttl=settings.CATEGORY_CACHE_TTL_SECONDS)
@@ -0,0 +1,221 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import case, func, select
+
+from app.core.config import settings
+from app.models.inventory import InventoryItem, StockBalance
+from app.models.order import Order, OrderStatus
+from app.models.product import Product, StockStatus
+from app.models.purchase_order import PurchaseOrder, PurchaseOrderStatus
+from app.models.supplier import Supplier
+from app.schemas.dashboard import (
+    CategoryShare,
+    DashboardOverview,
+    InventoryAnalytics,
+    StockLevelCount,
+    StockMovementDay,
+    WarehouseUtilization,
+)
+from app.services.dashboard_counts import Counts, dashboard_counts, month_key
+from app.services.stock import LEDGER_DELTA_EXPRESSION
+
+PENDING_ORDER_STATUSES = (OrderStatus.PENDING.value, OrderStatus.CONFIRMED.value)
+FULFILLED_ORDER_STATUSES = (OrderStatus.PROCESSING.value, OrderStatus.SHIPPED.value, OrderStatus.DELIVERED.value)
+OPEN_PURCHASE_ORDER_STATUSES = (
+    PurchaseOrderStatus.SUBMITTED.value,
+    PurchaseOrderStatus.APPROVED.value,
+    PurchaseOrderStatus.ORDERED.value,
+    PurchaseOrderStatus.PARTIALLY_RECEIVED.value,
+)
+
+
+async def compute_dashboard_counts(conn) -> Counts:
+    """
+    Every dashboard counter recomputed from the tables: one aggregate query
+    each over products, suppliers, orders, purchase orders and stock balances,
+    and a date-bounded scan of the ledger (ix_inventory_items_created_at).
+    """
+    counts = defaultdict(float)
+
+    result = await conn.execute(
+        select(
+            Product.category,
+            Product.stock_status,
+            func.count(Product.id),
+            func.sum(func.coalesce(Product.current_stock, 0) * Product.cost_price),
+            func.sum(func.coalesce(Product.current_stock, 0)),
+        )
+        .where(Product.is_active.is_(True))
+        .group_by(Product.category, Product.stock_status)
+    )
+    for category, bucket, count, value, units in result.all():
+        counts[("products", category or "", bucket)] += count
+        counts[("inventory_value",)] += value or 0.0
+        counts[("inventory_units",)] += units or 0
+
+    result = await conn.execute(select(func.count(Supplier.id)).where(Supplier.is_active.is_(True)))
+    counts[("active_suppliers",)] = result.scalar() or 0
+
+    result = await conn.execute(select(Order.status, func.count(Order.id)).group_by(Order.status))
+    for order_status, count in result.all():
+        counts[("orders", order_status.value)] = count
+    now = datetime.utcnow()
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    result = await conn.execute(
+        select(func.count(Order.id), func.sum(Order.total_amount))
+        .where(Order.created_at >= month_start, Order.status != OrderStatus.CANCELLED)
+    )
+    count, revenue = result.one()
+    counts[("order_count", month_key(now))] = count or 0
+    counts[("order_revenue", month_key(now))] = revenue or 0.0
+
+    result = await conn.execute(
+        select(PurchaseOrder.status, func.count(PurchaseOrder.id), func.sum(PurchaseOrder.total_amount))
+        .group_by(PurchaseOrder.status)
+    )
+    for po_status, count, value in result.all():
+        counts[("purchase_orders", po_status.value)] = count
+        counts[("purchase_order_value", po_status.value)] = value or 0.0
+
+    result = await conn.execute(
+        select(StockBalance.warehouse, func.sum(StockBalance.quantity)).group_by(StockBalance.warehouse)
+    )
+    for warehouse, quantity in result.all():
+        counts[("warehouse_units", warehouse)] = quantity or 0
+
+    day = func.date(InventoryItem.created_at)
+    today = datetime.utcnow().date()
+    since = datetime.combine(today - timedelta(days=settings.DASHBOARD_MOVEMENT_DAYS - 1), datetime.min.time())
+    result = await conn.execute(
+        select(
+            day,
+            func.sum(case((LEDGER_DELTA_EXPRESSION > 0, LEDGER_DELTA_EXPRESSION), else_=0)),
+            func.sum(case((LEDGER_DELTA_EXPRESSION < 0, -LEDGER_DELTA_EXPRESSION), else_=0)),
+        )
+        .where(InventoryItem.created_at >= since)
+        .group_by(day)
+    )
+    for moved_on, inbound, outbound in result.all():
+        moved_on = str(moved_on)
+        counts[("inbound", moved_on)] = inbound or 0
+        counts[("outbound", moved_on)] = outbound or 0
+
+    return counts
+
+
+async def refresh_dashboard_counts(conn) -> None:
+    """Recompute every counter, correcting drift from other workers and invalidating writes"""
+    async with dashboard_counts.lock:
+        dashboard_counts.replace(await compute_dashboard_counts(conn))
+
+
+async def get_dashboard_counts(conn) -> Counts:
+    """
+    The in-memory counters, recomputed inline only when nothing younger than
+    DASHBOARD_MAX_STALENESS_SECONDS is loaded (startup, invalidation, or the
+    periodic refresh failing); concurrent callers share one recompute.
+    """
+    if not dashboard_counts.is_fresh():
+        async with dashboard_counts.lock:
+            if not dashboard_counts.is_fresh():
+                dashboard_counts.replace(await compute_dashboard_counts(conn))
+    return dashboard_counts.counts
+
+
+def _sum(counts: Counts, name: str, keys) -> float:
+    return sum(counts.get((name, key), 0.0) for key in keys)
+
+
+def build_overview(counts: Counts, computed_at: Optional[datetime]) -> DashboardOverview:
+    month = month_key(datetime.utcnow())
+    today = datetime.utcnow().date()
+    year_days = [(today - timedelta(days=offset)).isoformat() for offset in range(365)]
+
+    orders = {key[1]: value for key, value in counts.items() if key[0] == "orders"}
+    placed = sum(orders.values()) - orders.get(OrderStatus.CANCELLED.value, 0)
+    fulfilled = sum(orders.get(order_status, 0) for order_status in FULFILLED_ORDER_STATUSES)
+    month_orders = counts.get(("order_count", month), 0)
+    month_revenue = counts.get(("order_revenue", month), 0.0)
+    units = counts.get(("inventory_units",), 0)
+    low_buckets = (StockStatus.OUT_OF_STOCK.value, StockStatus.LOW_STOCK.value)
+
+    return DashboardOverview(
+        total_inventory_value=round(counts.get(("inventory_value",), 0.0), 2),
+        low_stock_items=int(sum(
+            value for key, value in counts.items() if key[0] == "products" and key[2] in low_buckets
+        )),
+        pending_orders=int(sum(orders.get(order_status, 0) for order_status in PENDING_ORDER_STATUSES)),
+        active_suppliers=int(counts.get(("active_suppliers",), 0)),
+        monthly_revenue=round(month_revenue, 2),
+        # Units shipped over the last year per unit on hand
+        inventory_turnover=round(_sum(counts, "outbound", year_days) / units, 2) if units > 0 else 0.0,
+        order_fulfillment_rate=round(100.0 * fulfilled / placed, 1) if placed > 0 else 0.0,
+        average_order_value=round(month_revenue / month_orders, 2) if month_orders > 0 else 0.0,
+        open_purchase_orders=int(_sum(counts, "purchase_orders", OPEN_PURCHASE_ORDER_STATUSES)),
+        open_purchase_order_value=round(_sum(counts, "purchase_order_value", OPEN_PURCHASE_ORDER_STATUSES), 2),
+        computed_at=computed_at,
+    )
+
+
+def build_inventory_analytics(
+    counts: Counts,
+    computed_at: Optional[datetime],
+    start_date: date,
+    end_date: date,
+) -> InventoryAnalytics:
+    levels = defaultdict(lambda: defaultdict(int))
+    for key, value in counts.items():
+        if key[0] == "products":
+            levels[key[1]][key[2]] += int(value)
+
+    totals = {category: sum(buckets.values()) for category, buckets in levels.items()}
+    product_total = sum(totals.values())
+
+    movement = []
+    day = start_date
+    while day <= end_date:
+        key = day.isoformat()
+        inbound = int(counts.get(("inbound", key), 0))
+        outbound = int(counts.get(("outbound", key), 0))
+        movement.append(StockMovementDay(date=key, inbound=inbound, outbound=outbound, net=inbound - outbound))
+        day += timedelta(days=1)
+
+    capacities = settings.WAREHOUSE_CAPACITIES
+    warehouses = []
+    for key, value in sorted(counts.items()):
+        if key[0] != "warehouse_units" or (not value and key[1] not in capacities):
+            continue
+        capacity = capacities.get(key[1], 0)
+        warehouses.append(WarehouseUtilization(
+            name=key[1] or "Unassigned",
+            utilized=int(value),
+            capacity=capacity,
+            utilization_rate=round(100.0 * value / capacity, 1) if capacity else 0.0,
+        ))
+
+    return InventoryAnalytics(
+        stock_levels=[
+            StockLevelCount(
+                category=category or "Uncategorized",
+                in_stock=buckets[StockStatus.NORMAL.value] + buckets[StockStatus.HIGH.value],
+                low_stock=buckets[StockStatus.LOW_STOCK.value],
+                out_of_stock=buckets[StockStatus.OUT_OF_STOCK.value],
+            )
+            for category, buckets in sorted(levels.items())
+            if totals[category]
+        ],
+        category_distribution=[
+            CategoryShare(
+                name=category or "Uncategorized",
+                value=count,
+                percentage=round(100.0 * count / product_total, 1),
+            )
+            for category, count in sorted(totals.items(), key=lambda item: -item[1])
+            if count
+        ],
+        warehouse_utilization=warehouses,
+        stock_movement=movement,
+        computed_at=computed_at,
+    )
@@ -0,0 +1,154 @@
+import asyncio
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.order import OrderStatus
+from app.models.product import stock_bucket
+
+# Counter keys are tuples: ("products", category, bucket), ("inventory_value",),
+# ("orders", status), ("order_revenue", "YYYY-MM"), ("warehouse_units", warehouse),
+# ("inbound", "YYYY-MM-DD"), ...
+Counts = Dict[Tuple[str, ...], float]
+
+_STAGED_KEY = "dashboard_deltas"
+
+
+def month_key(moment: datetime) -> str:
+    return moment.strftime("%Y-%m")
+
+
+def product_deltas(
+    category: Optional[str],
+    current_stock: Optional[int],
+    reorder_point: Optional[int],
+    cost_price: Optional[float],
+    is_active: Optional[bool],
+    sign: int = 1,
+) -> Counts:
+    """Counter contribution of one product row; inactive products don't count"""
+    if is_active is False:
+        return {}
+    stock = current_stock or 0
+    return {
+        ("products", category or "", stock_bucket(stock, reorder_point).value): sign,
+        ("inventory_value",): sign * stock * (cost_price or 0.0),
+        ("inventory_units",): sign * stock,
+    }
+
+
+def stock_change_deltas(
+    category: Optional[str],
+    new_stock: int,
+    delta: int,
+    reorder_point: Optional[int],
+    cost_price: Optional[float],
+    is_active: Optional[bool],
+) -> Counts:
+    """Counter change when a product's stock moved by ``delta`` to ``new_stock``"""
+    deltas = defaultdict(float)
+    for key, value in product_deltas(category, new_stock - delta, reorder_point, cost_price, is_active, -1).items():
+        deltas[key] += value
+    for key, value in product_deltas(category, new_stock, reorder_point, cost_price, is_active).items():
+        deltas[key] += value
+    return deltas
+
+
+def order_deltas(status: Any, total_amount: Optional[float], created_at: datetime, sign: int = 1) -> Counts:
+    status = getattr(status, "value", status)
+    deltas = {("orders", status): sign}
+    if status != OrderStatus.CANCELLED.value:
+        month = month_key(created_at)
+        deltas[("order_revenue", month)] = sign * (total_amount or 0.0)
+        deltas[("order_count", month)] = sign
+    return deltas
+
+
+def purchase_order_deltas(status: Any, total_amount: Optional[float], sign: int = 1) -> Counts:
+    status = getattr(status, "value", status)
+    return {
+        ("purchase_orders", status): sign,
+        ("purchase_order_value", status): sign * (total_amount or 0.0),
+    }
+
+
+def ledger_deltas(balance_deltas: Dict[Tuple[int, str, str], int]) -> Counts:
+    """Counter change for ledger postings, from their per-location balance deltas"""
+    today = datetime.utcnow().date().isoformat()
+    deltas = defaultdict(float)
+    for (_, warehouse, _), quantity in balance_deltas.items():
+        deltas[("warehouse_units", warehouse)] += quantity
+        if quantity > 0:
+            deltas[("inbound", today)] += quantity
+        elif quantity < 0:
+            deltas[("outbound", today)] -= quantity
+    return deltas
+
+
+def stage_dashboard_deltas(db, deltas: Counts) -> None:
+    """
+    Queue counter changes on the session. They reach the in-process counters
+    only if the transaction commits, and are dropped on rollback.
+    """
+    if not deltas:
+        return
+    staged = db.info.setdefault(_STAGED_KEY, defaultdict(float))
+    for key, value in deltas.items():
+        staged[key] += value
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_staged_deltas(session):
+    staged = session.info.pop(_STAGED_KEY, None)
+    if staged:
+        dashboard_counts.apply(staged)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_staged_deltas(session, previous_transaction):
+    if not previous_transaction.nested:
+        session.info.pop(_STAGED_KEY, None)
+
+
+class DashboardCounts:
+    """
+    In-process dashboard counters.
+
+    Replaced wholesale by a periodic recompute (app.services.dashboard) and
+    kept current in between by the staged deltas of every transaction this
+    worker commits. Writes made by other workers, and bulk paths that only
+    invalidate, show up at the next recompute.
+    """
+
+    def __init__(self, max_staleness: float):
+        self.max_staleness = max_staleness
+        self.counts: Counts = defaultdict(float)
+        self.computed_at: Optional[datetime] = None
+        self.lock = asyncio.Lock()
+        self._loaded_at: Optional[float] = None
+
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.max_staleness
+
+    def replace(self, counts: Counts) -> None:
+        self.counts = counts
+        self.computed_at = datetime.utcnow()
+        self._loaded_at = time.monotonic()
+
+    def apply(self, deltas: Counts) -> None:
+        if self._loaded_at is None:
+            return
+        for key, value in deltas.items():
+            self.counts[key] += value
+
+    def invalidate(self) -> None:
+        """Drop the counters after a write whose delta isn't known; the next read recomputes"""
+        self._loaded_at = None
+
+
+dashboard_counts = DashboardCounts(max_staleness=settings.DASHBOARD_MAX_STALENESS_SECONDS)
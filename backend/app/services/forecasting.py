@@ -0,0 +1,469 @@
+import asyncio
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, time, timedelta, timezone
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+from sqlalchemy import delete, func, insert, or_, select, text, union, union_all, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.db.database import async_engine
+from app.db.dialect import dialect_insert
+from app.models.forecast import DemandForecast, ForecastRun, ForecastRunStatus
+from app.models.inventory import InventoryItem, TransactionType
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.services.dashboard_counts import dashboard_counts
+from app.services.picking import WAVE_REFERENCE_TYPE
+
+logger = structlog.get_logger()
+
+_FORECAST_LOCK_SQL = text("SELECT pg_advisory_xact_lock(hashtext('demand_forecasts'))")
+
+# Aggregated (product, day) rows per streamed chunk, and rows per multi-row upsert
+_SERIES_CHUNK_ROWS = 100_000
+_FORECAST_BATCH_SIZE = 5000
+
+METHODS = ("ses", "croston")
+
+# Columns of the array returned by fit_demand_series, one row per product
+FIT_COLUMNS = ("method", "smoothing", "daily_demand", "daily_std", "history_days", "demand_days", "total_demand")
+
+
+def fit_demand_series(
+    product_index: np.ndarray,
+    day_index: np.ndarray,
+    quantity: np.ndarray,
+    product_count: int,
+    days: int,
+    ses_alphas: Sequence[float],
+    croston_alpha: float,
+    croston_min_interval: float,
+) -> np.ndarray:
+    """
+    Fit every product's daily demand at once: a (product x day) matrix walked
+    one day at a time, each step updating all products (and every candidate
+    smoothing constant) with array math.
+
+    Input is sparse (product, day, units) triples; a product's series starts at
+    its first demand day so products introduced mid-window aren't dragged down
+    by leading zeros. Both models start from the mean over that span.
+
+    - SES: level += alpha * error, with alpha per product chosen from
+      ``ses_alphas`` by one-step-ahead squared error
+    - Croston: demand size and the interval between demand days smoothed
+      separately, updated on demand days only; forecast size / interval
+
+    Croston is used when the average interval between demand days is at least
+    ``croston_min_interval`` (intermittent demand). The residual deviation is
+    that of the chosen model's one-step-ahead errors. Returns FIT_COLUMNS.
+    """
+    # Day-major, so each step reads one contiguous row
+    series = np.bincount(
+        day_index.astype(np.int64) * product_count + product_index, weights=quantity, minlength=days * product_count
+    ).reshape(days, product_count)
+    demand = series > 0
+    demand_days = demand.sum(axis=0)
+    has_demand = demand_days > 0
+    first = np.where(has_demand, demand.argmax(axis=0), days)
+    history = days - first
+    total = series.sum(axis=0)
+    mean = total / np.maximum(history, 1)
+    interval_mean = history / np.maximum(demand_days, 1)
+
+    alphas = np.asarray(ses_alphas, dtype=np.float64)[:, None]
+    level = np.repeat(mean[None, :], len(alphas), axis=0)
+    ses_sse = np.zeros_like(level)
+
+    size = np.where(has_demand, total / np.maximum(demand_days, 1), 0.0)
+    interval = np.where(has_demand, interval_mean, 1.0)
+    since = np.zeros(product_count)
+    croston_sse = np.zeros(product_count)
+
+    for day in range(int(first.min()) if product_count else days, days):
+        observed = series[day]
+        active = first <= day
+        error = np.where(active, observed - level, 0.0)
+        ses_sse += error * error
+        level += alphas * error
+
+        error = np.where(active, observed - size / interval, 0.0)
+        croston_sse += error * error
+        since += 1
+        demand_day = active & (observed > 0)
+        # The first demand day only anchors the interval count
+        smoothed = demand_day & (first < day)
+        size = np.where(smoothed, size + croston_alpha * (observed - size), size)
+        interval = np.where(smoothed, interval + croston_alpha * (since - interval), interval)
+        since = np.where(demand_day, 0.0, since)
+
+    columns = np.arange(product_count)
+    best = ses_sse.argmin(axis=0)
+    croston = has_demand & (interval_mean >= croston_min_interval)
+    sse = np.where(croston, croston_sse, ses_sse[best, columns])
+    daily = np.where(croston, size / interval, level[best, columns])
+    return np.column_stack([
+        croston.astype(np.float64),
+        np.where(croston, croston_alpha, alphas[best, 0]),
+        np.where(has_demand, np.maximum(daily, 0.0), 0.0),
+        np.sqrt(sse / np.maximum(history - 1, 1)),
+        history,
+        demand_days,
+        total,
+    ])
+
+
+def suggested_reorder_points(daily_demand: np.ndarray, daily_std: np.ndarray) -> np.ndarray:
+    """Demand over the lead time plus safety stock for the configured service level"""
+    lead_time = settings.FORECAST_LEAD_TIME_DAYS
+    point = daily_demand * lead_time + settings.FORECAST_SERVICE_LEVEL_Z * daily_std * math.sqrt(lead_time)
+    return np.ceil(point).astype(np.int64)
+
+
+async def fit_demand_forecasts(
+    product_index: np.ndarray,
+    day_index: np.ndarray,
+    quantity: np.ndarray,
+    product_count: int,
+    days: int,
+    shard_products: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Tuple[int, np.ndarray]:
+    """
+    Fit all products in shards of ``shard_products`` spread over a process pool
+    of ``workers``; a single shard (or one worker) runs in a thread instead of
+    paying for process start-up. Shards only carry their sparse triples, so
+    the dense matrices are built in the workers. Returns the shard count and
+    FIT_COLUMNS rows in product index order.
+    """
+    shard_products = shard_products or settings.FORECAST_SHARD_PRODUCTS
+    workers = workers or settings.FORECAST_WORKERS
+    if np.any(product_index[1:] < product_index[:-1]):
+        order = np.argsort(product_index, kind="stable")
+        product_index, day_index, quantity = product_index[order], day_index[order], quantity[order]
+
+    shards = []
+    for start in range(0, product_count, shard_products):
+        count = min(shard_products, product_count - start)
+        low, high = np.searchsorted(product_index, [start, start + count])
+        shards.append((
+            # int32 indices cut down what is pickled to the workers
+            (product_index[low:high] - start).astype(np.int32), day_index[low:high].astype(np.int32),
+            quantity[low:high], count, days,
+            list(settings.FORECAST_SES_ALPHAS), settings.FORECAST_CROSTON_ALPHA,
+            settings.FORECAST_CROSTON_MIN_INTERVAL,
+        ))
+    if not shards:
+        return 0, np.empty((0, len(FIT_COLUMNS)))
+
+    if len(shards) == 1 or workers <= 1:
+        fitted = [await asyncio.to_thread(fit_demand_series, *shard) for shard in shards]
+    else:
+        loop = asyncio.get_running_loop()
+        # spawn: forking a process with a running event loop and open connections is unsafe
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(shards)), mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            fitted = await asyncio.gather(*(
+                loop.run_in_executor(pool, fit_demand_series, *shard) for shard in shards
+            ))
+    return len(shards), np.concatenate(fitted)
+
+
+def forecast_cutoff(now: Optional[datetime] = None) -> datetime:
+    """
+    End of the history a run may use: the start of the current UTC day, taken
+    after the settle delay so transactions open at midnight have committed.
+    Runs only ever see complete days.
+    """
+    now = now or datetime.now(timezone.utc)
+    settled = now - timedelta(seconds=settings.FORECAST_SETTLE_SECONDS)
+    return datetime.combine(settled.date(), time.min, tzinfo=timezone.utc)
+
+
+def _order_demand(since: datetime, until: datetime):
+    return (
+        select(OrderItem.product_id, func.date(Order.created_at).label("day"), OrderItem.quantity.label("quantity"))
+        .join(Order, Order.id == OrderItem.order_id)
+        .where(Order.created_at >= since, Order.created_at < until, Order.status != OrderStatus.CANCELLED)
+    )
+
+
+def _ledger_demand(since: datetime, until: datetime):
+    # Picking waves issue stock for orders that are already counted above
+    return (
+        select(
+            InventoryItem.product_id,
+            func.date(InventoryItem.created_at).label("day"),
+            func.abs(InventoryItem.quantity).label("quantity"),
+        )
+        .where(
+            InventoryItem.created_at >= since,
+            InventoryItem.created_at < until,
+            InventoryItem.transaction_type == TransactionType.OUT,
+            or_(InventoryItem.reference_type.is_(None), InventoryItem.reference_type != WAVE_REFERENCE_TYPE),
+        )
+    )
+
+
+def changed_products_query(since: datetime, until: datetime):
+    """Products with demand recorded in [since, until)"""
+    return union(
+        _order_demand(since, until).with_only_columns(OrderItem.product_id),
+        _ledger_demand(since, until).with_only_columns(InventoryItem.product_id),
+    )
+
+
+async def load_demand(
+    conn: AsyncConnection,
+    data_through: datetime,
+    changed_since: Optional[datetime] = None,
+) -> Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Daily demand over the FORECAST_HISTORY_DAYS before ``data_through``: units
+    on non-cancelled orders by order date plus OUT ledger movements that don't
+    belong to an order (anything but picking waves), summed per product and
+    day in the database. With ``changed_since`` only products with demand since
+    then are loaded.
+
+    Returns the number of (product, day) rows, the product ids (sorted) and per
+    row the product's position in them, the day index and the units.
+    """
+    days = settings.FORECAST_HISTORY_DAYS
+    since = data_through - timedelta(days=days)
+    sources = [_order_demand(since, data_through), _ledger_demand(since, data_through)]
+    if changed_since is not None:
+        changed = changed_products_query(changed_since, data_through)
+        sources = [
+            sources[0].where(OrderItem.product_id.in_(changed)),
+            sources[1].where(InventoryItem.product_id.in_(changed)),
+        ]
+    movements = union_all(*sources).subquery("movements")
+    result = await conn.stream(
+        select(movements.c.product_id, movements.c.day, func.sum(movements.c.quantity))
+        .group_by(movements.c.product_id, movements.c.day)
+        .execution_options(yield_per=_SERIES_CHUNK_ROWS)
+    )
+
+    first_day = np.datetime64(since.date(), "D")
+    product_ids, day_index, quantity = [], [], []
+    async for partition in result.partitions(_SERIES_CHUNK_ROWS):
+        ids, moved_on, units = zip(*partition)
+        product_ids.append(np.array(ids, dtype=np.int64))
+        # date objects (PostgreSQL) and ISO strings (SQLite) both convert
+        day_index.append((np.array([str(day)[:10] for day in moved_on], dtype="datetime64[D]") - first_day).astype(np.int64))
+        quantity.append(np.array(units, dtype=np.float64))
+    if not product_ids:
+        empty = np.empty(0, dtype=np.int64)
+        return 0, empty, empty, empty, np.empty(0)
+
+    product_ids, day_index, quantity = (np.concatenate(column) for column in (product_ids, day_index, quantity))
+    # A session time zone other than UTC can shift a row just outside the window
+    inside = (day_index >= 0) & (day_index < days)
+    product_ids, day_index, quantity = product_ids[inside], day_index[inside], quantity[inside]
+    unique_ids, product_index = np.unique(product_ids, return_inverse=True)
+    return int(inside.sum()), unique_ids, product_index, day_index, quantity
+
+
+async def create_forecast_run(
+    conn: AsyncConnection,
+    data_through: datetime,
+    full_refit: bool,
+    apply_reorder_points: bool,
+    user_id: Optional[int],
+) -> int:
+    result = await conn.execute(
+        insert(ForecastRun)
+        .values(
+            data_through=data_through,
+            full_refit=full_refit,
+            apply_reorder_points=apply_reorder_points,
+            status=ForecastRunStatus.RUNNING,
+            created_by=user_id,
+        )
+        .returning(ForecastRun.id)
+    )
+    return result.scalar_one()
+
+
+async def _write_forecasts(
+    conn: AsyncConnection,
+    run_id: int,
+    data_through: datetime,
+    product_ids: np.ndarray,
+    fitted: np.ndarray,
+) -> None:
+    insert_stmt = dialect_insert(conn.dialect.name)(DemandForecast)
+    stmt = insert_stmt.on_conflict_do_update(
+        index_elements=[DemandForecast.product_id],
+        set_={
+            column: insert_stmt.excluded[column]
+            for column in (
+                "run_id", "method", "smoothing", "daily_demand", "daily_std", "history_days",
+                "demand_days", "total_demand", "suggested_reorder_point", "data_through", "fitted_at",
+            )
+        },
+    )
+    fitted_at = datetime.now(timezone.utc)
+    columns = [
+        product_ids.tolist(),
+        [METHODS[int(method)] for method in fitted[:, 0]],
+        fitted[:, 1].tolist(),
+        fitted[:, 2].round(6).tolist(),
+        fitted[:, 3].round(6).tolist(),
+        fitted[:, 4].astype(np.int64).tolist(),
+        fitted[:, 5].astype(np.int64).tolist(),
+        fitted[:, 6].tolist(),
+        suggested_reorder_points(fitted[:, 2], fitted[:, 3]).tolist(),
+    ]
+    for start in range(0, len(product_ids), _FORECAST_BATCH_SIZE):
+        await conn.execute(stmt, [
+            dict(
+                product_id=product_id,
+                run_id=run_id,
+                method=method,
+                smoothing=smoothing,
+                daily_demand=daily,
+                daily_std=std,
+                history_days=history,
+                demand_days=demand_days,
+                total_demand=total,
+                suggested_reorder_point=reorder_point,
+                data_through=data_through,
+                fitted_at=fitted_at,
+            )
+            for product_id, method, smoothing, daily, std, history, demand_days, total, reorder_point in zip(
+                *(column[start:start + _FORECAST_BATCH_SIZE] for column in columns)
+            )
+        ])
+
+
+async def run_demand_forecast(run_id: int) -> bool:
+    """
+    Fit and store forecasts for ``run_id``. An incremental run refits only the
+    products with demand since the last completed run's cut-off (all of them if
+    there is none); a full run refits every product and drops forecasts of
+    products without demand in the window. Products whose demand changed
+    without a new row (an order cancelled later) are corrected by the next
+    full run.
+
+    History is read on one connection, fitted with no transaction open, and
+    written in a second transaction together with the run totals (and the
+    reorder points of products with at least a lead time of history, if the
+    run applies them). Failures are recorded on the run. Returns True on
+    success.
+    """
+    try:
+        async with async_engine.connect() as conn:
+            result = await conn.execute(
+                select(ForecastRun.data_through, ForecastRun.full_refit, ForecastRun.apply_reorder_points)
+                .where(ForecastRun.id == run_id)
+            )
+            data_through, full_refit, apply_reorder_points = result.one()
+            if data_through.tzinfo is None:
+                data_through = data_through.replace(tzinfo=timezone.utc)
+            changed_since = None
+            if not full_refit:
+                result = await conn.execute(
+                    select(func.max(ForecastRun.data_through))
+                    .where(ForecastRun.status == ForecastRunStatus.COMPLETED, ForecastRun.id != run_id)
+                )
+                changed_since = result.scalar()
+                full_refit = changed_since is None
+            series_rows, product_ids, product_index, day_index, quantity = await load_demand(
+                conn, data_through, changed_since
+            )
+
+        shard_count, fitted = await fit_demand_forecasts(
+            product_index, day_index, quantity, len(product_ids), settings.FORECAST_HISTORY_DAYS
+        )
+
+        async with async_engine.begin() as conn:
+            await _write_forecasts(conn, run_id, data_through, product_ids, fitted)
+            if full_refit:
+                await conn.execute(
+                    delete(DemandForecast)
+                    .where(or_(DemandForecast.run_id.is_(None), DemandForecast.run_id != run_id))
+                )
+            if apply_reorder_points and len(product_ids):
+                await conn.execute(
+                    update(Product)
+                    .where(Product.id.in_(
+                        # A few days of history say little about demand over a whole lead time
+                        select(DemandForecast.product_id).where(
+                            DemandForecast.run_id == run_id,
+                            DemandForecast.history_days >= settings.FORECAST_LEAD_TIME_DAYS,
+                        )
+                    ))
+                    .values(reorder_point=(
+                        select(DemandForecast.suggested_reorder_point)
+                        .where(DemandForecast.product_id == Product.id)
+                        .scalar_subquery()
+                    ))
+                )
+            await conn.execute(
+                update(ForecastRun)
+                .where(ForecastRun.id == run_id)
+                .values(
+                    status=ForecastRunStatus.COMPLETED,
+                    full_refit=full_refit,
+                    series_rows=series_rows,
+                    product_count=len(product_ids),
+                    shard_count=shard_count,
+                    completed_at=datetime.now(timezone.utc),
+                )
+            )
+        if apply_reorder_points and len(product_ids):
+            # Stock buckets follow reorder_point
+            dashboard_counts.invalidate()
+        logger.info(
+            "Demand forecast completed",
+            run_id=run_id, full_refit=full_refit, products=len(product_ids), shards=shard_count,
+        )
+        return True
+    except Exception as exc:
+        logger.exception("Demand forecast failed", run_id=run_id)
+        async with async_engine.begin() as conn:
+            await conn.execute(
+                update(ForecastRun)
+                .where(ForecastRun.id == run_id)
+                .values(status=ForecastRunStatus.FAILED, error=str(exc), completed_at=datetime.now(timezone.utc))
+            )
+        return False
+
+
+async def run_scheduled_forecast() -> Optional[int]:
+    """
+    Start the day's forecast run unless one already covers the current cut-off
+    (several workers run this job): full when the last completed full run is
+    FORECAST_FULL_REFIT_DAYS old, incremental otherwise. Returns the run id, or
+    None when there was nothing to do.
+    """
+    data_through = forecast_cutoff()
+    async with async_engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            await conn.execute(_FORECAST_LOCK_SQL)
+        result = await conn.execute(
+            select(ForecastRun.id)
+            .where(ForecastRun.data_through >= data_through, ForecastRun.status != ForecastRunStatus.FAILED)
+            .limit(1)
+        )
+        if result.first() is not None:
+            return None
+        result = await conn.execute(
+            select(func.max(ForecastRun.data_through))
+            .where(ForecastRun.full_refit.is_(True), ForecastRun.status == ForecastRunStatus.COMPLETED)
+        )
+        last_full = result.scalar()
+        if last_full is not None and last_full.tzinfo is None:
+            last_full = last_full.replace(tzinfo=timezone.utc)
+        full_refit = last_full is None or data_through - last_full >= timedelta(days=settings.FORECAST_FULL_REFIT_DAYS)
+        run_id = await create_forecast_run(
+            conn, data_through, full_refit, settings.FORECAST_APPLY_REORDER_POINTS, None
+        )
+    await run_demand_forecast(run_id)
+    return run_id
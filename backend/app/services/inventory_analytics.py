@@ -0,0 +1,306 @@
+import asyncio
+from datetime import date, datetime, time, timedelta, timezone
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.dialect import epoch_seconds
+from app.models.inventory import InventoryItem, TransactionType
+from app.models.product import Product
+from app.services.stock import LEDGER_DELTA_EXPRESSION
+from app.services.valuation import grouped_cumsum
+
+SECONDS_PER_DAY = 86400.0
+
+# Per product, in product id order: id, opening, closing, issued, average on hand,
+# aging quantities (one column per bucket) and quantity-weighted age in days
+TurnoverColumns = Dict[str, np.ndarray]
+
+
+def aging_labels(edges: Sequence[int]) -> List[str]:
+    """Bucket labels for day edges, e.g. [30, 60] -> ["0-30", "31-60", "61+"]"""
+    labels = []
+    lower = 0
+    for edge in edges:
+        labels.append(f"{lower}-{edge}")
+        lower = edge + 1
+    labels.append(f"{lower}+")
+    return labels
+
+
+def _empty_columns(bucket_count: int) -> TurnoverColumns:
+    empty = np.empty(0)
+    return {
+        "product_id": empty, "opening": empty, "closing": empty, "issued": empty,
+        "average": empty, "aging": np.empty((0, bucket_count)), "average_age": empty,
+    }
+
+
+def turnover_aging_rows(
+    product_ids: np.ndarray,
+    timestamps: np.ndarray,
+    deltas: np.ndarray,
+    issues: np.ndarray,
+    transfers: np.ndarray,
+    start_ts: float,
+    end_ts: float,
+    aging_edges: Sequence[int],
+) -> TurnoverColumns:
+    """
+    Turnover and aging for complete product histories up to ``end_ts``, with
+    array math over all rows at once.
+
+    Rows are ledger movements ordered by product then time: epoch seconds,
+    signed quantity, whether the row is an issue (OUT) and whether it is one
+    leg of a transfer between locations. Per product:
+
+    - opening/closing: stock before ``start_ts`` and at ``end_ts``
+    - issued: units issued within the period
+    - average: time-weighted stock over the period; each movement in the
+      period counts for the fraction of the period still left after it
+    - aging: the closing stock is taken to be the newest inflows (FIFO), and
+      each inflow's share is bucketed by its age at ``end_ts``; stock not
+      explained by recorded inflows counts as the oldest bucket. Transfers
+      only move stock, so they count in the quantities but don't reset its age
+    """
+    row_count = len(product_ids)
+    bucket_count = len(aging_edges) + 1
+    if not row_count:
+        return _empty_columns(bucket_count)
+
+    starts = np.flatnonzero(np.r_[True, product_ids[1:] != product_ids[:-1]])
+    ends = np.r_[starts[1:], row_count]
+    group_count = len(starts)
+    group = np.repeat(np.arange(group_count), ends - starts)
+    period = max(end_ts - start_ts, 1.0)
+
+    in_period = timestamps >= start_ts
+    opening = np.bincount(group, weights=np.where(in_period, 0.0, deltas), minlength=group_count)
+    closing = np.bincount(group, weights=deltas, minlength=group_count)
+    issued = np.bincount(group, weights=np.where(in_period & issues, -deltas, 0.0), minlength=group_count)
+    remaining = np.where(in_period, (end_ts - timestamps) / period, 0.0)
+    average = opening + np.bincount(group, weights=deltas * remaining, minlength=group_count)
+
+    # FIFO aging of the closing stock
+    on_hand = np.maximum(closing, 0)
+    inflow = (deltas > 0) & ~transfers
+    received = np.where(inflow, deltas, 0.0)
+    received_through = grouped_cumsum(received, group, group_count)
+    received_later = received_through[ends - 1][group] - received_through
+    counted = np.clip(on_hand[group] - received_later, 0, received)
+    age_days = (end_ts - timestamps) / SECONDS_PER_DAY
+    bucket = np.searchsorted(np.asarray(aging_edges, dtype=np.float64), age_days, side="left")
+    aging = np.bincount(
+        group * bucket_count + bucket, weights=counted, minlength=group_count * bucket_count
+    ).reshape(group_count, bucket_count)
+    aging[:, -1] += on_hand - aging.sum(axis=1)
+    # Average age of the stock explained by recorded inflows
+    age_total = np.bincount(group, weights=counted * age_days, minlength=group_count)
+    explained = np.bincount(group, weights=counted, minlength=group_count)
+    average_age = np.divide(age_total, explained, out=np.zeros(group_count), where=explained > 0)
+
+    return {
+        "product_id": product_ids[starts],
+        "opening": opening,
+        "closing": closing,
+        "issued": issued,
+        "average": average,
+        "aging": aging,
+        "average_age": average_age,
+    }
+
+
+async def _stream_ledger(conn: AsyncConnection, end: datetime, chunk_rows: int) -> AsyncIterator[np.ndarray]:
+    """Ledger movements up to ``end`` as (product_id, epoch seconds, delta, is_issue, is_transfer) float arrays"""
+    result = await conn.stream(
+        select(
+            InventoryItem.product_id,
+            epoch_seconds(InventoryItem.created_at, conn.dialect.name),
+            LEDGER_DELTA_EXPRESSION,
+            InventoryItem.transaction_type == TransactionType.OUT,
+            InventoryItem.transaction_type == TransactionType.TRANSFER,
+        )
+        .where(InventoryItem.created_at < end)
+        .order_by(InventoryItem.product_id, InventoryItem.created_at, InventoryItem.id)
+        .execution_options(yield_per=chunk_rows)
+    )
+    async for partition in result.partitions(chunk_rows):
+        yield np.array(partition, dtype=np.float64)
+
+
+def period_bounds(start_date: date, end_date: date) -> Tuple[datetime, datetime]:
+    """UTC instants spanning whole days: start of ``start_date`` to end of ``end_date``"""
+    start = datetime.combine(start_date, time.min, tzinfo=timezone.utc)
+    end = datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=timezone.utc)
+    return start, end
+
+
+async def compute_turnover_aging(
+    conn: AsyncConnection,
+    start_date: date,
+    end_date: date,
+    chunk_rows: Optional[int] = None,
+) -> Dict[str, object]:
+    """
+    Stream the ledger up to the end of the period in chunks and compute
+    turnover, days on hand and aging per product and per category.
+
+    As with valuation, the last product of a chunk is carried into the next
+    one so every product is computed from its complete history. The array work
+    runs in a worker thread so the event loop keeps serving requests.
+    """
+    chunk_rows = chunk_rows or settings.INVENTORY_ANALYTICS_CHUNK_ROWS
+    edges = list(settings.INVENTORY_AGING_BUCKET_DAYS)
+    start, end = period_bounds(start_date, end_date)
+    start_ts, end_ts = start.timestamp(), end.timestamp()
+
+    def compute(rows: np.ndarray) -> TurnoverColumns:
+        return turnover_aging_rows(
+            rows[:, 0], rows[:, 1], rows[:, 2], rows[:, 3] > 0, rows[:, 4] > 0, start_ts, end_ts, edges
+        )
+
+    ledger_rows = 0
+    parts: List[TurnoverColumns] = []
+    carry = np.empty((0, 5))
+    async for chunk in _stream_ledger(conn, end, chunk_rows):
+        ledger_rows += len(chunk)
+        rows = np.concatenate([carry, chunk]) if len(carry) else chunk
+        cut = np.searchsorted(rows[:, 0], rows[-1, 0])
+        if cut:
+            parts.append(await asyncio.to_thread(compute, rows[:cut]))
+        carry = rows[cut:]
+    if len(carry):
+        parts.append(await asyncio.to_thread(compute, carry))
+    if parts:
+        columns = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+    else:
+        columns = _empty_columns(len(edges) + 1)
+
+    result = await conn.execute(
+        select(Product.id, Product.sku, Product.name, Product.category, Product.cost_price).order_by(Product.id)
+    )
+    catalog = result.all()
+    catalog_ids = np.array([row.id for row in catalog], dtype=np.float64)
+    positions = np.searchsorted(catalog_ids, columns["product_id"]).clip(0, max(len(catalog) - 1, 0))
+    known = catalog_ids[positions] == columns["product_id"] if len(catalog) else np.zeros(len(positions), bool)
+    positions, columns = positions[known], {key: value[known] for key, value in columns.items()}
+    cost = np.array([catalog[i].cost_price or 0.0 for i in positions.tolist()])
+    categories = [catalog[i].category or "" for i in positions.tolist()]
+
+    period_days = (end_ts - start_ts) / SECONDS_PER_DAY
+    labels = aging_labels(edges)
+
+    def ratios(issued, average, closing):
+        turnover = np.divide(issued, average, out=np.full(len(issued), np.nan), where=average > 0)
+        daily = issued / period_days
+        days_on_hand = np.divide(closing, daily, out=np.full(len(issued), np.nan), where=daily > 0)
+        return turnover, days_on_hand
+
+    turnover, days_on_hand = ratios(columns["issued"], columns["average"], columns["closing"])
+    products = [
+        {
+            "product_id": int(product_id),
+            "sku": catalog[position].sku,
+            "name": catalog[position].name,
+            "category": category or None,
+            "opening_quantity": int(opening),
+            "closing_quantity": int(closing),
+            "issued_quantity": int(issued),
+            "average_quantity": round(average, 2),
+            "closing_value": round(closing * unit_cost, 2),
+            "turnover": None if np.isnan(ratio) else round(ratio, 4),
+            "days_on_hand": None if np.isnan(days) else round(days, 1),
+            "average_age_days": round(age, 1),
+            "aging": dict(zip(labels, (int(quantity) for quantity in bucket_quantities))),
+        }
+        for product_id, position, category, opening, closing, issued, average, unit_cost, ratio, days, age, bucket_quantities
+        in zip(
+            columns["product_id"].tolist(), positions.tolist(), categories,
+            columns["opening"].tolist(), columns["closing"].tolist(), columns["issued"].tolist(),
+            columns["average"].tolist(), cost.tolist(), turnover.tolist(), days_on_hand.tolist(),
+            columns["average_age"].tolist(), columns["aging"].tolist(),
+        )
+    ]
+
+    # Categories aggregate by value so products with different costs weigh correctly
+    names, code = np.unique(np.array(categories, dtype=object), return_inverse=True) if categories else (np.empty(0), np.empty(0, int))
+    count = len(names)
+    issued_value = np.bincount(code, weights=columns["issued"] * cost, minlength=count)
+    average_value = np.bincount(code, weights=columns["average"] * cost, minlength=count)
+    closing_value = np.bincount(code, weights=np.maximum(columns["closing"], 0) * cost, minlength=count)
+    on_hand = np.bincount(code, weights=np.maximum(columns["closing"], 0), minlength=count)
+    age_total = np.bincount(code, weights=columns["average_age"] * np.maximum(columns["closing"], 0), minlength=count)
+    category_aging = np.zeros((count, len(labels)))
+    np.add.at(category_aging, code, columns["aging"])
+    category_turnover, category_days = ratios(issued_value, average_value, closing_value)
+    category_rows = [
+        {
+            "category": name or None,
+            "product_count": int(products_in),
+            "issued_value": round(issued, 2),
+            "average_value": round(average, 2),
+            "closing_value": round(closing, 2),
+            "turnover": None if np.isnan(ratio) else round(ratio, 4),
+            "days_on_hand": None if np.isnan(days) else round(days, 1),
+            "average_age_days": round(age / units, 1) if units > 0 else 0.0,
+            "aging": dict(zip(labels, (int(quantity) for quantity in bucket_quantities))),
+        }
+        for name, products_in, issued, average, closing, ratio, days, age, units, bucket_quantities in zip(
+            names.tolist(), np.bincount(code, minlength=count).tolist(), issued_value.tolist(),
+            average_value.tolist(), closing_value.tolist(), category_turnover.tolist(), category_days.tolist(),
+            age_total.tolist(), on_hand.tolist(), category_aging.tolist(),
+        )
+    ]
+
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "computed_at": datetime.utcnow(),
+        "ledger_rows": ledger_rows,
+        "aging_buckets": labels,
+        "categories": category_rows,
+        "products": products,
+    }
+
+
+class TurnoverAgingCache:
+    """
+    Reports cached per date range. Periods that ended before today only change
+    when old ledger months are archived, so they are kept much longer than
+    periods still receiving movements. Concurrent requests for a range that is
+    not cached share one computation.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, closed_ttl: float):
+        self.closed_ttl = closed_ttl
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._locks: Dict[Tuple[date, date], asyncio.Lock] = {}
+
+    async def get(self, conn: AsyncConnection, start_date: date, end_date: date) -> Dict[str, object]:
+        key = (start_date, end_date)
+        report = self._cache.get(key)
+        if report is not None:
+            return report
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            report = self._cache.get(key)
+            if report is None:
+                report = await compute_turnover_aging(conn, start_date, end_date)
+                closed = end_date < datetime.utcnow().date()
+                self._cache.set(key, report, ttl=self.closed_ttl if closed else None)
+        self._locks.pop(key, None)
+        return report
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+turnover_aging_reports = TurnoverAgingCache(
+    maxsize=settings.INVENTORY_ANALYTICS_CACHE_MAXSIZE,
+    ttl=settings.INVENTORY_ANALYTICS_CACHE_TTL_SECONDS,
+    closed_ttl=settings.INVENTORY_ANALYTICS_CLOSED_CACHE_TTL_SECONDS,
+)
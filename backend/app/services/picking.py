@@ -0,0 +1,308 @@
+import re
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.inventory import StockBalance, TransactionType
+from app.models.order import Order, OrderItem, OrderStatus
+from app.models.product import Product
+from app.schemas.order import PickingWave, PickingWaveCreate
+from app.services.dashboard_counts import stage_dashboard_deltas
+from app.services.stock import post_ledger_entries
+
+# Orders whose stock is reserved and that are waiting to be picked
+PICKABLE_STATUSES = (OrderStatus.CONFIRMED,)
+
+# reference_type of the OUT ledger rows posted when a wave is released
+WAVE_REFERENCE_TYPE = "picking_wave"
+
+_TOKEN = re.compile(r"\d+|[^\W\d_]+")
+
+
+def shelf_tokens(shelf: str) -> Tuple[Tuple[int, int, str], ...]:
+    """Natural sort key for a shelf code: "A-10-2" sorts after "A-9-2" """
+    return tuple(
+        (0, int(token), "") if token.isdigit() else (1, 0, token.upper())
+        for token in _TOKEN.findall(shelf)
+    )
+
+
+def walk_order(
+    locations: Iterable[str],
+    zone_order: Sequence[str] = (),
+    serpentine: bool = True,
+) -> Dict[str, int]:
+    """
+    Position of every shelf code on the pick walk.
+
+    Zones (the first segment of the code) are visited in ``zone_order``, then
+    any other zones in natural order; shelves without a code come last. With
+    ``serpentine`` every other visited zone is walked back to front so the
+    picker doesn't return to the head of each aisle.
+    """
+    zone_rank = {zone.upper(): rank for rank, zone in enumerate(zone_order)}
+    zones = defaultdict(list)
+    unlocated = []
+    for shelf in set(locations):
+        tokens = shelf_tokens(shelf)
+        if not tokens:
+            unlocated.append(shelf)
+            continue
+        zones[tokens[0]].append((tokens[1:], shelf))
+
+    def zone_key(zone):
+        return (zone_rank.get(zone[2] or str(zone[1]), len(zone_rank)), zone)
+
+    positions = {}
+    for index, zone in enumerate(sorted(zones, key=zone_key)):
+        shelves = sorted(zones[zone], reverse=serpentine and index % 2 == 1)
+        for _, shelf in shelves:
+            positions[shelf] = len(positions)
+    for shelf in sorted(unlocated):
+        positions[shelf] = len(positions)
+    return positions
+
+
+def allocate_orders(
+    order_lines: Dict[int, List[Tuple[int, int]]],
+    balances: Dict[int, List[Tuple[str, str, int]]],
+    positions: Dict[str, int],
+) -> Tuple[Dict[Tuple[int, str, str], List[Tuple[int, int]]], Dict[int, Dict[int, int]]]:
+    """
+    Allocate whole orders, in the order given, from each product's stocked
+    locations, earliest on the walk first so the wave needs as few stops as
+    possible. An order with a line that can't be covered takes nothing and is
+    held back, so a released wave never leaves part of an order unpicked.
+
+    Returns the (order_id, quantity) takes per (product_id, warehouse, shelf)
+    and, per held order, the quantity missing per product.
+    """
+    remaining = {
+        product_id: [
+            [(warehouse, shelf), available]
+            for warehouse, shelf, available in sorted(
+                locations, key=lambda location: (location[0], positions[location[1]])
+            )
+        ]
+        for product_id, locations in balances.items()
+    }
+    allocations = defaultdict(list)
+    held = {}
+    for order_id, lines in order_lines.items():
+        takes = []
+        missing = defaultdict(int)
+        for product_id, quantity in lines:
+            for slot in remaining.get(product_id, ()):
+                if quantity <= 0:
+                    break
+                take = min(quantity, slot[1])
+                if take <= 0:
+                    continue
+                slot[1] -= take
+                quantity -= take
+                takes.append((slot, product_id, take))
+            if quantity > 0:
+                missing[product_id] += quantity
+        if missing:
+            for slot, _, take in takes:
+                slot[1] += take
+            held[order_id] = dict(missing)
+            continue
+        for slot, product_id, take in takes:
+            allocations[(product_id, *slot[0])].append((order_id, take))
+    return allocations, held
+
+
+async def _select_orders(db: AsyncSession, wave_in: PickingWaveCreate) -> List[Tuple[int, str]]:
+    query = select(Order.id, Order.order_number).where(Order.status.in_(PICKABLE_STATUSES))
+    if wave_in.order_ids is not None:
+        query = query.where(Order.id.in_(wave_in.order_ids))
+    query = query.order_by(Order.created_at, Order.id).limit(
+        min(wave_in.max_orders, settings.PICKING_WAVE_MAX_ORDERS)
+    )
+    if wave_in.release:
+        # Concurrent releases take disjoint sets of orders instead of queueing (PostgreSQL)
+        query = query.with_for_update(of=Order, skip_locked=True)
+    result = await db.execute(query)
+    return result.all()
+
+
+async def build_picking_wave(db: AsyncSession, wave_in: PickingWaveCreate, user_id: int) -> PickingWave:
+    """
+    Build a picking wave from confirmed orders in three queries: the orders, their
+    lines joined to the products, and the stock balances of those products (a
+    primary-key range scan per product).
+
+    Orders are allocated whole, oldest first, over stocked locations; an order
+    that can't be fully covered by located stock is held back (left confirmed
+    for a later wave) and reported with what it is missing. Allocations become
+    one stop per (product, location), each stop carrying the per-order
+    quantities for sorting at the pack station. Stops are grouped into one
+    list per warehouse in walk order. On ``release`` the orders and the
+    balances they allocate from are row-locked, the stops are posted to the
+    ledger as OUT movements and the picked orders move to processing; stock
+    was already reserved at checkout, so current_stock is unchanged. The
+    caller commits.
+    """
+    generated_at = datetime.utcnow()
+    wave_number = f"WAVE-{generated_at:%Y%m%d%H%M%S%f}"
+    zone_order = wave_in.zone_order if wave_in.zone_order is not None else settings.PICKING_ZONE_ORDER
+    serpentine = wave_in.serpentine if wave_in.serpentine is not None else settings.PICKING_SERPENTINE
+
+    orders = dict(await _select_orders(db, wave_in))
+    if not orders:
+        return PickingWave(
+            wave_number=wave_number, generated_at=generated_at, released=wave_in.release,
+            order_count=0, line_count=0, stop_count=0, lists=[],
+        )
+
+    result = await db.execute(
+        select(OrderItem.order_id, OrderItem.product_id, OrderItem.quantity, Product.sku, Product.name)
+        .join(Product, Product.id == OrderItem.product_id)
+        .where(OrderItem.order_id.in_(list(orders)))
+        .order_by(OrderItem.order_id, OrderItem.id)
+    )
+    lines = result.all()
+
+    order_lines = defaultdict(list)
+    products = {}
+    for line in lines:
+        order_lines[line.order_id].append((line.product_id, line.quantity))
+        products[line.product_id] = (line.sku, line.name)
+    # Oldest orders first, as selected
+    order_lines = {order_id: order_lines[order_id] for order_id in orders if order_id in order_lines}
+
+    query = (
+        select(StockBalance.product_id, StockBalance.warehouse, StockBalance.shelf, StockBalance.quantity)
+        .where(StockBalance.product_id.in_(list(products)), StockBalance.quantity > 0)
+    )
+    if wave_in.release:
+        # Concurrent releases over different orders can draw on the same
+        # locations: the second waits here and allocates from what is left.
+        # Key order matches apply_balance_deltas, so the locks can't deadlock
+        query = query.order_by(
+            StockBalance.product_id, StockBalance.warehouse, StockBalance.shelf
+        ).with_for_update()
+    result = await db.execute(query)
+    balances = defaultdict(list)
+    for product_id, warehouse, shelf, quantity in result.all():
+        balances[product_id].append((warehouse, shelf, quantity))
+
+    positions = walk_order(
+        (shelf for locations in balances.values() for _, shelf, _ in locations),
+        zone_order, serpentine,
+    )
+    allocations, held = allocate_orders(order_lines, balances, positions)
+    picked_orders = [order_id for order_id in orders if order_id not in held]
+    picks = {key: sum(quantity for _, quantity in takes) for key, takes in allocations.items()}
+    stop_orders = {
+        key: [
+            {"order_id": order_id, "order_number": orders[order_id], "quantity": quantity}
+            for order_id, quantity in takes
+        ]
+        for key, takes in allocations.items()
+    }
+    unallocated = defaultdict(int)
+    for missing in held.values():
+        for product_id, quantity in missing.items():
+            unallocated[product_id] += quantity
+
+    stops_by_warehouse = defaultdict(list)
+    for (product_id, warehouse, shelf), quantity in picks.items():
+        stops_by_warehouse[warehouse].append((product_id, shelf, quantity))
+
+    page_size = wave_in.max_stops_per_list
+    pick_lists = []
+    for warehouse in sorted(stops_by_warehouse):
+        # Sequence only the shelves this list visits, so serpentine turns follow the actual walk
+        walk = walk_order((shelf for _, shelf, _ in stops_by_warehouse[warehouse]), zone_order, serpentine)
+        ordered = sorted(stops_by_warehouse[warehouse], key=lambda stop: (walk[stop[1]], stop[0]))
+        stops = []
+        for sequence, (product_id, shelf, quantity) in enumerate(ordered, 1):
+            sku, name = products[product_id]
+            stops.append({
+                "sequence": sequence, "warehouse": warehouse, "shelf": shelf,
+                "product_id": product_id, "sku": sku, "name": name, "quantity": quantity,
+                "orders": stop_orders[(product_id, warehouse, shelf)],
+            })
+        size = page_size or len(stops)
+        for page, start in enumerate(range(0, len(stops), size), 1):
+            pick_lists.append({"warehouse": warehouse, "page": page, "stops": stops[start:start + size]})
+
+    if wave_in.release and picked_orders:
+        await post_ledger_entries(db, [
+            {
+                "product_id": product_id,
+                "quantity": quantity,
+                "transaction_type": TransactionType.OUT,
+                "warehouse_location": warehouse or None,
+                "shelf_location": shelf or None,
+                "reference_number": wave_number,
+                "reference_type": WAVE_REFERENCE_TYPE,
+                "notes": None,
+                "created_by": user_id,
+            }
+            for (product_id, warehouse, shelf), quantity in sorted(picks.items())
+        ])
+        await db.execute(
+            update(Order)
+            .where(Order.id.in_(picked_orders))
+            .values(status=OrderStatus.PROCESSING)
+            .execution_options(synchronize_session=False)
+        )
+        stage_dashboard_deltas(db, {
+            ("orders", OrderStatus.CONFIRMED.value): -len(picked_orders),
+            ("orders", OrderStatus.PROCESSING.value): len(picked_orders),
+        })
+
+    return PickingWave(
+        wave_number=wave_number,
+        generated_at=generated_at,
+        released=wave_in.release,
+        order_count=len(picked_orders),
+        line_count=sum(len(order_lines.get(order_id, ())) for order_id in picked_orders),
+        stop_count=len(picks),
+        lists=pick_lists,
+        unallocated=[
+            {"product_id": product_id, "sku": products[product_id][0], "quantity": quantity}
+            for product_id, quantity in sorted(unallocated.items())
+        ],
+        held_orders=[
+            {
+                "order_id": order_id,
+                "order_number": orders[order_id],
+                "missing": [
+                    {"product_id": product_id, "sku": products[product_id][0], "quantity": quantity}
+                    for product_id, quantity in sorted(missing.items())
+                ],
+            }
+            for order_id, missing in held.items()
+        ],
+    )
+
+
+def render_pick_lists(wave: PickingWave, max_orders_shown: Optional[int] = 8) -> str:
+    """Plain-text pick lists, one page per list, for printing"""
+    out = []
+    for pick_list in wave.lists:
+        warehouse = pick_list.warehouse or "(no warehouse)"
+        out.append(f"{wave.wave_number}  {warehouse}  page {pick_list.page}")
+        out.append(f"{'#':>4}  {'Shelf':<12} {'SKU':<16} {'Qty':>6}  Item / orders")
+        for stop in pick_list.stops:
+            out.append(f"{stop.sequence:>4}  {stop.shelf or '-':<12} {stop.sku:<16} {stop.quantity:>6}  {stop.name}")
+            shown = stop.orders if max_orders_shown is None else stop.orders[:max_orders_shown]
+            orders = ", ".join(f"{order.order_number} x{order.quantity}" for order in shown)
+            if len(shown) < len(stop.orders):
+                orders += f", +{len(stop.orders) - len(shown)} more"
+            out.append(f"{'':>4}  {'':<12} {'':<16} {'':>6}  {orders}")
+        out.append("\f")
+    if wave.held_orders:
+        out.append(f"{wave.wave_number}  held orders (not enough located stock)")
+        for order in wave.held_orders:
+            missing = ", ".join(f"{pick.sku} x{pick.quantity}" for pick in order.missing)
+            out.append(f"      {order.order_number:<24} missing {missing}")
+    return "\n".join(out) + "\n"
@@ -0,0 +1,120 @@
+import asyncio
+import csv
+import io
+import os
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Tuple
+
+import structlog
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.schemas.product import ImportJobStatus, ProductImportJob
+from app.services.category_cache import product_categories
+from app.services.dashboard_counts import dashboard_counts
+from app.services.product_upsert import upsert_products
+
+logger = structlog.get_logger()
+
+# Import jobs by id, kept for a day so clients can poll progress
+import_jobs = TTLCache(maxsize=256, ttl=24 * 60 * 60)
+
+IMPORT_FORMATS = {".csv": "csv", ".xlsx": "xlsx"}
+
+
+def _clean_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    # Blank cells mean "not provided" so schema defaults apply
+    cleaned = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == "":
+            continue
+        cleaned[str(key).strip().lower()] = value
+    return cleaned
+
+
+def _iter_csv(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        reader = csv.DictReader(handle)
+        for row in reader:
+            yield reader.line_num, _clean_row(row)
+
+
+def _iter_xlsx(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    from openpyxl import load_workbook
+
+    # read_only mode streams rows instead of building the whole sheet in memory
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(cell).strip() if cell is not None else None for cell in header]
+        for row_number, values in enumerate(rows, start=2):
+            if values is None or all(value is None for value in values):
+                continue
+            yield row_number, _clean_row(dict(zip(columns, values)))
+    finally:
+        workbook.close()
+
+
+def iter_import_rows(path: str, file_format: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield ``(row_number, row)`` pairs from an uploaded CSV or XLSX file"""
+    if file_format == "xlsx":
+        return _iter_xlsx(path)
+    return _iter_csv(path)
+
+
+def _record_errors(job: ProductImportJob, numbered_rows: List[Tuple[int, Dict[str, Any]]], errors) -> None:
+    job.error_count += len(errors)
+    room = settings.PRODUCT_IMPORT_MAX_ERRORS - len(job.errors)
+    for error in errors[:max(room, 0)]:
+        row_number = numbered_rows[error.index][0]
+        sku = f" (SKU {error.sku})" if error.sku else ""
+        job.errors.append(f"Row {row_number}{sku}: {error.detail}")
+
+
+async def run_product_import(job: ProductImportJob, path: str, file_format: str, on_conflict: str) -> None:
+    """
+    Stream rows from the file and upsert them in fixed-size batches.
+
+    The file is read a batch at a time in a worker thread and each batch is
+    committed in its own transaction, so memory stays flat regardless of file
+    size and progress on ``job`` is visible to pollers as batches land.
+    """
+    job.status = ImportJobStatus.RUNNING
+    job.started_at = datetime.utcnow()
+    batch_size = settings.PRODUCT_BULK_BATCH_SIZE
+    try:
+        rows = iter_import_rows(path, file_format)
+        async with AsyncSessionLocal() as db:
+            while True:
+                numbered_rows = await asyncio.to_thread(lambda: list(islice(rows, batch_size)))
+                if not numbered_rows:
+                    break
+                result = await upsert_products(db, [row for _, row in numbered_rows], on_conflict)
+                await db.commit()
+
+                job.rows_processed += len(numbered_rows)
+                job.created += result.created
+                job.updated += result.updated
+                job.skipped += result.skipped
+                job.imported = job.created + job.updated
+                _record_errors(job, numbered_rows, result.errors)
+        job.status = ImportJobStatus.COMPLETED
+    except Exception as exc:
+        logger.exception("Product import failed", job_id=job.id)
+        job.status = ImportJobStatus.FAILED
+        job.error_count += 1
+        job.errors.append(f"Import aborted after {job.rows_processed} rows: {exc}")
+    finally:
+        job.finished_at = datetime.utcnow()
+        product_categories.invalidate()
+        dashboard_counts.invalidate()
+        os.unlink(path)
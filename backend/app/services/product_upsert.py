@@ -0,0 +1,110 @@
+from typing import Any, Dict, List
+
+import structlog
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.dialect import dialect_insert
+from app.models.product import Product
+from app.schemas.product import ProductBulkResult, ProductBulkRowError, ProductCreate
+
+logger = structlog.get_logger()
+
+
+def format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+async def upsert_products(
+    db: AsyncSession,
+    items: List[Dict[str, Any]],
+    on_conflict: str = "update",
+) -> ProductBulkResult:
+    """
+    Validate and write products keyed by SKU with batched INSERT ... ON CONFLICT.
+
+    Rows are validated one by one and SKU conflicts for all rows are checked in
+    a single query. Each batch runs in a savepoint so one failing batch is
+    reported per row without discarding the others. The caller commits.
+    """
+    result_out = ProductBulkResult()
+
+    # Validate each row on its own so errors can be reported per row
+    rows = []
+    seen_skus = set()
+    for index, raw in enumerate(items):
+        try:
+            product_in = ProductCreate(**raw)
+        except ValidationError as exc:
+            result_out.errors.append(ProductBulkRowError(
+                index=index, sku=raw.get("sku"), detail=format_validation_error(exc)
+            ))
+            continue
+        if product_in.sku in seen_skus:
+            result_out.errors.append(ProductBulkRowError(
+                index=index, sku=product_in.sku, detail="Duplicate SKU in request"
+            ))
+            continue
+        seen_skus.add(product_in.sku)
+        rows.append((index, product_in.dict(), frozenset(product_in.dict(exclude_unset=True))))
+
+    # Check SKU conflicts for all rows in one query
+    existing_skus = set()
+    if rows:
+        result = await db.execute(select(Product.sku).where(Product.sku.in_(seen_skus)))
+        existing_skus = set(result.scalars().all())
+
+    # Group rows by the fields they set so an update never overwrites omitted columns with defaults
+    groups = {}
+    for index, data, fields in rows:
+        if data["sku"] in existing_skus:
+            if on_conflict == "skip":
+                result_out.skipped += 1
+                continue
+            if on_conflict == "error":
+                result_out.errors.append(ProductBulkRowError(
+                    index=index, sku=data["sku"], detail="A product with this SKU already exists"
+                ))
+                continue
+        groups.setdefault(fields, []).append((index, data))
+
+    insert = dialect_insert(db.get_bind().dialect.name)
+    batch_size = settings.PRODUCT_BULK_BATCH_SIZE
+    for fields, group in groups.items():
+        for start in range(0, len(group), batch_size):
+            batch = group[start:start + batch_size]
+            stmt = insert(Product).values([data for _, data in batch])
+            if on_conflict == "update":
+                update_columns = {field: stmt.excluded[field] for field in fields if field != "sku"}
+                update_columns["updated_at"] = func.now()
+                stmt = stmt.on_conflict_do_update(index_elements=[Product.sku], set_=update_columns)
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=[Product.sku])
+
+            try:
+                async with db.begin_nested():
+                    await db.execute(stmt)
+            except IntegrityError as exc:
+                # The driver message can name constraints and values; keep it in the log
+                logger.warning(
+                    "Product upsert batch rejected",
+                    first_index=batch[0][0], rows=len(batch), error=str(exc.orig),
+                )
+                for index, data in batch:
+                    result_out.errors.append(ProductBulkRowError(
+                        index=index, sku=data["sku"], detail="Rejected by a database constraint"
+                    ))
+                continue
+
+            updated = sum(1 for _, data in batch if data["sku"] in existing_skus)
+            result_out.updated += updated
+            result_out.created += len(batch) - updated
+
+    result_out.errors.sort(key=lambda error: error.index)
+    return result_out
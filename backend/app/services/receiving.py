@@ -0,0 +1,147 @@
+from collections import defaultdict
+from typing import Dict
+
+from fastapi import HTTPException, status
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.inventory import TransactionType
+from app.models.purchase_order import PurchaseOrder, PurchaseOrderItem, PurchaseOrderStatus
+from app.schemas.purchase_order import PurchaseOrderReceiptCreate
+from app.services.dashboard_counts import purchase_order_deltas, stage_dashboard_deltas
+from app.services.stock import increment_stock, post_ledger_entries
+
+RECEIVABLE_STATUSES = (
+    PurchaseOrderStatus.APPROVED,
+    PurchaseOrderStatus.ORDERED,
+    PurchaseOrderStatus.PARTIALLY_RECEIVED,
+)
+
+
+async def post_purchase_order_receipt(
+    db: AsyncSession,
+    po_id: int,
+    receipt_in: PurchaseOrderReceiptCreate,
+    user_id: int,
+) -> Dict[int, int]:
+    """
+    Post a (partial) delivery against a purchase order to the inventory ledger.
+
+    In the caller's transaction: locks the PO header so receipts for the same
+    PO at different docks serialize, bumps received_quantity per line, writes
+    one IN ledger row per receipt line and folds it into the stock balances,
+    increments Product.current_stock with a set-based UPDATE and recomputes
+    the PO status. Returns the new stock level per product. The caller commits.
+    """
+    result = await db.execute(
+        select(PurchaseOrder.po_number, PurchaseOrder.status, PurchaseOrder.total_amount)
+        .where(PurchaseOrder.id == po_id)
+        .with_for_update()
+    )
+    header = result.one_or_none()
+    if header is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Purchase order not found"
+        )
+    if header.status not in RECEIVABLE_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Purchase order must be approved, ordered or partially received to be received"
+        )
+    if not receipt_in.lines:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A receipt needs at least one line"
+        )
+
+    # Lines for the same PO item (e.g. different batches) are summed per item
+    received_per_item = defaultdict(int)
+    for line in receipt_in.lines:
+        received_per_item[line.item_id] += line.quantity
+
+    result = await db.execute(
+        select(
+            PurchaseOrderItem.id,
+            PurchaseOrderItem.product_id,
+            PurchaseOrderItem.quantity,
+            PurchaseOrderItem.received_quantity,
+            PurchaseOrderItem.unit_cost,
+        ).where(
+            PurchaseOrderItem.purchase_order_id == po_id,
+            PurchaseOrderItem.id.in_(list(received_per_item)),
+        )
+    )
+    items = {row.id: row for row in result.all()}
+
+    unknown = sorted(set(received_per_item) - set(items))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Items {unknown} do not belong to this purchase order"
+        )
+    if not receipt_in.allow_over_receipt:
+        over = sorted(
+            item_id for item_id, quantity in received_per_item.items()
+            if (items[item_id].received_quantity or 0) + quantity > items[item_id].quantity
+        )
+        if over:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Receipt exceeds ordered quantity for items {over}"
+            )
+
+    await db.execute(
+        update(PurchaseOrderItem)
+        .where(PurchaseOrderItem.id.in_(list(received_per_item)))
+        .values(
+            received_quantity=func.coalesce(PurchaseOrderItem.received_quantity, 0)
+            + case(dict(received_per_item), value=PurchaseOrderItem.id, else_=0)
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+    ledger_rows = []
+    stock_deltas = defaultdict(int)
+    for line in receipt_in.lines:
+        item = items[line.item_id]
+        stock_deltas[item.product_id] += line.quantity
+        ledger_rows.append({
+            "product_id": item.product_id,
+            "quantity": line.quantity,
+            "transaction_type": TransactionType.IN,
+            "warehouse_location": line.warehouse_location,
+            "shelf_location": line.shelf_location,
+            "reference_number": header.po_number,
+            "reference_type": "purchase_order",
+            "unit_cost": item.unit_cost,
+            "total_cost": item.unit_cost * line.quantity,
+            "batch_number": line.batch_number,
+            "expiry_date": line.expiry_date,
+            "condition": line.condition,
+            "notes": receipt_in.notes,
+            "created_by": user_id,
+        })
+    await post_ledger_entries(db, ledger_rows)
+
+    stock_levels = await increment_stock(db, stock_deltas)
+
+    result = await db.execute(
+        select(func.count(PurchaseOrderItem.id)).where(
+            PurchaseOrderItem.purchase_order_id == po_id,
+            func.coalesce(PurchaseOrderItem.received_quantity, 0) < PurchaseOrderItem.quantity,
+        )
+    )
+    outstanding_lines = result.scalar()
+    new_status = PurchaseOrderStatus.RECEIVED if outstanding_lines == 0 else PurchaseOrderStatus.PARTIALLY_RECEIVED
+    await db.execute(
+        update(PurchaseOrder)
+        .where(PurchaseOrder.id == po_id)
+        .values(status=new_status)
+        .execution_options(synchronize_session=False)
+    )
+    if new_status != header.status:
+        stage_dashboard_deltas(db, purchase_order_deltas(header.status, header.total_amount, -1))
+        stage_dashboard_deltas(db, purchase_order_deltas(new_status, header.total_amount))
+
+    return stock_levels
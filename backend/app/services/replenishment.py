@@ -0,0 +1,212 @@
+import uuid
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.product import Product, StockStatus
+from app.models.purchase_order import PurchaseOrder, PurchaseOrderItem, PurchaseOrderStatus
+from app.schemas.purchase_order import ReplenishmentLine, ReplenishmentResult, ReplenishmentSupplierProposal
+from app.services.dashboard_counts import stage_dashboard_deltas
+
+# Orders whose outstanding quantity still counts as stock on its way
+OPEN_STATUSES = (
+    PurchaseOrderStatus.DRAFT,
+    PurchaseOrderStatus.SUBMITTED,
+    PurchaseOrderStatus.APPROVED,
+    PurchaseOrderStatus.ORDERED,
+    PurchaseOrderStatus.PARTIALLY_RECEIVED,
+)
+
+
+async def _load_candidates(db: AsyncSession) -> np.ndarray:
+    """
+    Active, supplier-linked products at or below their reorder point or minimum
+    stock level, as one float array with a row per product:
+    id, supplier_id, current_stock, min_stock_level, max_stock_level, reorder_point, cost_price
+    """
+    result = await db.execute(
+        select(
+            Product.id,
+            Product.supplier_id,
+            func.coalesce(Product.current_stock, 0),
+            func.coalesce(Product.min_stock_level, 0),
+            func.coalesce(Product.max_stock_level, 0),
+            func.coalesce(Product.reorder_point, 0),
+            Product.cost_price,
+        )
+        .where(
+            Product.is_active.is_(True),
+            Product.supplier_id.isnot(None),
+            # The stock_status bucket narrows the scan; min_stock_level is checked alongside
+            or_(
+                Product.stock_status.in_([StockStatus.OUT_OF_STOCK.value, StockStatus.LOW_STOCK.value]),
+                func.coalesce(Product.current_stock, 0) <= func.coalesce(Product.min_stock_level, 0),
+            ),
+        )
+        .order_by(Product.id)
+    )
+    rows = result.all()
+    if not rows:
+        return np.empty((0, 7))
+    return np.array(rows, dtype=np.float64)
+
+
+async def _load_on_order(db: AsyncSession, product_ids: np.ndarray) -> np.ndarray:
+    """Outstanding quantity on open purchase orders, aligned with ``product_ids`` (sorted)"""
+    on_order = np.zeros(len(product_ids))
+    result = await db.execute(
+        select(
+            PurchaseOrderItem.product_id,
+            func.sum(PurchaseOrderItem.quantity - func.coalesce(PurchaseOrderItem.received_quantity, 0)),
+        )
+        .join(PurchaseOrder, PurchaseOrder.id == PurchaseOrderItem.purchase_order_id)
+        .where(PurchaseOrder.status.in_(OPEN_STATUSES))
+        .group_by(PurchaseOrderItem.product_id)
+    )
+    rows = result.all()
+    if not rows or not len(product_ids):
+        return on_order
+    pending = np.array(rows, dtype=np.float64)
+    positions = np.searchsorted(product_ids, pending[:, 0])
+    positions = np.clip(positions, 0, len(product_ids) - 1)
+    matched = product_ids[positions] == pending[:, 0]
+    on_order[positions[matched]] = pending[matched, 1]
+    return on_order
+
+
+def compute_order_quantities(
+    current_stock: np.ndarray,
+    min_stock_level: np.ndarray,
+    max_stock_level: np.ndarray,
+    reorder_point: np.ndarray,
+    on_order: np.ndarray,
+) -> np.ndarray:
+    """
+    Quantity to order per product (0 where nothing is needed).
+
+    A product triggers once stock is at or below max(reorder_point,
+    min_stock_level) and is topped up to max_stock_level, or to
+    max(2 x reorder_point, min_stock_level) when no maximum is set (the upper
+    bound of the "normal" stock bucket). Stock already on order is subtracted.
+    """
+    trigger = current_stock <= np.maximum(reorder_point, min_stock_level)
+    target = np.where(
+        max_stock_level > 0,
+        max_stock_level,
+        np.maximum(reorder_point * 2, min_stock_level),
+    )
+    quantity = np.ceil(target - current_stock - on_order)
+    return np.where(trigger & (quantity > 0), quantity, 0).astype(np.int64)
+
+
+async def run_replenishment(
+    db: AsyncSession,
+    user_id: int,
+    dry_run: bool = True,
+    include_items: bool = True,
+) -> ReplenishmentResult:
+    """
+    Propose (or write, unless ``dry_run``) one draft purchase order per supplier
+    covering every product that needs restocking.
+
+    Quantities are computed with array math over all candidate products at
+    once; headers and items are written with multi-row INSERTs. The caller
+    commits.
+    """
+    data = await _load_candidates(db)
+    product_ids = data[:, 0].astype(np.int64)
+    on_order = await _load_on_order(db, product_ids)
+
+    quantity = compute_order_quantities(data[:, 2], data[:, 3], data[:, 4], data[:, 5], on_order)
+    selected = quantity > 0
+    product_ids = product_ids[selected]
+    supplier_ids = data[selected, 1].astype(np.int64)
+    unit_costs = data[selected, 6]
+    quantity = quantity[selected]
+    total_costs = quantity * unit_costs
+
+    # Group lines per supplier: stable sort keeps product id order inside a group
+    order = np.argsort(supplier_ids, kind="stable")
+    product_ids, supplier_ids = product_ids[order], supplier_ids[order]
+    unit_costs, quantity, total_costs = unit_costs[order], quantity[order], total_costs[order]
+    group_suppliers, group_starts, group_sizes = np.unique(supplier_ids, return_index=True, return_counts=True)
+    group_subtotals = np.add.reduceat(total_costs, group_starts) if len(group_starts) else np.empty(0)
+
+    proposals = [
+        ReplenishmentSupplierProposal(supplier_id=supplier_id, line_count=size, subtotal=round(subtotal, 2))
+        for supplier_id, size, subtotal in zip(
+            group_suppliers.tolist(), group_sizes.tolist(), group_subtotals.tolist()
+        )
+    ]
+
+    if include_items:
+        lines = [
+            ReplenishmentLine(product_id=product_id, quantity=qty, unit_cost=unit_cost, total_cost=total_cost)
+            for product_id, qty, unit_cost, total_cost in zip(
+                product_ids.tolist(), quantity.tolist(), unit_costs.tolist(), total_costs.tolist()
+            )
+        ]
+        for proposal, start in zip(proposals, group_starts.tolist()):
+            proposal.items = lines[start:start + proposal.line_count]
+
+    if not dry_run and proposals:
+        now = datetime.now(timezone.utc)
+        # Random suffix: runs in the same second must not collide on po_number
+        run_tag = f"{now:%Y%m%d%H%M%S}-{uuid.uuid4().hex[:6].upper()}"
+        headers = [
+            dict(
+                po_number=f"RPL-{run_tag}-{proposal.supplier_id}",
+                supplier_id=proposal.supplier_id,
+                status=PurchaseOrderStatus.DRAFT,
+                order_date=now,
+                subtotal=proposal.subtotal,
+                total_amount=proposal.subtotal,
+                notes="Drafted by automatic replenishment",
+                created_by=user_id,
+            )
+            for proposal in proposals
+        ]
+        result = await db.execute(
+            insert(PurchaseOrder).returning(PurchaseOrder.id, sort_by_parameter_order=True),
+            headers,
+        )
+        po_ids = result.scalars().all()
+        for proposal, header, po_id in zip(proposals, headers, po_ids):
+            proposal.purchase_order_id = po_id
+            proposal.po_number = header["po_number"]
+        stage_dashboard_deltas(db, {
+            ("purchase_orders", PurchaseOrderStatus.DRAFT.value): len(headers),
+            ("purchase_order_value", PurchaseOrderStatus.DRAFT.value): sum(header["total_amount"] for header in headers),
+        })
+
+        # Each line inherits the id of its supplier's header
+        line_po_ids = np.repeat(np.array(po_ids, dtype=np.int64), group_sizes).tolist()
+        item_columns = (line_po_ids, product_ids.tolist(), quantity.tolist(), unit_costs.tolist(), total_costs.tolist())
+        batch_size = settings.REPLENISHMENT_BATCH_SIZE
+        for start in range(0, len(line_po_ids), batch_size):
+            await db.execute(
+                insert(PurchaseOrderItem),
+                [
+                    dict(
+                        purchase_order_id=po_id,
+                        product_id=product_id,
+                        quantity=qty,
+                        unit_cost=unit_cost,
+                        total_cost=total_cost,
+                        received_quantity=0,
+                    )
+                    for po_id, product_id, qty, unit_cost, total_cost in zip(
+                        *(column[start:start + batch_size] for column in item_columns)
+                    )
+                ],
+            )
+
+    return ReplenishmentResult(
+        dry_run=dry_run,
+        products_scanned=len(data),
+        products_to_order=len(product_ids),
+        purchase_orders=proposals,
+    )
@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import structlog
+from sqlalchemy import delete, func, insert, literal, select, text, union_all
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.models.inventory import InventoryItem, StockSnapshot, StockSnapshotLine
+from app.services.stock import LEDGER_DELTA_EXPRESSION
+
+logger = structlog.get_logger()
+
+_SNAPSHOT_LOCK_SQL = text("SELECT pg_advisory_xact_lock(hashtext('stock_snapshots'))")
+
+
+def location_quantities_query(
+    snapshot_id: Optional[int],
+    since: Optional[datetime],
+    until: datetime,
+    product_id: Optional[int] = None,
+    warehouse: Optional[str] = None,
+):
+    """
+    Stock per (product_id, warehouse, shelf) at ``until``: the lines of
+    ``snapshot_id`` (taken at ``since``) plus the ledger rows in (since, until],
+    optionally narrowed to one product and/or warehouse.
+
+    Without a snapshot the ledger is replayed from the start. The created_at
+    bounds let PostgreSQL prune the ledger down to the partitions in range.
+    """
+    ledger_rows = select(
+        InventoryItem.product_id.label("product_id"),
+        func.coalesce(InventoryItem.warehouse_location, "").label("warehouse"),
+        func.coalesce(InventoryItem.shelf_location, "").label("shelf"),
+        LEDGER_DELTA_EXPRESSION.label("quantity"),
+    ).where(InventoryItem.created_at <= until)
+    if since is not None:
+        ledger_rows = ledger_rows.where(InventoryItem.created_at > since)
+    if product_id is not None:
+        ledger_rows = ledger_rows.where(InventoryItem.product_id == product_id)
+    if warehouse is not None:
+        ledger_rows = ledger_rows.where(func.coalesce(InventoryItem.warehouse_location, "") == warehouse)
+
+    parts = [ledger_rows]
+    if snapshot_id is not None:
+        snapshot_rows = select(
+            StockSnapshotLine.product_id,
+            StockSnapshotLine.warehouse,
+            StockSnapshotLine.shelf,
+            StockSnapshotLine.quantity,
+        ).where(StockSnapshotLine.snapshot_id == snapshot_id)
+        if product_id is not None:
+            snapshot_rows = snapshot_rows.where(StockSnapshotLine.product_id == product_id)
+        if warehouse is not None:
+            snapshot_rows = snapshot_rows.where(StockSnapshotLine.warehouse == warehouse)
+        parts.append(snapshot_rows)
+    combined = union_all(*parts).subquery("movements")
+    quantity = func.sum(combined.c.quantity)
+    return (
+        select(combined.c.product_id, combined.c.warehouse, combined.c.shelf, quantity.label("quantity"))
+        .group_by(combined.c.product_id, combined.c.warehouse, combined.c.shelf)
+        .having(quantity != 0)
+    )
+
+
+async def latest_snapshot_before(conn: AsyncConnection, ts: datetime):
+    """(id, taken_at) of the newest snapshot taken at or before ``ts``, or None"""
+    result = await conn.execute(
+        select(StockSnapshot.id, StockSnapshot.taken_at)
+        .where(StockSnapshot.taken_at <= ts)
+        .order_by(StockSnapshot.taken_at.desc())
+        .limit(1)
+    )
+    return result.one_or_none()
+
+
+async def take_stock_snapshot(conn: AsyncConnection, taken_at: Optional[datetime] = None) -> Optional[int]:
+    """
+    Write a snapshot as of ``taken_at`` (default: now minus the settle delay)
+    in the caller's transaction, rolled forward from the previous snapshot so
+    the cost is bounded by the ledger rows written since then.
+
+    Returns the new snapshot id, or None when a recent enough snapshot exists
+    (several workers run this job).
+    """
+    if conn.dialect.name == "postgresql":
+        await conn.execute(_SNAPSHOT_LOCK_SQL)
+    if taken_at is None:
+        taken_at = datetime.now(timezone.utc) - timedelta(seconds=settings.STOCK_SNAPSHOT_SETTLE_SECONDS)
+
+    previous = await latest_snapshot_before(conn, taken_at)
+    if previous is not None:
+        previous_taken_at = previous.taken_at
+        if previous_taken_at.tzinfo is None:
+            previous_taken_at = previous_taken_at.replace(tzinfo=timezone.utc)
+        if taken_at - previous_taken_at < timedelta(seconds=settings.STOCK_SNAPSHOT_INTERVAL_SECONDS * 0.9):
+            return None
+
+    result = await conn.execute(
+        insert(StockSnapshot).values(taken_at=taken_at).returning(StockSnapshot.id)
+    )
+    snapshot_id = result.scalar_one()
+
+    query = location_quantities_query(
+        previous.id if previous else None,
+        previous.taken_at if previous else None,
+        taken_at,
+    )
+    lines = query.subquery("lines")
+    await conn.execute(
+        insert(StockSnapshotLine).from_select(
+            ["snapshot_id", "product_id", "warehouse", "shelf", "quantity"],
+            select(literal(snapshot_id), lines.c.product_id, lines.c.warehouse, lines.c.shelf, lines.c.quantity),
+        )
+    )
+
+    # Older snapshots only serve as-of queries further back than the retention window
+    cutoff = taken_at - timedelta(days=settings.STOCK_SNAPSHOT_RETENTION_DAYS)
+    expired = select(StockSnapshot.id).where(StockSnapshot.taken_at < cutoff).scalar_subquery()
+    await conn.execute(delete(StockSnapshotLine).where(StockSnapshotLine.snapshot_id.in_(expired)))
+    await conn.execute(delete(StockSnapshot).where(StockSnapshot.taken_at < cutoff))
+
+    logger.info("Stock snapshot written", snapshot_id=snapshot_id, taken_at=taken_at.isoformat())
+    return snapshot_id
@@ -0,0 +1,217 @@
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from sqlalchemy import case, delete, func, insert, literal_column, select, text, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.db.dialect import dialect_insert
+from app.models.inventory import InventoryItem, StockBalance, TransactionType
+from app.models.product import Product
+from app.services.dashboard_counts import ledger_deltas, stage_dashboard_deltas, stock_change_deltas
+
+# Ledger quantity sign per transaction type: IN/OUT rows store a positive
+# quantity, ADJUSTMENT and TRANSFER rows are already signed (a transfer is
+# posted as a negative row at the source and a positive row at the target)
+LEDGER_DELTA_EXPRESSION = case(
+    (InventoryItem.transaction_type == TransactionType.IN, func.abs(InventoryItem.quantity)),
+    (InventoryItem.transaction_type == TransactionType.OUT, -func.abs(InventoryItem.quantity)),
+    else_=InventoryItem.quantity,
+)
+
+
+async def lock_products(db: AsyncSession, product_ids) -> None:
+    """
+    Row-lock products in ascending id order.
+
+    Every multi-product stock writer takes its locks in the same order, so two
+    transactions touching overlapping SKUs queue instead of deadlocking.
+    """
+    await db.execute(
+        select(Product.id)
+        .where(Product.id.in_(sorted(product_ids)))
+        .order_by(Product.id)
+        .with_for_update()
+    )
+
+
+async def increment_stock(
+    db: AsyncSession,
+    deltas: Dict[int, int],
+    allow_negative: bool = True,
+) -> Dict[int, int]:
+    """
+    Add signed deltas to Product.current_stock with one set-based UPDATE ... RETURNING.
+
+    Returns the new stock level per product id. Ids missing from the result do
+    not exist, or (with ``allow_negative=False``) would have gone below zero and
+    were left untouched. The increment happens in the database, so concurrent
+    writers never lose each other's updates.
+    """
+    if not deltas:
+        return {}
+    if len(deltas) > 1:
+        await lock_products(db, deltas)
+    new_stock = func.coalesce(Product.current_stock, 0) + case(deltas, value=Product.id, else_=0)
+    stmt = update(Product).where(Product.id.in_(list(deltas)))
+    if not allow_negative:
+        stmt = stmt.where(new_stock >= 0)
+    result = await db.execute(
+        stmt
+        .values(current_stock=new_stock)
+        .returning(
+            Product.id,
+            Product.current_stock,
+            Product.category,
+            Product.reorder_point,
+            Product.cost_price,
+            Product.is_active,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    stock_levels = {}
+    dashboard_deltas = defaultdict(float)
+    for product_id, stock, category, reorder_point, cost_price, is_active in result.all():
+        stock_levels[product_id] = stock
+        for key, value in stock_change_deltas(
+            category, stock, deltas[product_id], reorder_point, cost_price, is_active
+        ).items():
+            dashboard_deltas[key] += value
+    stage_dashboard_deltas(db, dashboard_deltas)
+    return stock_levels
+
+
+def adjustment_ledger_row(product_id: int, delta: int, adjustment: Any, user_id: int) -> Dict[str, Any]:
+    """ADJUSTMENT ledger row for a signed stock delta (``adjustment`` is a StockAdjustment)"""
+    return {
+        "product_id": product_id,
+        "quantity": delta,
+        "transaction_type": TransactionType.ADJUSTMENT,
+        "warehouse_location": adjustment.warehouse_location,
+        "shelf_location": adjustment.shelf_location,
+        "reference_number": adjustment.reference_number,
+        "reference_type": "adjustment",
+        "notes": adjustment.reason,
+        "created_by": user_id,
+    }
+
+
+def ledger_delta(transaction_type: TransactionType, quantity: int) -> int:
+    """Python twin of LEDGER_DELTA_EXPRESSION"""
+    if transaction_type == TransactionType.IN:
+        return abs(quantity)
+    if transaction_type == TransactionType.OUT:
+        return -abs(quantity)
+    return quantity
+
+
+def balance_key(row: Dict[str, Any]) -> Tuple[int, str, str]:
+    return row["product_id"], row.get("warehouse_location") or "", row.get("shelf_location") or ""
+
+
+async def apply_balance_deltas(db: AsyncSession, deltas: Dict[Tuple[int, str, str], int]) -> None:
+    """
+    Add deltas to stock_balances keyed by (product_id, warehouse, shelf) with one
+    INSERT ... ON CONFLICT DO UPDATE. Keys are written in sorted order so
+    concurrent postings lock balance rows in the same order.
+    """
+    if not deltas:
+        return
+    insert_stmt = dialect_insert(db.get_bind().dialect.name)(StockBalance)
+    stmt = insert_stmt.on_conflict_do_update(
+        index_elements=[StockBalance.product_id, StockBalance.warehouse, StockBalance.shelf],
+        set_={
+            "quantity": StockBalance.quantity + insert_stmt.excluded.quantity,
+            "updated_at": func.now(),
+        },
+    )
+    await db.execute(stmt, [
+        {"product_id": product_id, "warehouse": warehouse, "shelf": shelf, "quantity": quantity}
+        for (product_id, warehouse, shelf), quantity in sorted(deltas.items())
+    ])
+
+
+async def post_ledger_entries(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """
+    Insert InventoryItem ledger rows and fold them into stock_balances in the
+    caller's transaction. This is the only way ledger rows should be written,
+    otherwise the balances drift (see reconcile_stock.py). The caller commits.
+    """
+    if not rows:
+        return
+    await db.execute(insert(InventoryItem), rows)
+    deltas = defaultdict(int)
+    for row in rows:
+        deltas[balance_key(row)] += ledger_delta(row["transaction_type"], row["quantity"])
+    await apply_balance_deltas(db, deltas)
+    stage_dashboard_deltas(db, ledger_deltas(deltas))
+
+
+def ledger_balances_query():
+    """Stock per (product_id, warehouse, shelf) recomputed from the whole ledger"""
+    warehouse = func.coalesce(InventoryItem.warehouse_location, "")
+    shelf = func.coalesce(InventoryItem.shelf_location, "")
+    return (
+        select(
+            InventoryItem.product_id.label("product_id"),
+            warehouse.label("warehouse"),
+            shelf.label("shelf"),
+            func.sum(LEDGER_DELTA_EXPRESSION).label("quantity"),
+        )
+        .group_by(InventoryItem.product_id, warehouse, shelf)
+    )
+
+
+async def iter_balance_drift(conn: AsyncConnection) -> AsyncIterator[Tuple[int, str, str, int, int]]:
+    """
+    Stream (product_id, warehouse, shelf, ledger_quantity, balance_quantity) for
+    every key where stock_balances disagrees with the ledger.
+
+    The ledger is aggregated and full-outer-joined to the balances in the
+    database, so this is a single pass over each table and only drifting keys
+    reach Python.
+    """
+    ledger = ledger_balances_query().subquery("ledger")
+    ledger_quantity = func.coalesce(ledger.c.quantity, 0)
+    balance_quantity = func.coalesce(StockBalance.quantity, 0)
+    query = (
+        select(
+            func.coalesce(ledger.c.product_id, StockBalance.product_id),
+            func.coalesce(ledger.c.warehouse, StockBalance.warehouse),
+            func.coalesce(ledger.c.shelf, StockBalance.shelf),
+            ledger_quantity,
+            balance_quantity,
+        )
+        .select_from(ledger.outerjoin(
+            StockBalance,
+            (StockBalance.product_id == ledger.c.product_id)
+            & (StockBalance.warehouse == ledger.c.warehouse)
+            & (StockBalance.shelf == ledger.c.shelf),
+            full=True,
+        ))
+        .where(ledger_quantity != balance_quantity)
+        .order_by(literal_column("1"), literal_column("2"), literal_column("3"))
+    )
+    result = await conn.stream(query)
+    async for row in result:
+        yield tuple(row)
+
+
+async def lock_stock_balances(conn: AsyncConnection) -> None:
+    """
+    Block ledger postings until the caller's transaction ends (PostgreSQL only),
+    so a rebuild can't lose deltas written while it runs. Reads stay allowed.
+    """
+    if conn.dialect.name == "postgresql":
+        await conn.execute(text("LOCK TABLE stock_balances IN EXCLUSIVE MODE"))
+
+
+async def rebuild_stock_balances(conn: AsyncConnection) -> None:
+    """Replace stock_balances with the ledger aggregate in the caller's transaction"""
+    ledger = ledger_balances_query().subquery("ledger")
+    await conn.execute(delete(StockBalance))
+    await conn.execute(
+        insert(StockBalance).from_select(
+            ["product_id", "warehouse", "shelf", "quantity"],
+            select(ledger.c.product_id, ledger.c.warehouse, ledger.c.shelf, ledger.c.quantity),
+        )
+    )
@@ -0,0 +1,219 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional, Tuple
+
+import numpy as np
+import structlog
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.db.database import async_engine
+from app.models.inventory import InventoryItem, TransactionType
+from app.models.product import Product
+from app.models.valuation import InventoryValuation, InventoryValuationLine, ValuationStatus
+from app.services.stock import LEDGER_DELTA_EXPRESSION
+
+logger = structlog.get_logger()
+
+# Stands in for log(0) when stock was empty before a receipt: exp() of it is 0,
+# so the receipt starts a fresh average without -inf arithmetic
+_LOG_ZERO = -1000.0
+
+# Rows per multi-row INSERT of valuation lines
+_LINE_BATCH_SIZE = 5000
+
+# Column per product in the arrays returned by value_ledger_rows
+ValuedProducts = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def grouped_cumsum(values: np.ndarray, group: np.ndarray, group_count: int) -> np.ndarray:
+    """Inclusive running sum of ``values`` restarting at every group (``group`` sorted)"""
+    running = np.cumsum(values)
+    if not len(group):
+        return running
+    # group is sorted, so each group starts where its id changes
+    first = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    offsets = np.zeros(group_count)
+    offsets[group[first]] = running[first] - values[first]
+    return running - offsets[group]
+
+
+def value_ledger_rows(product_ids: np.ndarray, deltas: np.ndarray, unit_costs: np.ndarray) -> ValuedProducts:
+    """
+    Value complete product histories with array math, no per-row Python.
+
+    Rows are ledger movements ordered by product then time: signed quantity
+    and unit cost (receipts only; every inflow must have a cost). Returns
+    per product: id, ending quantity, FIFO value, moving-average unit cost and
+    moving-average value.
+
+    FIFO: the ending stock consists of the newest receipts, so each receipt
+    counts for whatever part of the ending quantity is not covered by later
+    receipts. Moving average: the average after receipt k is
+    w_k * avg_{k-1} + (1 - w_k) * cost_k with w_k = stock before / stock after;
+    unrolled, the final average is sum((1 - w_k) * cost_k * prod(w_j, j > k)),
+    evaluated in log space. Issues do not change the average.
+    """
+    row_count = len(product_ids)
+    starts = np.flatnonzero(np.r_[True, product_ids[1:] != product_ids[:-1]])
+    ends = np.r_[starts[1:], row_count]
+    group_count = len(starts)
+    group = np.repeat(np.arange(group_count), ends - starts)
+
+    stock_after = grouped_cumsum(deltas, group, group_count)
+    quantity = np.maximum(stock_after[ends - 1], 0)
+
+    # FIFO
+    inflow = deltas > 0
+    received = np.where(inflow, deltas, 0.0)
+    received_through = grouped_cumsum(received, group, group_count)
+    received_total = received_through[ends - 1]
+    received_later = received_total[group] - received_through
+    counted = np.clip(quantity[group] - received_later, 0, received)
+    fifo_value = np.bincount(group, weights=np.where(inflow, counted * unit_costs, 0.0), minlength=group_count)
+
+    # Moving average over receipts only
+    receipt_rows = np.flatnonzero(inflow)
+    receipt_group = group[receipt_rows]
+    stock_before = np.maximum(stock_after[receipt_rows] - deltas[receipt_rows], 0)
+    weight = stock_before / (stock_before + deltas[receipt_rows])
+    log_weight = np.where(weight > 0, np.log(np.where(weight > 0, weight, 1.0)), _LOG_ZERO)
+    log_through = grouped_cumsum(log_weight, receipt_group, group_count)
+    log_total = np.bincount(receipt_group, weights=log_weight, minlength=group_count)
+    contribution = (1 - weight) * unit_costs[receipt_rows] * np.exp(log_total[receipt_group] - log_through)
+    average_cost = np.bincount(receipt_group, weights=contribution, minlength=group_count)
+
+    return product_ids[starts], quantity, fifo_value, average_cost, average_cost * quantity
+
+
+async def _stream_ledger(conn: AsyncConnection, as_of: datetime, chunk_rows: int) -> AsyncIterator[np.ndarray]:
+    """Ledger movements up to ``as_of`` as (product_id, delta, unit_cost) float arrays"""
+    result = await conn.stream(
+        select(
+            InventoryItem.product_id,
+            LEDGER_DELTA_EXPRESSION,
+            # -1 marks "no cost recorded"; filled from the product's cost price
+            func.coalesce(InventoryItem.unit_cost, -1.0),
+        )
+        # Transfers move stock between locations without changing its cost
+        .where(InventoryItem.created_at <= as_of, InventoryItem.transaction_type != TransactionType.TRANSFER)
+        .order_by(InventoryItem.product_id, InventoryItem.created_at, InventoryItem.id)
+        .execution_options(yield_per=chunk_rows)
+    )
+    async for partition in result.partitions(chunk_rows):
+        yield np.array(partition, dtype=np.float64)
+
+
+async def compute_valuation(
+    conn: AsyncConnection,
+    as_of: datetime,
+    chunk_rows: Optional[int] = None,
+) -> Tuple[int, ValuedProducts]:
+    """
+    Stream the ledger in chunks and value every product with movements.
+
+    Memory is bounded by the chunk size plus the longest single-product
+    history: the last product of a chunk may continue in the next one, so its
+    rows are carried over instead of valued early. The array work runs in a
+    worker thread so the event loop keeps serving requests. Returns the number
+    of ledger rows read and the per-product arrays.
+    """
+    chunk_rows = chunk_rows or settings.VALUATION_CHUNK_ROWS
+    result = await conn.execute(select(Product.id, Product.cost_price).order_by(Product.id))
+    catalog = np.array(result.all(), dtype=np.float64).reshape(-1, 2)
+
+    def value(rows: np.ndarray) -> ValuedProducts:
+        costs = rows[:, 2]
+        missing = costs < 0
+        if missing.any():
+            positions = np.searchsorted(catalog[:, 0], rows[missing, 0]).clip(0, max(len(catalog) - 1, 0))
+            costs = costs.copy()
+            costs[missing] = catalog[positions, 1] if len(catalog) else 0.0
+        return value_ledger_rows(rows[:, 0], rows[:, 1], costs)
+
+    ledger_rows = 0
+    valued: List[ValuedProducts] = []
+    carry = np.empty((0, 3))
+    async for chunk in _stream_ledger(conn, as_of, chunk_rows):
+        ledger_rows += len(chunk)
+        rows = np.concatenate([carry, chunk]) if len(carry) else chunk
+        cut = np.searchsorted(rows[:, 0], rows[-1, 0])
+        if cut:
+            valued.append(await asyncio.to_thread(value, rows[:cut]))
+        carry = rows[cut:]
+    if len(carry):
+        valued.append(await asyncio.to_thread(value, carry))
+
+    if not valued:
+        empty = np.empty(0)
+        return ledger_rows, (empty, empty, empty, empty, empty)
+    return ledger_rows, tuple(np.concatenate(column) for column in zip(*valued))
+
+
+async def create_valuation(conn: AsyncConnection, as_of: datetime, user_id: Optional[int]) -> int:
+    result = await conn.execute(
+        insert(InventoryValuation)
+        .values(as_of=as_of, status=ValuationStatus.RUNNING, created_by=user_id)
+        .returning(InventoryValuation.id)
+    )
+    return result.scalar_one()
+
+
+async def run_inventory_valuation(valuation_id: int, as_of: datetime, chunk_rows: Optional[int] = None) -> bool:
+    """
+    Value the ledger as of ``as_of`` and persist lines and totals for
+    ``valuation_id`` in one transaction. Failures are recorded on the run.
+    Returns True on success.
+    """
+    try:
+        async with async_engine.begin() as conn:
+            ledger_rows, (product_ids, quantity, fifo_value, average_cost, average_value) = (
+                await compute_valuation(conn, as_of, chunk_rows)
+            )
+            keep = (quantity != 0) | (fifo_value != 0)
+            columns = [
+                product_ids[keep].astype(np.int64).tolist(),
+                quantity[keep].astype(np.int64).tolist(),
+                fifo_value[keep].round(4).tolist(),
+                average_cost[keep].round(6).tolist(),
+                average_value[keep].round(4).tolist(),
+            ]
+            for start in range(0, len(columns[0]), _LINE_BATCH_SIZE):
+                await conn.execute(insert(InventoryValuationLine), [
+                    dict(
+                        valuation_id=valuation_id,
+                        product_id=product_id,
+                        quantity=qty,
+                        fifo_value=fifo,
+                        average_unit_cost=cost,
+                        average_value=average,
+                    )
+                    for product_id, qty, fifo, cost, average in zip(
+                        *(column[start:start + _LINE_BATCH_SIZE] for column in columns)
+                    )
+                ])
+            await conn.execute(
+                update(InventoryValuation)
+                .where(InventoryValuation.id == valuation_id)
+                .values(
+                    status=ValuationStatus.COMPLETED,
+                    ledger_rows=ledger_rows,
+                    product_count=len(columns[0]),
+                    total_quantity=int(quantity[keep].sum()),
+                    fifo_value=round(float(fifo_value[keep].sum()), 4),
+                    average_value=round(float(average_value[keep].sum()), 4),
+                    completed_at=datetime.now(timezone.utc),
+                )
+            )
+        logger.info("Inventory valuation completed", valuation_id=valuation_id, ledger_rows=ledger_rows)
+        return True
+    except Exception as exc:
+        logger.exception("Inventory valuation failed", valuation_id=valuation_id)
+        async with async_engine.begin() as conn:
+            await conn.execute(
+                update(InventoryValuation)
+                .where(InventoryValuation.id == valuation_id)
+                .values(status=ValuationStatus.FAILED, error=str(exc), completed_at=datetime.now(timezone.utc))
+            )
+        return False
@@ -0,0 +1,68 @@
+"""
+Bulk product upsert benchmark.
+
+Posts generated products to POST /api/v1/products/bulk and reports write
+throughput in rows per second. The first pass inserts, the second pass hits
+the same SKUs and exercises the ON CONFLICT update path.
+
+Usage:
+    python benchmarks/bulk_products.py --base-url http://localhost:8000 \\
+        --email admin@example.com --password admin123 --rows 50000 --chunk 5000
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+
+def make_rows(count, prefix, price):
+    return [
+        {
+            "name": f"Benchmark product {i}",
+            "sku": f"{prefix}-{i:08d}",
+            "category": f"Category {i % 25}",
+            "cost_price": price,
+            "selling_price": price * 1.5,
+            "current_stock": i % 200,
+            "reorder_point": 20,
+        }
+        for i in range(count)
+    ]
+
+
+async def upsert(client, rows, chunk):
+    totals = {"created": 0, "updated": 0, "skipped": 0, "errors": 0}
+    started = time.perf_counter()
+    for start in range(0, len(rows), chunk):
+        response = await client.post("/api/v1/products/bulk", json={"items": rows[start:start + chunk]})
+        response.raise_for_status()
+        body = response.json()
+        for key in ("created", "updated", "skipped"):
+            totals[key] += body[key]
+        totals["errors"] += len(body["errors"])
+    return totals, time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--chunk", type=int, default=5000, help="rows per request")
+    parser.add_argument("--prefix", default=f"BENCH{int(time.time())}")
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=300) as client:
+        login = await client.post("/api/v1/auth/login", json={"email": args.email, "password": args.password})
+        login.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {login.json()['access_token']}"
+
+        for label, price in (("insert", 10.0), ("update", 12.0)):
+            totals, elapsed = await upsert(client, make_rows(args.rows, args.prefix, price), args.chunk)
+            print(f"{label}: {args.rows} rows in {elapsed:.2f}s = {args.rows / elapsed:,.0f} rows/s {totals}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
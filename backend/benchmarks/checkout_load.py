@@ -0,0 +1,111 @@
+"""
+Concurrent checkout load test.
+
+Runs many checkouts in parallel against POST /api/v1/orders, every order
+drawing from the same small set of popular products (in a random line order,
+to provoke deadlocks if locks were not taken in a consistent order). Reports
+throughput and latency, and checks that stock dropped by exactly the
+quantities of the accepted (200) orders. Rejections (409, insufficient stock)
+are expected once the popular products sell out. Exits non-zero on a mismatch.
+
+Usage:
+    python benchmarks/checkout_load.py --base-url http://localhost:8000 \\
+        --email admin@example.com --password admin123 --product-ids 1,2,3 \\
+        --checkouts 100 --lines 2
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+
+async def checkout(client, product_ids, lines, rng, accepted, statuses, latencies):
+    items = [
+        {"product_id": product_id, "quantity": rng.randint(1, 3)}
+        for product_id in rng.sample(product_ids, min(lines, len(product_ids)))
+    ]
+    started = time.perf_counter()
+    response = await client.post(
+        "/api/v1/orders/",
+        json={"customer_name": "Load test", "items": items},
+    )
+    latencies.append(time.perf_counter() - started)
+    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    if response.status_code == 200:
+        accepted.extend(items)
+
+
+async def stock_levels(client, product_ids):
+    levels = {}
+    for product_id in product_ids:
+        response = await client.get(f"/api/v1/products/{product_id}")
+        response.raise_for_status()
+        levels[product_id] = response.json()["current_stock"]
+    return levels
+
+
+async def main(args):
+    product_ids = [int(product_id) for product_id in args.product_ids.split(",")]
+    limits = httpx.Limits(max_connections=args.checkouts, max_keepalive_connections=args.checkouts)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60.0, limits=limits) as client:
+        response = await client.post(
+            "/api/v1/auth/login", json={"email": args.email, "password": args.password}
+        )
+        response.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        
+        start_levels = await stock_levels(client, product_ids)
+        
+        accepted = []
+        statuses = {}
+        latencies = []
+        rng = random.Random(args.seed)
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            checkout(client, product_ids, args.lines, random.Random(rng.random()), accepted, statuses, latencies)
+            for _ in range(args.checkouts)
+        ))
+        elapsed = time.perf_counter() - started
+        
+        final_levels = await stock_levels(client, product_ids)
+    
+    reserved = {product_id: 0 for product_id in product_ids}
+    for item in accepted:
+        reserved[item["product_id"]] += item["quantity"]
+    
+    latencies.sort()
+    print(f"{args.checkouts} checkouts in {elapsed:.2f}s ({args.checkouts / elapsed:.0f}/s)")
+    print(
+        f"latency: p50={statistics.median(latencies) * 1000:.0f}ms "
+        f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.0f}ms "
+        f"max={latencies[-1] * 1000:.0f}ms"
+    )
+    print(f"status codes: {dict(sorted(statuses.items()))}")
+    
+    ok = True
+    for product_id in product_ids:
+        expected = start_levels[product_id] - reserved[product_id]
+        print(
+            f"product {product_id}: start={start_levels[product_id]} final={final_levels[product_id]} "
+            f"expected={expected}"
+        )
+        ok = ok and final_levels[product_id] == expected and final_levels[product_id] >= 0
+    print("OK: reservations match accepted orders" if ok else "FAIL: lost or oversold reservations")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--product-ids", required=True, help="Comma-separated popular product ids")
+    parser.add_argument("--checkouts", type=int, default=100)
+    parser.add_argument("--lines", type=int, default=2, help="Popular products per order")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    raise SystemExit(asyncio.run(main(args)))
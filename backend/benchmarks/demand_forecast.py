@@ -0,0 +1,64 @@
+"""
+Demand forecast fitting benchmark.
+
+Fits SES/Croston forecasts for a synthetic catalog (default 100k SKUs over
+a year of daily history, a mix of steady and intermittent sellers) first in
+one thread, then sharded over a process pool, and reports SKUs per second.
+No database is needed; loading the series is timed by the forecast runs
+themselves (GET /api/v1/forecasts/runs/{id}).
+
+Usage:
+    python benchmarks/demand_forecast.py --skus 100000 --workers 4
+    python benchmarks/demand_forecast.py --skus 500000 --shard 5000 --workers 8
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.forecasting import fit_demand_forecasts
+
+
+def synthetic_demand(skus, days, seed):
+    """Sparse (sku, day, units) triples; each SKU sells on a random share of days"""
+    rng = np.random.default_rng(seed)
+    # A third steady sellers, the rest intermittent
+    rate = np.where(rng.random(skus) < 0.33, rng.uniform(0.6, 1.0, skus), rng.uniform(0.02, 0.4, skus))
+    sku_index, day_index = np.nonzero(rng.random((skus, days), dtype=np.float32) < rate[:, None].astype(np.float32))
+    quantity = rng.integers(1, 20, len(sku_index)).astype(np.float64)
+    return sku_index, day_index, quantity
+
+
+async def run(args):
+    started = time.perf_counter()
+    sku_index, day_index, quantity = synthetic_demand(args.skus, args.days, args.seed)
+    print(f"generated {len(sku_index)} demand days for {args.skus} SKUs in {time.perf_counter() - started:.2f}s")
+    
+    for label, workers in (("1 thread", 1), (f"{args.workers} processes", args.workers)):
+        started = time.perf_counter()
+        shards, fitted = await fit_demand_forecasts(
+            sku_index, day_index, quantity, args.skus, args.days,
+            shard_products=args.shard, workers=workers,
+        )
+        elapsed = time.perf_counter() - started
+        croston = int(fitted[:, 0].sum())
+        print(f"{label}: {elapsed:.2f}s for {shards} shards ({args.skus / elapsed:,.0f} SKUs/s, {croston} Croston)")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--skus", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=settings.FORECAST_HISTORY_DAYS)
+    parser.add_argument("--shard", type=int, default=settings.FORECAST_SHARD_PRODUCTS)
+    parser.add_argument("--workers", type=int, default=settings.FORECAST_WORKERS)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    raise SystemExit(asyncio.run(run(args)))
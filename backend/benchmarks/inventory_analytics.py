@@ -0,0 +1,123 @@
+"""
+Inventory turnover/aging benchmark.
+
+Times the vectorized turnover and aging computation over a synthetic ledger
+(default 10M movements across 50k products, a year and a half of history),
+fed in chunks with the same product carry-over as the service, and reports
+rows per second. Single core: run with OMP_NUM_THREADS=1 to be strict.
+
+With --database it instead times the full report (streaming the ledger from
+the database configured in the environment, plus the per-product and
+per-category rollup) for the given period, cold and then cached.
+
+Usage:
+    python benchmarks/inventory_analytics.py --rows 10000000 --products 50000
+    python benchmarks/inventory_analytics.py --database --days 90
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.inventory_analytics import turnover_aging_rows
+
+SECONDS_PER_DAY = 86400.0
+
+
+def synthetic_ledger(rows, products, history_days, seed):
+    """Movements sorted by product then time: ids, epoch seconds, signed deltas, issue and transfer flags"""
+    rng = np.random.default_rng(seed)
+    end_ts = datetime.now(timezone.utc).timestamp()
+    product_ids = np.sort(rng.integers(1, products + 1, rows)).astype(np.float64)
+    timestamps = end_ts - rng.uniform(0, history_days * SECONDS_PER_DAY, rows)
+    # Sort time within each product: product id dominates the composite key
+    order = np.lexsort((timestamps, product_ids))
+    timestamps = timestamps[order]
+    receipts = rng.random(rows) < 0.3
+    deltas = np.where(receipts, rng.integers(10, 200, rows), -rng.integers(1, 40, rows)).astype(np.float64)
+    issues = ~receipts & (rng.random(rows) < 0.9)
+    # Some of the remaining movements are legs of transfers between locations
+    transfers = ~issues & (rng.random(rows) < 0.1)
+    return product_ids, timestamps, deltas, issues, transfers, end_ts
+
+
+def run_chunked(product_ids, timestamps, deltas, issues, transfers, start_ts, end_ts, edges, chunk_rows):
+    parts = []
+    carry = 0
+    for chunk_start in range(0, len(product_ids), chunk_rows):
+        stop = min(chunk_start + chunk_rows, len(product_ids))
+        # Cut before the last product of the chunk unless it is the final chunk
+        cut = stop if stop == len(product_ids) else int(np.searchsorted(product_ids[carry:stop], product_ids[stop - 1])) + carry
+        if cut > carry:
+            parts.append(turnover_aging_rows(
+                product_ids[carry:cut], timestamps[carry:cut], deltas[carry:cut], issues[carry:cut], transfers[carry:cut],
+                start_ts, end_ts, edges,
+            ))
+            carry = cut
+    return sum(len(part["product_id"]) for part in parts)
+
+
+async def run_database(days):
+    from app.db.database import async_engine
+    from app.services.inventory_analytics import turnover_aging_reports
+
+    end_date = datetime.now(timezone.utc).date()
+    start_date = end_date - timedelta(days=days - 1)
+    async with async_engine.connect() as conn:
+        for label in ("cold", "cached"):
+            started = time.perf_counter()
+            report = await turnover_aging_reports.get(conn, start_date, end_date)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{label}: {elapsed:.2f}s for {report['ledger_rows']} ledger rows, "
+                f"{len(report['products'])} products, {len(report['categories'])} categories"
+            )
+    await async_engine.dispose()
+
+
+def main(args):
+    if args.database:
+        asyncio.run(run_database(args.days))
+        return 0
+    
+    started = time.perf_counter()
+    product_ids, timestamps, deltas, issues, transfers, end_ts = synthetic_ledger(
+        args.rows, args.products, args.history_days, args.seed
+    )
+    print(f"generated {args.rows} movements for {args.products} products in {time.perf_counter() - started:.2f}s")
+    
+    start_ts = end_ts - args.days * SECONDS_PER_DAY
+    edges = list(settings.INVENTORY_AGING_BUCKET_DAYS)
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        product_count = run_chunked(
+            product_ids, timestamps, deltas, issues, transfers, start_ts, end_ts, edges, args.chunk_rows
+        )
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+    print(f"turnover/aging for {product_count} products: best {best:.2f}s of {args.repeat} "
+          f"({args.rows / best / 1e6:.1f}M rows/s, chunks of {args.chunk_rows})")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--history-days", type=int, default=540)
+    parser.add_argument("--days", type=int, default=90, help="Length of the reporting period")
+    parser.add_argument("--chunk-rows", type=int, default=settings.INVENTORY_ANALYTICS_CHUNK_ROWS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--database", action="store_true", help="Time the full report against the database")
+    args = parser.parse_args()
+    
+    raise SystemExit(main(args))
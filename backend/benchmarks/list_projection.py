@@ -0,0 +1,109 @@
+"""
+Column projection benchmark for list endpoints.
+
+Compares building product list items from full ORM entities (select(Product))
+with building them from projected row tuples (select(*columns)), reading every
+row of the products table in pages. Reports rows per second for each.
+
+Runs against the database configured in the environment (.env). With --seed
+it first inserts synthetic products (SKU prefix PROJBENCH-) and removes them
+afterwards.
+
+Usage:
+    python benchmarks/list_projection.py --seed 100000 --page-size 100
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import delete, insert, select
+
+from app.db.database import AsyncSessionLocal
+from app.db.projection import schema_columns
+from app.models.product import Product
+from app.schemas.product import Product as ProductSchema
+
+SKU_PREFIX = "PROJBENCH-"
+
+
+async def seed(count):
+    async with AsyncSessionLocal() as db:
+        for start in range(0, count, 1000):
+            await db.execute(insert(Product), [
+                {
+                    "name": f"Projection benchmark {i}",
+                    "sku": f"{SKU_PREFIX}{i:08d}",
+                    "description": "lorem ipsum " * 40,
+                    "category": f"Category {i % 25}",
+                    "cost_price": 10.0,
+                    "selling_price": 15.0,
+                    "current_stock": i % 200,
+                }
+                for i in range(start, min(start + 1000, count))
+            ])
+        await db.commit()
+
+
+async def cleanup():
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Product).where(Product.sku.like(f"{SKU_PREFIX}%")))
+        await db.commit()
+
+
+async def read_entities(page_size):
+    rows = 0
+    async with AsyncSessionLocal() as db:
+        last_id = 0
+        while True:
+            result = await db.execute(
+                select(Product).where(Product.id > last_id).order_by(Product.id).limit(page_size)
+            )
+            items = [ProductSchema.model_validate(product) for product in result.scalars().all()]
+            if not items:
+                return rows
+            rows += len(items)
+            last_id = items[-1].id
+            db.expunge_all()
+
+
+async def read_projected(page_size):
+    rows = 0
+    columns = schema_columns(Product, ProductSchema)
+    async with AsyncSessionLocal() as db:
+        last_id = 0
+        while True:
+            result = await db.execute(
+                select(*columns).where(Product.id > last_id).order_by(Product.id).limit(page_size)
+            )
+            items = [ProductSchema(**row._asdict()) for row in result]
+            if not items:
+                return rows
+            rows += len(items)
+            last_id = items[-1].id
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="synthetic products to insert first")
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.seed:
+        await seed(args.seed)
+    try:
+        for label, reader in (("ORM entities", read_entities), ("projected rows", read_projected)):
+            started = time.perf_counter()
+            rows = await reader(args.page_size)
+            elapsed = time.perf_counter() - started
+            print(f"{label:>15}: {rows} rows in {elapsed:.2f}s = {rows / elapsed:,.0f} rows/s")
+    finally:
+        if args.seed:
+            await cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+Login storm benchmark.
+
+Measures latency of a cheap route (GET /health by default) while many clients
+log in at once, and reports p50/p99 with and without the storm. With bcrypt on
+the event loop the p99 of the probe route grows with the number of concurrent
+logins; with the password pool it should stay close to the baseline.
+
+Usage:
+    python benchmarks/login_storm.py --base-url http://localhost:8000 \\
+        --email admin@example.com --password admin123 --logins 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def probe(client, path, stop, samples):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get(path)
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.005)
+
+
+async def login(client, email, password, statuses):
+    response = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+async def run_phase(args, with_storm):
+    limits = httpx.Limits(max_connections=args.logins + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        samples, statuses = [], {}
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, args.probe_path, stop, samples))
+        started = time.perf_counter()
+        if with_storm:
+            await asyncio.gather(*(
+                login(client, args.email, args.password, statuses) for _ in range(args.logins)
+            ))
+        else:
+            await asyncio.sleep(args.baseline_seconds)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await probe_task
+        return samples, statuses, elapsed
+
+
+def report(label, samples, statuses, elapsed):
+    print(f"{label}: {len(samples)} probes in {elapsed:.2f}s")
+    if samples:
+        print(
+            f"  probe latency ms  p50={statistics.median(samples):.1f}  "
+            f"p99={percentile(samples, 99):.1f}  max={max(samples):.1f}"
+        )
+    if statuses:
+        print(f"  login statuses    {statuses}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--logins", type=int, default=100, help="concurrent login requests")
+    parser.add_argument("--probe-path", default="/health")
+    parser.add_argument("--baseline-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    report("baseline", *await run_phase(args, with_storm=False))
+    report("during login storm", *await run_phase(args, with_storm=True))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""
+Concurrent stock adjustment stress test.
+
+Fires many parallel writers at POST /api/v1/products/{id}/adjust on the same
+product, each sending a series of random signed deltas, then checks that no
+update was lost: the final current_stock must equal the starting stock plus
+the deltas of every accepted (200) adjustment, and the per-location ledger
+balance must have moved by the same amount. Rejections (409, stock would go
+negative) are expected and counted. Exits non-zero on a mismatch.
+
+Usage:
+    python benchmarks/stock_adjust_stress.py --base-url http://localhost:8000 \\
+        --email admin@example.com --password admin123 --product-id 1 \\
+        --writers 200 --adjustments 10
+"""
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+
+
+async def writer(client, product_id, count, rng, accepted, statuses):
+    for _ in range(count):
+        delta = rng.choice([-3, -2, -1, 1, 2, 3])
+        response = await client.post(
+            f"/api/v1/products/{product_id}/adjust",
+            json={"delta": delta, "reason": "stress test", "warehouse_location": "STRESS"},
+        )
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        if response.status_code == 200:
+            accepted.append(delta)
+
+
+async def location_total(client, product_id):
+    response = await client.get(f"/api/v1/inventory/products/{product_id}/balances")
+    response.raise_for_status()
+    return sum(
+        location["quantity"] for location in response.json()["locations"]
+        if location["warehouse"] == "STRESS"
+    )
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.writers, max_keepalive_connections=args.writers)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60.0, limits=limits) as client:
+        response = await client.post(
+            "/api/v1/auth/login", json={"email": args.email, "password": args.password}
+        )
+        response.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+        
+        response = await client.get(f"/api/v1/products/{args.product_id}")
+        response.raise_for_status()
+        start_stock = response.json()["current_stock"]
+        start_location = await location_total(client, args.product_id)
+        
+        accepted = []
+        statuses = {}
+        rng = random.Random(args.seed)
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            writer(client, args.product_id, args.adjustments, random.Random(rng.random()), accepted, statuses)
+            for _ in range(args.writers)
+        ))
+        elapsed = time.perf_counter() - started
+        
+        response = await client.get(f"/api/v1/products/{args.product_id}")
+        response.raise_for_status()
+        final_stock = response.json()["current_stock"]
+        final_location = await location_total(client, args.product_id)
+    
+    expected = start_stock + sum(accepted)
+    total = args.writers * args.adjustments
+    print(f"{total} adjustments from {args.writers} writers in {elapsed:.2f}s ({total / elapsed:.0f}/s)")
+    print(f"status codes: {dict(sorted(statuses.items()))}")
+    print(f"stock: start={start_stock} final={final_stock} expected={expected}")
+    print(f"ledger balance moved by {final_location - start_location}, accepted deltas sum to {sum(accepted)}")
+    
+    ok = final_stock == expected and final_location - start_location == sum(accepted)
+    print("OK: no lost updates" if ok else "FAIL: lost or phantom updates")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@example.com")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--product-id", type=int, required=True)
+    parser.add_argument("--writers", type=int, default=200)
+    parser.add_argument("--adjustments", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    raise SystemExit(asyncio.run(main(args)))
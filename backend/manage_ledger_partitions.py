@@ -0,0 +1,82 @@
+"""
+Maintain the monthly inventory_items partitions (PostgreSQL).
+
+    ensure   create partitions from the current month up to N months ahead
+    list     show attached monthly partitions
+    archive  detach partitions older than the retention window, export each to
+             <out-dir>/<partition>.csv.gz and drop it; the net quantity per
+             product and location is carried forward so balances stay intact
+
+Usage:
+    python manage_ledger_partitions.py ensure [--months-ahead 3]
+    python manage_ledger_partitions.py list
+    python manage_ledger_partitions.py archive --out-dir /var/backups/ledger \\
+        [--retention-months 24] [--dry-run]
+"""
+import argparse
+import asyncio
+import os
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.db.database import async_engine
+from app.db.partitions import (
+    add_months,
+    archive_ledger_partition,
+    ensure_ledger_partitions,
+    ledger_is_partitioned,
+    list_ledger_partitions,
+    month_start,
+)
+
+
+async def main(args) -> int:
+    async with async_engine.connect() as conn:
+        if not await ledger_is_partitioned(conn):
+            print("inventory_items is not partitioned (PostgreSQL with migration d81f5a2c6e39 required)")
+            return 1
+    
+    if args.command == "ensure":
+        async with async_engine.begin() as conn:
+            created = await ensure_ledger_partitions(conn, args.months_ahead)
+        print(f"created {len(created)} partitions" + (f": {', '.join(created)}" if created else ""))
+        return 0
+    
+    async with async_engine.connect() as conn:
+        partitions = await list_ledger_partitions(conn)
+    
+    if args.command == "list":
+        for name, month in partitions:
+            print(f"{name}  {month:%Y-%m}")
+        return 0
+    
+    cutoff = add_months(month_start(datetime.now(timezone.utc).date()), -args.retention_months)
+    expired = [(name, month) for name, month in partitions if month < cutoff]
+    if not expired:
+        print(f"nothing older than {cutoff:%Y-%m} to archive")
+        return 0
+    os.makedirs(args.out_dir, exist_ok=True)
+    # Oldest first, one transaction each, so carried-forward balances chain correctly
+    for name, month in expired:
+        if args.dry_run:
+            print(f"would archive {name}")
+            continue
+        async with async_engine.begin() as conn:
+            path, rows = await archive_ledger_partition(conn, name, month, args.out_dir)
+        print(f"archived {name}: {rows} rows -> {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    ensure_parser = subparsers.add_parser("ensure")
+    ensure_parser.add_argument("--months-ahead", type=int, default=settings.LEDGER_PARTITION_MONTHS_AHEAD)
+    subparsers.add_parser("list")
+    archive_parser = subparsers.add_parser("archive")
+    archive_parser.add_argument("--out-dir", required=True, help="directory for the .csv.gz exports")
+    archive_parser.add_argument("--retention-months", type=int, default=settings.LEDGER_RETENTION_MONTHS)
+    archive_parser.add_argument("--dry-run", action="store_true", help="only list the partitions to archive")
+    args = parser.parse_args()
+    
+    raise SystemExit(asyncio.run(main(args)))
@@ -0,0 +1,51 @@
+"""
+Reconcile stock_balances against the inventory ledger.
+
+Aggregates inventory_items per (product, warehouse, shelf) in one streaming
+pass, prints every key whose stored balance differs, and with --apply rebuilds
+stock_balances from the ledger in the same transaction.
+
+Usage:
+    python reconcile_stock.py [--apply] [--max-report 100]
+"""
+import argparse
+import asyncio
+
+from app.db.database import async_engine
+from app.services.stock import iter_balance_drift, lock_stock_balances, rebuild_stock_balances
+
+
+async def reconcile(apply: bool, max_report: int) -> int:
+    drifting = 0
+    net_drift = 0
+    async with async_engine.begin() as conn:
+        if apply:
+            # Hold postings back so the report and the rebuild see the same ledger
+            await lock_stock_balances(conn)
+        async for product_id, warehouse, shelf, ledger_quantity, balance_quantity in iter_balance_drift(conn):
+            drifting += 1
+            net_drift += balance_quantity - ledger_quantity
+            if drifting <= max_report:
+                print(
+                    f"product={product_id} warehouse={warehouse!r} shelf={shelf!r} "
+                    f"ledger={ledger_quantity} balance={balance_quantity} "
+                    f"drift={balance_quantity - ledger_quantity:+d}"
+                )
+        if drifting > max_report:
+            print(f"... {drifting - max_report} more")
+        print(f"{drifting} drifting balances, net drift {net_drift:+d}")
+        
+        if apply and drifting:
+            await rebuild_stock_balances(conn)
+            print("stock_balances rebuilt from the ledger")
+    return drifting
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apply", action="store_true", help="rebuild stock_balances from the ledger")
+    parser.add_argument("--max-report", type=int, default=100, help="drifting keys to print")
+    args = parser.parse_args()
+    
+    drifting = asyncio.run(reconcile(args.apply, args.max_report))
+    raise SystemExit(1 if drifting and not args.apply else 0)
@@ -0,0 +1,108 @@
+import asyncio
+import itertools
+import os
+import tempfile
+from contextlib import contextmanager
+
+# Settings are read at import time; point them at a throwaway SQLite database
+_db_path = os.path.join(tempfile.mkdtemp(prefix="supply-chain-tests-"), "test.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_db_path}")
+os.environ.setdefault("DATABASE_URL_ASYNC", f"sqlite+aiosqlite:///{_db_path}")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+
+from app.core.security import create_access_token, get_password_hash
+from app.db.database import AsyncSessionLocal, Base, async_engine
+from app.db.query_counter import QueryCounter
+from app.main import app
+from app.models import Product, Supplier, User
+
+_sequence = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    # One loop for the session: the engine's pooled connections are bound to it
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def database():
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    await async_engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db():
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+@pytest_asyncio.fixture(scope="session")
+async def superuser(database):
+    async with AsyncSessionLocal() as session:
+        user = User(
+            email="admin@example.com", name="admin",
+            hashed_password=get_password_hash("secret1"), is_superuser=True,
+        )
+        session.add(user)
+        await session.commit()
+        return user
+
+
+@pytest_asyncio.fixture
+async def client(superuser):
+    headers = {"Authorization": f"Bearer {create_access_token(superuser.email)}"}
+    async with AsyncClient(app=app, base_url="http://test", headers=headers) as http_client:
+        yield http_client
+
+
+@pytest_asyncio.fixture
+async def supplier(db):
+    supplier = Supplier(name=f"Supplier {next(_sequence)}")
+    db.add(supplier)
+    await db.commit()
+    return supplier
+
+
+@pytest.fixture
+def make_product(db, supplier):
+    """Create a product: ``await make_product(current_stock=5)``"""
+    async def create(**fields):
+        number = next(_sequence)
+        product = Product(**{
+            "name": f"Product {number}", "sku": f"TEST-{number:06d}", "category": "Test",
+            "cost_price": 1.0, "selling_price": 2.0, "current_stock": 0,
+            "supplier_id": supplier.id, **fields,
+        })
+        db.add(product)
+        await db.commit()
+        return product
+
+    return create
+
+
+@pytest.fixture
+def query_counter():
+    """
+    Count the statements run inside the block and fail the test past the budget.
+
+        with query_counter(3):
+            await client.get(f"/api/v1/purchase-orders/{po_id}")
+    """
+    @contextmanager
+    def within_budget(max_queries: int):
+        with QueryCounter() as counter:
+            yield counter
+        assert counter.count <= max_queries, (
+            f"{counter.count} queries run, budget is {max_queries}"
+        )
+
+    return within_budget
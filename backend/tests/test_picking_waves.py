@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from app.db.database import async_engine
+from app.models import InventoryItem, Order, OrderStatus, StockBalance
+from app.services import picking
+from app.services.picking import WAVE_REFERENCE_TYPE
+
+
+async def stocked_product(db, make_product, quantity, shelf="A-01-1"):
+    # Enough to promise both orders at checkout; only ``quantity`` is on the shelf
+    product = await make_product(current_stock=quantity * 2)
+    db.add(StockBalance(product_id=product.id, warehouse="MAIN", shelf=shelf, quantity=quantity))
+    await db.commit()
+    return product
+
+
+async def create_order(client, product, quantity):
+    response = await client.post("/api/v1/orders/", json={
+        "customer_name": "Customer",
+        "items": [{"product_id": product.id, "quantity": quantity}],
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+async def release(client, order_id):
+    response = await client.post("/api/v1/orders/picking-waves", json={"order_ids": [order_id], "release": True})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def assert_picked_once(db, product, first_order, second_order, waves):
+    # Five on the shelf covers one order of three, never both
+    assert sorted(wave["order_count"] for wave in waves) == [0, 1]
+    held = next(wave for wave in waves if wave["order_count"] == 0)
+    assert held["held_orders"][0]["missing"] == [{"product_id": product.id, "sku": product.sku, "quantity": 1}]
+
+    balance = await db.scalar(
+        select(StockBalance.quantity)
+        .where(StockBalance.product_id == product.id)
+        .execution_options(populate_existing=True)
+    )
+    assert balance == 2
+    picked = await db.scalars(
+        select(InventoryItem.quantity)
+        .where(InventoryItem.product_id == product.id, InventoryItem.reference_type == WAVE_REFERENCE_TYPE)
+    )
+    assert picked.all() == [3]
+    statuses = await db.execute(
+        select(Order.status).where(Order.id.in_([first_order, second_order])).execution_options(populate_existing=True)
+    )
+    assert sorted(status.value for status in statuses.scalars()) == [
+        OrderStatus.CONFIRMED.value, OrderStatus.PROCESSING.value
+    ]
+
+
+async def test_overlapping_releases_never_over_pick_a_location(client, db, make_product):
+    product = await stocked_product(db, make_product, 5)
+    first_order = await create_order(client, product, 3)
+    second_order = await create_order(client, product, 3)
+
+    waves = [await release(client, first_order), await release(client, second_order)]
+
+    await assert_picked_once(db, product, first_order, second_order, waves)
+
+
+@pytest.mark.skipif(
+    async_engine.dialect.name != "postgresql",
+    reason="needs row locks; set DATABASE_URL_ASYNC to a PostgreSQL database",
+)
+async def test_concurrent_releases_never_over_pick_a_location(client, db, make_product, monkeypatch):
+    product = await stocked_product(db, make_product, 5)
+    first_order = await create_order(client, product, 3)
+    second_order = await create_order(client, product, 3)
+
+    # Hold each release before it posts until the other one has allocated too,
+    # so both would read the same balance if it weren't locked. With the lock
+    # the second release waits on the balance row and the first goes ahead
+    # once the wait times out
+    both_allocated = asyncio.Event()
+    allocations = []
+    allocate, post = picking.allocate_orders, picking.post_ledger_entries
+
+    def allocate_orders(*args):
+        allocations.append(args)
+        if len(allocations) == 2:
+            both_allocated.set()
+        return allocate(*args)
+
+    async def post_ledger_entries(db, rows):
+        try:
+            await asyncio.wait_for(both_allocated.wait(), timeout=0.5)
+        except asyncio.TimeoutError:
+            pass
+        await post(db, rows)
+
+    monkeypatch.setattr(picking, "allocate_orders", allocate_orders)
+    monkeypatch.setattr(picking, "post_ledger_entries", post_ledger_entries)
+
+    waves = await asyncio.gather(release(client, first_order), release(client, second_order))
+
+    await assert_picked_once(db, product, first_order, second_order, waves)
@@ -0,0 +1,48 @@
+from sqlalchemy import select
+
+from app.models import InventoryItem, StockBalance, TransactionType
+
+
+async def test_update_rejects_current_stock(client, db, make_product):
+    product = await make_product(current_stock=5)
+    name = product.name
+
+    response = await client.put(f"/api/v1/products/{product.id}", json={"name": "Renamed", "current_stock": 50})
+
+    assert response.status_code == 422
+    assert "/adjust" in response.text
+    await db.refresh(product)
+    assert (product.name, product.current_stock) == (name, 5)
+
+
+async def test_update_leaves_stock_alone(client, make_product):
+    product = await make_product(current_stock=5)
+
+    response = await client.put(f"/api/v1/products/{product.id}", json={"name": "Renamed", "reorder_point": 2})
+
+    assert response.status_code == 200
+    assert (response.json()["name"], response.json()["current_stock"]) == ("Renamed", 5)
+
+
+async def test_adjust_posts_a_ledger_row_and_balance(client, db, make_product):
+    product = await make_product(current_stock=5)
+    db.add(StockBalance(product_id=product.id, warehouse="MAIN", shelf="A-01-1", quantity=5))
+    await db.commit()
+
+    response = await client.post(
+        f"/api/v1/products/{product.id}/adjust",
+        json={"delta": -2, "reason": "damaged", "warehouse_location": "MAIN", "shelf_location": "A-01-1"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["current_stock"] == 3
+    ledger = await db.execute(
+        select(InventoryItem.transaction_type, InventoryItem.quantity).where(InventoryItem.product_id == product.id)
+    )
+    assert ledger.all() == [(TransactionType.ADJUSTMENT, -2)]
+    balance = await db.scalar(
+        select(StockBalance.quantity)
+        .where(StockBalance.product_id == product.id)
+        .execution_options(populate_existing=True)
+    )
+    assert balance == 3
@@ -0,0 +1,27 @@
+import pytest
+
+
+@pytest.mark.parametrize("order_date_from, expected", [
+    ("2026-01-01T00:00:00Z", 1),
+    ("2026-01-01T00:00:00", 1),
+    ("2026-03-01T00:00:00+02:00", 0),
+])
+async def test_list_filters_on_aware_and_naive_order_dates(client, supplier, make_product, order_date_from, expected):
+    product = await make_product()
+    response = await client.post("/api/v1/purchase-orders/", json={
+        "po_number": f"PO-DATES-{product.id}",
+        "supplier_id": supplier.id,
+        "order_date": "2026-02-01T09:30:00Z",
+        "expected_delivery": "2026-02-15T00:00:00Z",
+        "items": [{"product_id": product.id, "quantity": 5, "unit_cost": 1.0}],
+    })
+    assert response.status_code == 200, response.text
+
+    response = await client.get("/api/v1/purchase-orders/", params={
+        "supplier_id": supplier.id,
+        "order_date_from": order_date_from,
+        "order_date_to": "2026-03-01T00:00:00Z",
+    })
+
+    assert response.status_code == 200, response.text
+    assert response.json()["total"] == expected
@@ -0,0 +1,100 @@
+from datetime import datetime
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.database import async_engine
+from app.db.query_counter import QueryBudgetMiddleware, query_budget
+from app.models import PurchaseOrder, PurchaseOrderItem, PurchaseOrderStatus, Supplier
+
+
+async def create_purchase_order(db, supplier, products, received_quantity=0):
+    purchase_order = PurchaseOrder(
+        po_number=f"PO-TEST-{supplier.id}-{products[0].id}",
+        supplier_id=supplier.id,
+        status=PurchaseOrderStatus.ORDERED,
+        order_date=datetime.utcnow(),
+        subtotal=10.0 * len(products),
+        total_amount=10.0 * len(products),
+        items=[
+            PurchaseOrderItem(
+                product_id=product.id, quantity=10, unit_cost=1.0, total_cost=10.0,
+                received_quantity=received_quantity,
+            )
+            for product in products
+        ],
+    )
+    db.add(purchase_order)
+    await db.commit()
+    return purchase_order
+
+
+async def test_purchase_order_detail_within_budget(client, db, supplier, make_product, query_counter):
+    products = [await make_product() for _ in range(5)]
+    purchase_order = await create_purchase_order(db, supplier, products)
+
+    with query_counter(3):
+        response = await client.get(f"/api/v1/purchase-orders/{purchase_order.id}")
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 5
+
+
+async def test_receive_purchase_order_within_budget(client, db, supplier, make_product, query_counter):
+    products = [await make_product() for _ in range(5)]
+    purchase_order = await create_purchase_order(db, supplier, products, received_quantity=10)
+
+    with query_counter(6):
+        response = await client.patch(f"/api/v1/purchase-orders/{purchase_order.id}/receive")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "received"
+
+
+async def test_delete_product_within_budget(client, make_product, query_counter):
+    product = await make_product()
+
+    with query_counter(4):
+        response = await client.delete(f"/api/v1/products/{product.id}")
+
+    assert response.status_code == 200
+
+
+async def test_delete_supplier_within_budget(client, db, query_counter):
+    supplier = Supplier(name="Unused supplier")
+    db.add(supplier)
+    await db.commit()
+
+    with query_counter(4):
+        response = await client.delete(f"/api/v1/suppliers/{supplier.id}")
+
+    assert response.status_code == 200
+
+
+def budget_app():
+    app = FastAPI()
+    app.add_middleware(QueryBudgetMiddleware)
+
+    @app.get("/two-queries", dependencies=[Depends(query_budget(1))])
+    async def two_queries():
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+        return {"ok": True}
+
+    return app
+
+
+@pytest.mark.parametrize("strict, expected_status", [(False, 200), (True, 500)])
+async def test_strict_mode_fails_over_budget_routes(monkeypatch, strict, expected_status):
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", strict)
+
+    async with AsyncClient(app=budget_app(), base_url="http://test") as client:
+        response = await client.get("/two-queries")
+
+    assert response.status_code == expected_status
+    if strict:
+        assert response.json()["detail"] == "Query budget exceeded: 2 queries run, budget is 1"
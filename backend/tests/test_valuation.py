@@ -0,0 +1,47 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+from app.models import InventoryItem, TransactionType
+from app.services import valuation
+
+
+async def test_valuation_values_the_ledger_off_the_event_loop(client, db, make_product, monkeypatch):
+    product = await make_product(cost_price=1.0)
+    received_at = datetime.now(timezone.utc) - timedelta(days=2)
+    db.add_all([
+        InventoryItem(
+            product_id=product.id, quantity=10, transaction_type=TransactionType.IN,
+            unit_cost=2.0, created_at=received_at,
+        ),
+        InventoryItem(
+            product_id=product.id, quantity=10, transaction_type=TransactionType.IN,
+            unit_cost=3.0, created_at=received_at + timedelta(hours=1),
+        ),
+        InventoryItem(
+            product_id=product.id, quantity=4, transaction_type=TransactionType.OUT,
+            created_at=received_at + timedelta(hours=2),
+        ),
+    ])
+    await db.commit()
+
+    threads = set()
+    value_ledger_rows = valuation.value_ledger_rows
+
+    def recording_value_ledger_rows(*args):
+        threads.add(threading.get_ident())
+        return value_ledger_rows(*args)
+
+    monkeypatch.setattr(valuation, "value_ledger_rows", recording_value_ledger_rows)
+
+    response = await client.post("/api/v1/inventory/valuations")
+    assert response.status_code == 202
+    valuation_id = response.json()["id"]
+    response = await client.get(f"/api/v1/inventory/valuations/{valuation_id}")
+    assert response.json()["status"] == "completed", response.text
+    response = await client.get(f"/api/v1/inventory/valuations/{valuation_id}/lines", params={"limit": 500})
+
+    line = next(line for line in response.json() if line["product_id"] == product.id)
+    # FIFO: the 4 issued come from the first receipt, leaving 6 at 2.0 and 10 at 3.0
+    assert (line["quantity"], line["fifo_value"]) == (16, 42.0)
+    assert line["average_unit_cost"] == 2.5
+    assert threads and threading.get_ident() not in threads
@@ -0,0 +1,56 @@
+"""
+Run a FIFO and moving-average inventory valuation from the command line.
+
+Streams the ledger up to --as-of in chunks, values every product and stores
+the run in inventory_valuations / inventory_valuation_lines, the same as
+POST /api/v1/inventory/valuations.
+
+Usage:
+    python value_inventory.py [--as-of 2026-03-31T23:59:59] [--chunk-rows 1000000]
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from app.db.database import async_engine
+from app.models.valuation import InventoryValuation, ValuationStatus
+from app.services.valuation import create_valuation, run_inventory_valuation
+from sqlalchemy import select
+
+
+async def main(args) -> int:
+    as_of = datetime.fromisoformat(args.as_of) if args.as_of else datetime.now(timezone.utc)
+    if as_of.tzinfo is None:
+        as_of = as_of.replace(tzinfo=timezone.utc)
+    
+    async with async_engine.begin() as conn:
+        valuation_id = await create_valuation(conn, as_of, None)
+    
+    started = time.perf_counter()
+    await run_inventory_valuation(valuation_id, as_of, args.chunk_rows)
+    elapsed = time.perf_counter() - started
+    
+    async with async_engine.connect() as conn:
+        result = await conn.execute(select(InventoryValuation).where(InventoryValuation.id == valuation_id))
+        valuation = result.one()
+    
+    print(f"valuation {valuation_id} as of {as_of.isoformat()}: {valuation.status.value} in {elapsed:.1f}s")
+    if valuation.status != ValuationStatus.COMPLETED:
+        print(f"error: {valuation.error}")
+        return 1
+    print(f"ledger rows:    {valuation.ledger_rows}")
+    print(f"products:       {valuation.product_count}")
+    print(f"quantity:       {valuation.total_quantity}")
+    print(f"FIFO value:     {valuation.fifo_value:,.2f}")
+    print(f"average value:  {valuation.average_value:,.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--as-of", help="ISO timestamp (default now; naive values are UTC)")
+    parser.add_argument("--chunk-rows", type=int, default=None, help="ledger rows per streamed chunk")
+    args = parser.parse_args()
+    
+    raise SystemExit(asyncio.run(main(args)))
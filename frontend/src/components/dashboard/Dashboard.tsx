@@ -2,6 +2,7 @@ import { DashboardMetrics, InventoryAnalytics, SalesAnalytics } from "@/types";
 import { formatCurrency, formatPercentage, formatNumber } from "@/untils";
 import { useState, useEffect } from "react";
 import LoadingSpinner from "@/components/common/LoadingSpinner";
+import { dashboardService } from "@/services/apiService";
 import { MetricCard } from "@/components/common/MetricCard";
 import { 
   LineChart, Line, AreaChart, Area, BarChart, Bar, PieChart, Pie, Cell,
@@ -21,48 +22,12 @@ const Dashboard: React.FC = () => {
         setLoading(true);
         setError(null);
 
-        // Mock API call - replace with actual service
-        await new Promise(resolve => setTimeout(resolve, 800));
-
-        const mockData: DashboardMetrics = {
-          totalInventoryValue: 125000,
-          lowStockItems: 3,
-          pendingOrders: 12,
-          activeSuppliers: 8,
-          monthlyRevenue: 89500,
-          inventoryTurnover: 4.2,
-          orderFulfillmentRate: 96.5,
-          averageOrderValue: 450.75,
-        };
-
-        const mockInventoryAnalytics: InventoryAnalytics = {
-          stockLevels: [
-            { category: 'Electronics', inStock: 450, lowStock: 25, outOfStock: 5 },
-            { category: 'Accessories', inStock: 320, lowStock: 15, outOfStock: 2 },
-            { category: 'Office Supplies', inStock: 280, lowStock: 8, outOfStock: 0 },
-            { category: 'Furniture', inStock: 120, lowStock: 5, outOfStock: 1 },
-          ],
-          categoryDistribution: [
-            { name: 'Electronics', value: 35, percentage: 35 },
-            { name: 'Accessories', value: 25, percentage: 25 },
-            { name: 'Office Supplies', value: 22, percentage: 22 },
-            { name: 'Furniture', value: 18, percentage: 18 },
-          ],
-          warehouseUtilization: [
-            { name: 'Warehouse A', utilized: 7500, capacity: 10000, utilizationRate: 75 },
-            { name: 'Warehouse B', utilized: 3200, capacity: 5000, utilizationRate: 64 },
-            { name: 'Warehouse C', utilized: 1800, capacity: 3000, utilizationRate: 60 },
-          ],
-          stockMovement: [
-            { date: '2025-01-10', inbound: 150, outbound: 120, net: 30 },
-            { date: '2025-01-11', inbound: 200, outbound: 180, net: 20 },
-            { date: '2025-01-12', inbound: 180, outbound: 200, net: -20 },
-            { date: '2025-01-13', inbound: 220, outbound: 190, net: 30 },
-            { date: '2025-01-14', inbound: 160, outbound: 210, net: -50 },
-            { date: '2025-01-15', inbound: 190, outbound: 170, net: 20 },
-          ],
-        };
+        const [overview, inventory] = await Promise.all([
+          dashboardService.getOverview(),
+          dashboardService.getInventoryAnalytics(),
+        ]);
 
+        // Sales analytics has no backend endpoint yet
         const mockSalesAnalytics: SalesAnalytics = {
           revenue: [
             { period: 'Jan', revenue: 85000, orders: 180, averageOrderValue: 472 },
@@ -94,8 +59,8 @@ const Dashboard: React.FC = () => {
           ],
         };
 
-        setDashboardData(mockData);
-        setInventoryAnalytics(mockInventoryAnalytics);
+        setDashboardData(overview);
+        setInventoryAnalytics(inventory);
         setSalesAnalytics(mockSalesAnalytics);
       } catch (err) {
         setError('Failed to load dashboard data');
@@ -172,7 +172,8 @@ const InventoryManagement: React.FC = () => {
 
   const handleUpdateQuantity = async (id: number, newQuantity: number): Promise<void> => {
     try {
-      const updatedItem = await inventoryService.updateQuantity(id, newQuantity, 'Manual update');
+      const currentQuantity = inventory.find(item => item.id === id)?.quantity ?? 0;
+      const updatedItem = await inventoryService.updateQuantity(id, newQuantity - currentQuantity, 'Manual update');
       setInventory(prev => prev.map(item =>
         item.id === id ? updatedItem : item
       ));
@@ -13,6 +13,8 @@ import type {
   OrderFormData,
   OrderFilter,
   PurchaseOrder,
+  PurchaseOrderFilter,
+  PurchaseOrderStatus,
   Customer,
   DashboardMetrics,
   InventoryAnalytics,
@@ -517,14 +519,17 @@ export const inventoryService = {
   },
 
   /**
-   * Update inventory quantity
+   * Adjust inventory quantity by a signed delta
+   *
+   * The server applies the delta atomically and rejects it if stock would go
+   * negative, so concurrent adjustments never overwrite each other.
    */
   updateQuantity: async (
     id: number,
-    quantity: number,
+    delta: number,
     reason: string = ''
   ): Promise<InventoryItem> => {
-    const response = await api.put(`/products/${id}`, { current_stock: quantity });
+    const response = await api.post(`/products/${id}/adjust`, { delta, reason: reason || undefined });
     const product = response.data;
 
     return {
@@ -685,21 +690,32 @@ export const inventoryService = {
 
   /**
    * Import inventory from CSV
+   *
+   * The server imports in a background job; poll it until it finishes.
    */
-  importFromCSV: async (file: File): Promise<{ imported: number; errors: string[] }> => {
+  importFromCSV: async (
+    file: File,
+    pollIntervalMs: number = 1000
+  ): Promise<{ imported: number; errors: string[] }> => {
     const formData = new FormData();
     formData.append('file', file);
 
-    const response = await api.post<ApiResponse<{ imported: number; errors: string[] }>>(
-      '/inventory/import',
-      formData,
-      {
-        headers: {
-          'Content-Type': 'multipart/form-data',
-        },
-      }
-    );
-    return handleApiResponse(response);
+    const response = await api.post('/products/import', formData, {
+      headers: {
+        'Content-Type': 'multipart/form-data',
+      },
+    });
+
+    let job = response.data;
+    while (job.status === 'pending' || job.status === 'running') {
+      await new Promise((resolve) => setTimeout(resolve, pollIntervalMs));
+      job = (await api.get(`/products/import/${job.id}`)).data;
+    }
+
+    return {
+      imported: job.imported,
+      errors: job.errors,
+    };
   },
 };
 
@@ -787,19 +803,28 @@ export const supplierService = {
 // Order Service
 export const orderService = {
   /**
-   * Get all orders
+   * Get all orders, newest first
+   *
+   * The server filters by status only and pages by cursor; pass the returned
+   * nextCursor back to load the following page.
    */
   getAll: async (
     filters?: OrderFilter,
-    page: number = 1,
-    limit: number = 20
-  ): Promise<{ orders: Order[]; pagination: PaginationInfo }> => {
-    const params = { ...filters, page, limit };
-    const response = await api.get<ApiResponse<{ orders: Order[]; pagination: PaginationInfo }>>(
-      '/orders',
-      { params }
-    );
-    return handleApiResponse(response);
+    limit: number = 20,
+    cursor?: string
+  ): Promise<{ items: Order[]; nextCursor: string | null; hasNext: boolean }> => {
+    const params = {
+      status: filters?.status,
+      limit,
+      cursor,
+    };
+    const response = await api.get('/orders', { params });
+
+    return {
+      items: response.data.items,
+      nextCursor: response.data.next_cursor,
+      hasNext: response.data.has_next,
+    };
   },
 
   /**
@@ -866,24 +891,38 @@ export const orderService = {
 export const purchaseOrderService = {
   /**
    * Get all purchase orders with optional filters
+   *
+   * Filtering and paging happen on the server; pass the returned nextCursor
+   * back to load the following page.
    */
   getAll: async (
-    page: number = 1,
-    limit: number = 20
-  ): Promise<{ items: PurchaseOrder[]; pagination: PaginationInfo }> => {
-    const params = { skip: (page - 1) * limit, limit };
+    filters?: PurchaseOrderFilter,
+    limit: number = 20,
+    cursor?: string
+  ): Promise<{
+    items: PurchaseOrder[];
+    statusCounts: Partial<Record<PurchaseOrderStatus, number>>;
+    total: number;
+    nextCursor: string | null;
+    hasNext: boolean;
+  }> => {
+    const params = {
+      supplier_id: filters?.supplierId,
+      status: filters?.status,
+      order_date_from: filters?.orderDateFrom,
+      order_date_to: filters?.orderDateTo,
+      overdue: filters?.overdue || undefined,
+      limit,
+      cursor,
+    };
     const response = await api.get('/purchase-orders', { params });
 
     return {
-      items: response.data,
-      pagination: {
-        page,
-        limit,
-        total: response.data.length,
-        totalPages: Math.ceil(response.data.length / limit),
-        hasNext: response.data.length === limit,
-        hasPrev: page > 1,
-      },
+      items: response.data.items,
+      statusCounts: response.data.status_counts,
+      total: response.data.total,
+      nextCursor: response.data.next_cursor,
+      hasNext: response.data.has_next,
     };
   },
 
@@ -981,21 +1020,47 @@ export const dashboardService = {
   /**
    * Get dashboard overview data
    */
-  getOverview: async (dateRange?: DateRange): Promise<DashboardMetrics> => {
-    const response = await api.get<ApiResponse<DashboardMetrics>>('/dashboard/overview', {
-      params: dateRange,
-    });
-    return handleApiResponse(response);
+  getOverview: async (): Promise<DashboardMetrics> => {
+    const response = await api.get('/dashboard/overview');
+    const data = response.data;
+
+    return {
+      totalInventoryValue: data.total_inventory_value,
+      lowStockItems: data.low_stock_items,
+      pendingOrders: data.pending_orders,
+      activeSuppliers: data.active_suppliers,
+      monthlyRevenue: data.monthly_revenue,
+      inventoryTurnover: data.inventory_turnover,
+      orderFulfillmentRate: data.order_fulfillment_rate,
+      averageOrderValue: data.average_order_value,
+    };
   },
 
   /**
-   * Get inventory analytics
+   * Get inventory analytics; stock movement covers dateRange (last 30 days by default)
    */
   getInventoryAnalytics: async (dateRange?: DateRange): Promise<InventoryAnalytics> => {
-    const response = await api.get<ApiResponse<InventoryAnalytics>>('/dashboard/inventory-analytics', {
+    const response = await api.get('/dashboard/inventory-analytics', {
       params: dateRange,
     });
-    return handleApiResponse(response);
+    const data = response.data;
+
+    return {
+      stockLevels: data.stock_levels.map((level: any) => ({
+        category: level.category,
+        inStock: level.in_stock,
+        lowStock: level.low_stock,
+        outOfStock: level.out_of_stock,
+      })),
+      categoryDistribution: data.category_distribution,
+      warehouseUtilization: data.warehouse_utilization.map((warehouse: any) => ({
+        name: warehouse.name,
+        utilized: warehouse.utilized,
+        capacity: warehouse.capacity,
+        utilizationRate: warehouse.utilization_rate,
+      })),
+      stockMovement: data.stock_movement,
+    };
   },
 
   /**
@@ -410,6 +410,14 @@ export interface OrderFilter {
   search?: string;
 }
 
+export interface PurchaseOrderFilter {
+  supplierId?: number;
+  status?: PurchaseOrderStatus;
+  orderDateFrom?: string;
+  orderDateTo?: string;
+  overdue?: boolean;
+}
+
 export interface SupplierFilter {
   isActive?: boolean;
   isPreferred?: boolean;